@@ -35,6 +35,7 @@ Quick Start Guide:
 Available Methods:
 ----------------
 - get_liquidation_data(limit=None): Get historical liquidation data. Use limit parameter for most recent data
+- tail_csv(filename): Only the rows appended to a file since the last call (byte-range requests)
 - get_funding_data(): Get current funding rate data for various tokens
 - get_token_addresses(): Get new Solana token launches and their addresses
 - get_oi_data(): Get detailed open interest data for ETH or BTC individually
@@ -56,6 +57,8 @@ Rate Limits:
 -----------
 - 100 requests per minute per API key
 - Larger datasets (like liquidations) recommended to use limit parameter
+- The file getters take usecols/dtype so only the columns you need are kept,
+  and repeat polls send ETag / If-Modified-Since so unchanged files aren't downloaded again
 
 ⚠️ Important Notes:
 -----------------
@@ -79,6 +82,7 @@ import traceback
 import json
 import io
 from dotenv import load_dotenv
+from src import http_client as http
 
 # Load environment variables
 load_dotenv()
@@ -86,6 +90,50 @@ load_dotenv()
 # Get the project root directory
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 
+# Download settings 📥
+CSV_CHUNK_ROWS = 50_000         # Rows parsed per chunk while a download streams in
+READ_BUFFER_BYTES = 1024 * 1024  # Socket read size for streamed downloads
+HTTP_CACHE_FILE = "http_cache.json"  # ETag / Last-Modified per file, so polls survive restarts
+
+class _TeeReader(io.RawIOBase):
+    """Raw stream over an HTTP response that copies every byte it hands out into a cache file"""
+
+    def __init__(self, raw, sink):
+        self.raw = raw
+        self.sink = sink
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.raw.read(len(buffer))
+        if not data:
+            return 0
+        self.sink.write(data)
+        buffer[:len(data)] = data
+        return len(data)
+
+def _read_kwargs(usecols=None, dtype=None, names=None):
+    """pd.read_csv projection arguments (names replace the file's own header row)"""
+    kwargs = {}
+    if names is not None:
+        kwargs['names'] = list(names)
+        kwargs['header'] = 0
+    if usecols is not None:
+        kwargs['usecols'] = list(usecols)
+    if dtype is not None:
+        kwargs['dtype'] = dtype
+    return kwargs
+
+def _complete_length(path):
+    """Bytes of path up to and including its last newline (a half-written last row is left for later)"""
+    size = path.stat().st_size
+    with open(path, 'rb') as f:
+        f.seek(max(0, size - READ_BUFFER_BYTES))
+        tail = f.read()
+    cut = tail.rfind(b'\n')
+    return size - len(tail) + cut + 1 if cut >= 0 else 0
+
 class MoonDevAPI:
     def __init__(self, api_key=None, base_url="http://api.moondev.com:8000"):
         """Initialize the API handler"""
@@ -98,6 +146,12 @@ class MoonDevAPI:
         self.max_retries = 3
         self.chunk_size = 8192  # Smaller chunk size for more reliable downloads
         
+        # Conditional request validators + parsed frames, so unchanged files are never re-downloaded
+        self.http_cache_path = self.base_dir / HTTP_CACHE_FILE
+        self._validators = self._load_validators()
+        self._frames = {}
+        self._tail_state = {}
+        
         print("🌙 Moon Dev API: Ready to rock! 🚀")
         print(f"📂 Cache directory: {self.base_dir.absolute()}")
         print(f"🌐 API URL: {self.base_url}")
@@ -106,97 +160,222 @@ class MoonDevAPI:
         else:
             print("🔑 API key loaded successfully!")
 
-    def _fetch_csv(self, filename, limit=None):
-        """Fetch CSV data from the API"""
+    def _load_validators(self):
         try:
-            print(f"🚀 Moon Dev API: Fetching {filename}{'with limit '+str(limit) if limit else ''}...")
-            
-            url = f'{self.base_url}/files/{filename}'
-            if limit:
-                url += f'?limit={limit}'
+            with open(self.http_cache_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_validators(self):
+        try:
+            with open(self.http_cache_path, 'w') as f:
+                json.dump(self._validators, f)
+        except OSError as e:
+            print(f"⚠️ Couldn't save HTTP cache info: {str(e)}")
+
+    def _stream_to_frame(self, response, save_path, read_kwargs):
+        """Parse the body in CSV chunks as it arrives, teeing the raw bytes into the cache file"""
+        response.raw.decode_content = True
+        temp_path = save_path.with_name(save_path.name + ".part")
+        chunks = []
+        with open(temp_path, 'wb') as sink:
+            reader = io.BufferedReader(_TeeReader(response.raw, sink), READ_BUFFER_BYTES)
+            try:
+                for chunk in pd.read_csv(reader, chunksize=CSV_CHUNK_ROWS, **read_kwargs):
+                    chunks.append(chunk)
+            except pd.errors.EmptyDataError:
+                pass
+        os.replace(temp_path, save_path)
+        if not chunks:
+            return pd.DataFrame(columns=read_kwargs.get('usecols') or read_kwargs.get('names'))
+        return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+
+    def _cached_frame(self, cache_key, save_path, read_kwargs):
+        """Frame for an unchanged file - from memory, or re-parsed from the local copy after a restart"""
+        if cache_key not in self._frames:
+            self._frames[cache_key] = pd.read_csv(save_path, **read_kwargs)
+        return self._frames[cache_key].copy()
+
+    def _fetch_csv(self, filename, limit=None, usecols=None, dtype=None, names=None, conditional=True):
+        """
+        Fetch CSV data from the API.
+        
+        The body is parsed chunk by chunk while it downloads, keeping only
+        usecols (optionally renamed with names / typed with dtype). With
+        conditional=True the last ETag / Last-Modified are sent back and a
+        304 reuses the previous result without downloading anything.
+        """
+        url = f'{self.base_url}/files/{filename}'
+        if limit:
+            url += f'?limit={limit}'
+        save_path = self.base_dir / filename
+        read_kwargs = _read_kwargs(usecols, dtype, names)
+        cache_key = (url, json.dumps(read_kwargs, sort_keys=True, default=str))
+        
+        headers = dict(self.headers)
+        validators = self._validators.get(url) if conditional and save_path.exists() else None
+        if validators:
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+        
+        for attempt in range(self.max_retries):
+            try:
+                print(f"🚀 Moon Dev API: Fetching {filename}{' with limit '+str(limit) if limit else ''}...")
+                with http.get(url, headers=headers, stream=True) as response:
+                    if response.status_code == 304:
+                        print(f"♻️ {filename} unchanged since last poll - skipping download")
+                        return self._cached_frame(cache_key, save_path, read_kwargs)
+                    response.raise_for_status()
+                    df = self._stream_to_frame(response, save_path, read_kwargs)
+                    response_validators = {
+                        'etag': response.headers.get('ETag'),
+                        'last_modified': response.headers.get('Last-Modified'),
+                    }
                 
-            response = self.session.get(url, headers=self.headers)
-            response.raise_for_status()
-            
-            # Save to cache and read
-            save_path = self.base_dir / filename
-            with open(save_path, 'wb') as f:
-                f.write(response.content)
-            
-            df = pd.read_csv(save_path)
-            print(f"✨ Successfully loaded {len(df)} rows from {filename}")
-            return df
+                if any(response_validators.values()):
+                    self._validators[url] = response_validators
+                    self._save_validators()
+                self._frames = {key: frame for key, frame in self._frames.items() if key[0] != url}
+                self._frames[cache_key] = df
+                print(f"✨ Successfully loaded {len(df)} rows from {filename}")
+                return df.copy()
                 
+            except (requests.exceptions.ChunkedEncodingError,
+                    requests.exceptions.ConnectionError) as e:
+                print(f"⚠️ Attempt {attempt + 1} failed: {str(e)}")
+                if attempt < self.max_retries - 1:
+                    time.sleep(2 ** (attempt + 1))
+                    
+            except Exception as e:
+                print(f"💥 Error fetching {filename}: {str(e)}")
+                return None
+        
+        print(f"💥 Error fetching {filename} after {self.max_retries} attempts")
+        return None
+
+    def _seed_tail(self, filename, url, save_path, read_kwargs, initial_bytes):
+        """Start tailing from the last initial_bytes of the file instead of downloading all of it"""
+        with http.get(url, headers={**self.headers, 'Range': f'bytes=0-{READ_BUFFER_BYTES - 1}'}, stream=True) as response:
+            if response.status_code != 206:
+                return None
+            response.raw.decode_content = True
+            header = response.raw.read(READ_BUFFER_BYTES).split(b'\n', 1)[0] + b'\n'
+        
+        with http.get(url, headers={**self.headers, 'Range': f'bytes=-{initial_bytes}'}) as response:
+            if response.status_code != 206:
+                return None
+            start = int(response.headers['Content-Range'].split()[1].split('-')[0])
+            data = response.content
+        
+        # Drop the header (or the partial row we landed in) and any half-written last row
+        data = data[data.find(b'\n') + 1:]
+        end = data.rfind(b'\n') + 1
+        offset = start + (len(response.content) - len(data)) + end
+        data = data[:end]
+        
+        with open(save_path, 'wb') as f:
+            f.write(header + data)
+        self._tail_state[filename] = {'offset': offset, 'header': header}
+        df = pd.read_csv(io.BytesIO(header + data), **read_kwargs)
+        print(f"✨ Seeded {filename} tail with its last {len(df)} rows ({len(data):,} bytes)")
+        return df
+
+    def tail_csv(self, filename, usecols=None, dtype=None, names=None, initial_bytes=None):
+        """
+        Only the rows appended to filename since the last call, via a byte-range request.
+        
+        The first call downloads the whole file, or just its last
+        initial_bytes when that's set. The whole file is fetched again if the
+        server ignores the range or the file was replaced. Returns (df, full)
+        where full=True means df is a fresh snapshot rather than just the new
+        rows, or (None, False) on error.
+        """
+        url = f'{self.base_url}/files/{filename}'
+        save_path = self.base_dir / filename
+        read_kwargs = _read_kwargs(usecols, dtype, names)
+        state = self._tail_state.get(filename)
+        
+        if state is None or not save_path.exists():
+            if initial_bytes:
+                try:
+                    df = self._seed_tail(filename, url, save_path, read_kwargs, initial_bytes)
+                    if df is not None:
+                        return df, True
+                    print(f"⚠️ Server doesn't support byte ranges for {filename}, downloading it all")
+                except Exception as e:
+                    print(f"💥 Error seeding {filename} tail: {str(e)}")
+                    return None, False
+            df = self._fetch_csv(filename, usecols=usecols, dtype=dtype, names=names, conditional=False)
+            if df is None:
+                return None, False
+            with open(save_path, 'rb') as f:
+                header = f.readline()
+            offset = _complete_length(save_path)
+            if offset < save_path.stat().st_size:
+                # Half-written last row - cut it from the local copy and the frame, the next tail
+                # picks it up whole (like _seed_tail). The copy no longer matches the server's
+                # validators, so forget them.
+                os.truncate(save_path, offset)
+                df = df.iloc[:-1]
+                if self._validators.pop(url, None):
+                    self._save_validators()
+                self._frames = {key: frame for key, frame in self._frames.items() if key[0] != url}
+            self._tail_state[filename] = {'offset': offset, 'header': header}
+            return df, True
+        
+        try:
+            headers = {**self.headers, 'Range': f"bytes={state['offset']}-"}
+            with http.get(url, headers=headers, stream=True) as response:
+                if response.status_code == 416:
+                    # Nothing past our offset - unless the file got shorter, then start over
+                    total = response.headers.get('Content-Range', '').rpartition('/')[2]
+                    if total.isdigit() and int(total) < state['offset']:
+                        print(f"🔄 {filename} was replaced on the server, downloading it again")
+                        self._tail_state.pop(filename)
+                        return self.tail_csv(filename, usecols, dtype, names, initial_bytes)
+                    return pd.read_csv(io.BytesIO(state['header']), **read_kwargs), False
+                if response.status_code == 200:
+                    print(f"⚠️ Server ignored the byte range for {filename}, downloading it all")
+                    self._tail_state.pop(filename)
+                    return self.tail_csv(filename, usecols, dtype, names)
+                response.raise_for_status()
+                data = response.content
         except Exception as e:
-            print(f"💥 Error fetching {filename}: {str(e)}")
-            return None
+            print(f"💥 Error tailing {filename}: {str(e)}")
+            return None, False
+        
+        # Keep whole lines only - a half-written last row is picked up by the next poll
+        data = data[:data.rfind(b'\n') + 1]
+        if data:
+            with open(save_path, 'ab') as f:
+                f.write(data)
+            state['offset'] += len(data)
+        df = pd.read_csv(io.BytesIO(state['header'] + data), **read_kwargs)
+        print(f"✨ {len(df)} new rows from {filename} ({len(data):,} bytes)")
+        return df, False
 
-    def get_liquidation_data(self, limit=10000):
+    def get_liquidation_data(self, limit=10000, usecols=None, dtype=None, names=None):
         """Get liquidation data from API, limited to last N rows by default"""
-        return self._fetch_csv("liq_data.csv", limit=limit)
+        return self._fetch_csv("liq_data.csv", limit=limit, usecols=usecols, dtype=dtype, names=names)
 
-    def get_funding_data(self):
+    def get_funding_data(self, usecols=None, dtype=None):
         """Get funding data from API"""
-        return self._fetch_csv("funding.csv")
+        return self._fetch_csv("funding.csv", usecols=usecols, dtype=dtype)
 
     def get_token_addresses(self):
         """Get token addresses from API"""
         return self._fetch_csv("new_token_addresses.csv")
 
-    def get_oi_total(self):
+    def get_oi_total(self, usecols=None, dtype=None):
         """Get total open interest data from API"""
-        return self._fetch_csv("oi_total.csv")
+        return self._fetch_csv("oi_total.csv", usecols=usecols, dtype=dtype)
 
-    def get_oi_data(self):
+    def get_oi_data(self, usecols=None, dtype=None):
         """Get detailed open interest data from API"""
-        max_retries = 3
-        retry_delay = 2  # seconds
-        
-        for attempt in range(max_retries):
-            try:
-                print(f"🚀 Moon Dev API: Fetching oi.csv... (Attempt {attempt + 1}/{max_retries})")
-                
-                url = f'{self.base_url}/files/oi.csv'
-                
-                # Use stream=True and a larger chunk size
-                response = self.session.get(url, headers=self.headers, stream=True)
-                response.raise_for_status()
-                
-                # Save streamed content to a temporary file first
-                temp_file = self.base_dir / "temp_oi.csv"
-                with open(temp_file, 'wb') as f:
-                    # Use a larger chunk size for better performance
-                    for chunk in response.iter_content(chunk_size=8192*16):
-                        if chunk:
-                            f.write(chunk)
-                
-                # Once download is complete, read the file
-                df = pd.read_csv(temp_file)
-                print(f"✨ Successfully loaded {len(df)} rows from oi.csv")
-                
-                # Move temp file to final location
-                final_file = self.base_dir / "oi.csv"
-                temp_file.rename(final_file)
-                
-                return df
-                
-            except (requests.exceptions.ChunkedEncodingError, 
-                    requests.exceptions.ConnectionError,
-                    requests.exceptions.RequestException) as e:
-                print(f"⚠️ Attempt {attempt + 1} failed: {str(e)}")
-                if attempt < max_retries - 1:
-                    print(f"🔄 Retrying in {retry_delay} seconds...")
-                    time.sleep(retry_delay)
-                    retry_delay *= 2  # Exponential backoff
-                else:
-                    print(f"💥 Error fetching oi.csv after {max_retries} attempts: {str(e)}")
-                    print(f"📋 Stack trace:\n{traceback.format_exc()}")
-                    return None
-                    
-            except Exception as e:
-                print(f"💥 Unexpected error fetching oi.csv: {str(e)}")
-                print(f"📋 Stack trace:\n{traceback.format_exc()}")
-                return None
+        return self._fetch_csv("oi.csv", usecols=usecols, dtype=dtype)
 
     def get_copybot_follow_list(self):
         """Get current copy trading follow list"""
@@ -8,21 +8,22 @@ Chuck the Chart Agent generates and analyzes trading charts using AI vision capa
 import os
 import pandas as pd
 import numpy as np
-import mplfinance as mpf
-import matplotlib.pyplot as plt
 from datetime import datetime, timedelta
 from pathlib import Path
 import time
 from dotenv import load_dotenv
 import anthropic
-import openai
 from src import nice_funcs as n
 from src import nice_funcs_hl as hl
+from src import rate_limiter
+from src.announcer import announcer
 from src.agents.base_agent import BaseAgent
+from src.data.chart_renderer import ChartRenderer
 import traceback
 import base64
 from io import BytesIO
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 # Get the project root directory
 PROJECT_ROOT = Path(__file__).parent.parent.parent
@@ -31,6 +32,7 @@ PROJECT_ROOT = Path(__file__).parent.parent.parent
 CHECK_INTERVAL_MINUTES = 10  # 3 hours and 53 minutes
 TIMEFRAMES = ['15m']#['15m', '1h', '4h', '1d']  # Multiple timeframes to analyze
 LOOKBACK_BARS = 100  # Number of candles to analyze
+CHART_WORKERS = 4  # Symbols loaded / charts analyzed in parallel
 
 # Trading Pairs to Monitor
 SYMBOLS = ["BTC", "FARTCOIN"]  # Add or modify symbols here
@@ -39,6 +41,8 @@ SYMBOLS = ["BTC", "FARTCOIN"]  # Add or modify symbols here
 CHART_STYLE = 'charles'  # mplfinance style
 VOLUME_PANEL = True  # Show volume panel
 INDICATORS = ['SMA20', 'SMA50', 'SMA200', 'RSI', 'MACD']  # Technical indicators to display
+CHART_RENDER_WORKERS = 2  # Processes drawing charts off the main thread
+SAVE_CHARTS = False  # True = also write the latest PNG per symbol/timeframe to src/data/charts
 
 # AI Settings - Override config.py if set
 from src import config
@@ -81,6 +85,11 @@ class ChartAnalysisAgent(BaseAgent):
         self.audio_dir = PROJECT_ROOT / "src" / "audio"
         self.charts_dir.mkdir(parents=True, exist_ok=True)
         self.audio_dir.mkdir(parents=True, exist_ok=True)
+        self._cleanup_old_charts()
+        
+        # Charts are drawn in a process pool and skipped when the candles haven't changed
+        self.renderer = ChartRenderer(max_workers=CHART_RENDER_WORKERS, hash_bars=LOOKBACK_BARS,
+                                      style=CHART_STYLE, volume=VOLUME_PANEL)
         
         # Load environment variables
         load_dotenv()
@@ -92,7 +101,6 @@ class ChartAnalysisAgent(BaseAgent):
         if not openai_key or not anthropic_key:
             raise ValueError("🚨 API keys not found in environment variables!")
             
-        self.openai_client = openai.OpenAI(api_key=openai_key)  # For TTS only
         self.client = anthropic.Anthropic(api_key=anthropic_key)
         
         # Set AI parameters - use config values unless overridden
@@ -108,51 +116,23 @@ class ChartAnalysisAgent(BaseAgent):
         print(f"📈 Using indicators: {', '.join(INDICATORS)}")
         
     def _generate_chart(self, symbol, timeframe, data):
-        """Generate a chart using mplfinance"""
+        """Queue the chart on the render pool - returns a Future of PNG bytes (or None)"""
         try:
-            # Prepare data
-            df = data.copy()
-            df.index = pd.to_datetime(df.index)
-            
-            # Check if data is valid
-            if df.empty:
+            if data.empty:
                 print("❌ No data available for chart generation")
                 return None
-                
-            # Calculate indicators
-            if 'SMA20' in INDICATORS:
-                df['SMA20'] = df['close'].rolling(window=20).mean()
-            if 'SMA50' in INDICATORS:
-                df['SMA50'] = df['close'].rolling(window=50).mean()
-            if 'SMA200' in INDICATORS:
-                df['SMA200'] = df['close'].rolling(window=200).mean()
-            
-            # Create addplot for indicators
-            ap = []
-            colors = ['blue', 'orange', 'purple']
-            for i, sma in enumerate(['SMA20', 'SMA50', 'SMA200']):
-                if sma in INDICATORS and sma in df.columns and not df[sma].isna().all():
-                    ap.append(mpf.make_addplot(df[sma], color=colors[i]))
-            
-            # Save chart
-            filename = f"{symbol}_{timeframe}_{int(time.time())}.png"
-            chart_path = self.charts_dir / filename
-            
-            # Create the chart
-            mpf.plot(df,
-                    type='candle',
-                    style=CHART_STYLE,
-                    volume=VOLUME_PANEL,
-                    addplot=ap if ap else None,
-                    title=f"\n{symbol} {timeframe} Chart Analysis by Moon Dev 🌙",
-                    savefig=chart_path)
-            
-            return chart_path
+            return self.renderer.render(symbol, timeframe, data, indicators=INDICATORS)
             
         except Exception as e:
             print(f"❌ Error generating chart: {str(e)}")
             traceback.print_exc()
             return None
+    
+    def _save_chart(self, symbol, timeframe, png):
+        """Write the latest PNG for this symbol/timeframe (overwrites the previous one)"""
+        chart_path = self.charts_dir / f"{symbol}_{timeframe}.png"
+        chart_path.write_bytes(png)
+        return chart_path
             
     def _analyze_chart(self, symbol, timeframe, data):
         """Analyze chart data using Claude"""
@@ -180,15 +160,16 @@ class ChartAnalysisAgent(BaseAgent):
             print(f"\n🤖 Analyzing {symbol} with AI...")
             
             # Get AI analysis using instance settings
-            message = self.client.messages.create(
-                model=self.ai_model,
-                max_tokens=self.ai_max_tokens,
-                temperature=self.ai_temperature,
-                messages=[{
-                    "role": "user",
-                    "content": context
-                }]
-            )
+            with rate_limiter.limit('anthropic'):
+                message = self.client.messages.create(
+                    model=self.ai_model,
+                    max_tokens=self.ai_max_tokens,
+                    temperature=self.ai_temperature,
+                    messages=[{
+                        "role": "user",
+                        "content": context
+                    }]
+                )
             
             if not message or not message.content:
                 print("❌ No response from AI")
@@ -287,26 +268,100 @@ class ChartAnalysisAgent(BaseAgent):
         try:
             print(f"\n📢 Announcing: {message}")
             
-            # Generate speech
-            response = self.openai_client.audio.speech.create(
-                model=VOICE_MODEL,
-                voice=VOICE_NAME,
-                input=message,
-                speed=VOICE_SPEED
-            )
-            
-            # Save audio file
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            audio_file = self.audio_dir / f"chart_alert_{timestamp}.mp3"
-            
-            response.stream_to_file(str(audio_file))
-            
-            # Play audio
-            os.system(f"afplay {audio_file}")
+            # Queued on the shared announcer - synthesis and playback happen in the background
+            announcer.say(message, voice=VOICE_NAME, model=VOICE_MODEL, speed=VOICE_SPEED, key='chartanalysis')
             
         except Exception as e:
             print(f"❌ Error in announcement: {str(e)}")
             
+    def _add_chart_indicators(self, data):
+        """Make sure the SMAs the chart and prompt use are there"""
+        if 'SMA20' not in data.columns:
+            data['SMA20'] = data['close'].rolling(window=20).mean()
+        if 'SMA50' not in data.columns:
+            data['SMA50'] = data['close'].rolling(window=50).mean()
+        if 'SMA200' not in data.columns:
+            data['SMA200'] = data['close'].rolling(window=200).mean()
+        return data
+
+    def _chart_and_analyze(self, symbol, timeframe, data):
+        """Worker step for one symbol/timeframe: render the chart, then ask the AI"""
+        data = self._add_chart_indicators(data)
+        print(f"\n📊 Generating chart for {symbol} {timeframe}...")
+        chart = self._generate_chart(symbol, timeframe, data)
+        
+        # The chart draws in another process while the AI works
+        print(f"\n🔍 Analyzing {symbol} {timeframe}...")
+        analysis = self._analyze_chart(symbol, timeframe, data)
+        
+        chart_png, chart_path = None, None
+        try:
+            chart_png = chart.result() if chart is not None else None
+            if chart_png and SAVE_CHARTS:
+                chart_path = self._save_chart(symbol, timeframe, chart_png)
+        except Exception as e:
+            print(f"❌ Error rendering chart: {str(e)}")
+        
+        return {
+            'symbol': symbol,
+            'timeframe': timeframe,
+            'data': data,
+            'chart_png': chart_png,
+            'chart_path': chart_path,
+            'analysis': analysis,
+        }
+
+    def _report(self, result):
+        """Print the chart data + analysis boxes and announce (main thread, one at a time)"""
+        symbol, timeframe, data = result['symbol'], result['timeframe'], result['data']
+        analysis = result['analysis']
+        
+        if result['chart_path']:
+            print(f"📈 Chart saved to: {result['chart_path']}")
+        elif result['chart_png']:
+            print(f"📈 Chart rendered in memory ({len(result['chart_png']) / 1024:.0f} KB)")
+        
+        # Debug print the chart data
+        print("\n" + "╔" + "═" * 60 + "╗")
+        print(f"║    🌙 Chart Data for {symbol} {timeframe} - Last 5 Candles    ║")
+        print("╠" + "═" * 60 + "╣")
+        print(f"║ Time │ Open │ High │ Low │ Close │ Volume │")
+        print("╟" + "─" * 60 + "╢")
+        
+        # Print last 5 candles with proper timestamp formatting
+        last_5 = data.tail(5)
+        for _, row in last_5.iterrows():
+            time_str = pd.to_datetime(row['timestamp']).strftime('%Y-%m-%d %H:%M')  # Include date and time
+            print(f"║ {time_str} │ {row['open']:.2f} │ {row['high']:.2f} │ {row['low']:.2f} │ {row['close']:.2f} │ {row['volume']:.0f} │")
+        
+        print("\n║ Technical Indicators:")
+        print(f"║ SMA20: {data['SMA20'].iloc[-1]:.2f}")
+        print(f"║ SMA50: {data['SMA50'].iloc[-1]:.2f}")
+        print(f"║ SMA200: {data['SMA200'].iloc[-1] if not pd.isna(data['SMA200'].iloc[-1]) else 'Not enough data'}")
+        print(f"║ 24h High: {data['high'].max():.2f}")
+        print(f"║ 24h Low: {data['low'].min():.2f}")
+        print(f"║ Volume Trend: {'Increasing' if data['volume'].iloc[-1] > data['volume'].mean() else 'Decreasing'}")
+        print("╚" + "═" * 60 + "╝")
+        
+        if analysis and all(k in analysis for k in ['direction', 'analysis', 'action', 'confidence']):
+            # Format and announce
+            message = self._format_announcement(symbol, timeframe, analysis)
+            if message:
+                self._announce(message)
+                
+            # Print analysis in a nice box
+            print("\n" + "╔" + "═" * 50 + "╗")
+            print(f"║    🌙 Moon Dev's Chart Analysis - {symbol} {timeframe}   ║")
+            print("╠" + "═" * 50 + "╣")
+            print(f"║  Direction: {analysis['direction']:<41} ║")
+            print(f"║  Action: {analysis['action']:<44} ║")
+            print(f"║  Confidence: {analysis['confidence']}%{' ' * 37}║")
+            print("╟" + "─" * 50 + "╢")
+            print(f"║  Analysis: {analysis['analysis']:<41} ║")
+            print("╚" + "═" * 50 + "╝")
+        else:
+            print("❌ Invalid analysis result")
+
     def analyze_symbol(self, symbol, timeframe):
         """Analyze a single symbol on a specific timeframe"""
         try:
@@ -321,73 +376,24 @@ class ChartAnalysisAgent(BaseAgent):
             if data is None or data.empty:
                 print(f"❌ No data available for {symbol} {timeframe}")
                 return
-                
-            # Calculate additional indicators
-            if 'SMA20' not in data.columns:
-                data['SMA20'] = data['close'].rolling(window=20).mean()
-            if 'SMA50' not in data.columns:
-                data['SMA50'] = data['close'].rolling(window=50).mean()
-            if 'SMA200' not in data.columns:
-                data['SMA200'] = data['close'].rolling(window=200).mean()
-            
-            # Generate and save chart first
-            print(f"\n📊 Generating chart for {symbol} {timeframe}...")
-            chart_path = self._generate_chart(symbol, timeframe, data)
-            if chart_path:
-                print(f"📈 Chart saved to: {chart_path}")
-            
-            # Debug print the chart data
-            print("\n" + "╔" + "═" * 60 + "╗")
-            print(f"║    🌙 Chart Data for {symbol} {timeframe} - Last 5 Candles    ║")
-            print("╠" + "═" * 60 + "╣")
-            print(f"║ Time │ Open │ High │ Low │ Close │ Volume │")
-            print("╟" + "─" * 60 + "╢")
             
-            # Print last 5 candles with proper timestamp formatting
-            last_5 = data.tail(5)
-            last_5.index = pd.to_datetime(last_5.index)
-            for idx, row in last_5.iterrows():
-                time_str = idx.strftime('%Y-%m-%d %H:%M')  # Include date and time
-                print(f"║ {time_str} │ {row['open']:.2f} │ {row['high']:.2f} │ {row['low']:.2f} │ {row['close']:.2f} │ {row['volume']:.0f} │")
-            
-            print("\n║ Technical Indicators:")
-            print(f"║ SMA20: {data['SMA20'].iloc[-1]:.2f}")
-            print(f"║ SMA50: {data['SMA50'].iloc[-1]:.2f}")
-            print(f"║ SMA200: {data['SMA200'].iloc[-1] if not pd.isna(data['SMA200'].iloc[-1]) else 'Not enough data'}")
-            print(f"║ 24h High: {data['high'].max():.2f}")
-            print(f"║ 24h Low: {data['low'].min():.2f}")
-            print(f"║ Volume Trend: {'Increasing' if data['volume'].iloc[-1] > data['volume'].mean() else 'Decreasing'}")
-            print("╚" + "═" * 60 + "╝")
-                
-            # Analyze with AI
-            print(f"\n🔍 Analyzing {symbol} {timeframe}...")
-            analysis = self._analyze_chart(symbol, timeframe, data)
-            
-            if analysis and all(k in analysis for k in ['direction', 'analysis', 'action', 'confidence']):
-                # Format and announce
-                message = self._format_announcement(symbol, timeframe, analysis)
-                if message:
-                    self._announce(message)
-                    
-                # Print analysis in a nice box
-                print("\n" + "╔" + "═" * 50 + "╗")
-                print(f"║    🌙 Moon Dev's Chart Analysis - {symbol} {timeframe}   ║")
-                print("╠" + "═" * 50 + "╣")
-                print(f"║  Direction: {analysis['direction']:<41} ║")
-                print(f"║  Action: {analysis['action']:<44} ║")
-                print(f"║  Confidence: {analysis['confidence']}%{' ' * 37}║")
-                print("╟" + "─" * 50 + "╢")
-                print(f"║  Analysis: {analysis['analysis']:<41} ║")
-                print("╚" + "═" * 50 + "╝")
-            else:
-                print("❌ Invalid analysis result")
+            self._report(self._chart_and_analyze(symbol, timeframe, data))
             
         except Exception as e:
             print(f"❌ Error analyzing {symbol} {timeframe}: {str(e)}")
             traceback.print_exc()
+
+    def _load_symbol(self, symbol):
+        """Every timeframe for one symbol from a single fetch of its finest interval"""
+        try:
+            return hl.get_data_multi(symbol, TIMEFRAMES, bars=LOOKBACK_BARS, add_indicators=True)
+        except Exception as e:
+            print(f"❌ Error loading data for {symbol}: {str(e)}")
+            traceback.print_exc()
+            return {}
             
     def _cleanup_old_charts(self):
-        """Remove all existing charts from the charts directory"""
+        """Remove charts left over from earlier runs (saved charts are overwritten in place after that)"""
         try:
             for chart in self.charts_dir.glob("*.png"):
                 chart.unlink()
@@ -398,13 +404,27 @@ class ChartAnalysisAgent(BaseAgent):
     def run_monitoring_cycle(self):
         """Run one monitoring cycle"""
         try:
-            # Clean up old charts before starting new cycle
-            self._cleanup_old_charts()
-            
-            for symbol in SYMBOLS:
-                for timeframe in TIMEFRAMES:
-                    self.analyze_symbol(symbol, timeframe)
-                    time.sleep(2)  # Small delay between analyses
+            with ThreadPoolExecutor(max_workers=CHART_WORKERS) as executor:
+                # 1. One batch load per symbol (finest timeframe fetched once, the rest resampled)
+                frames = dict(zip(SYMBOLS, executor.map(self._load_symbol, SYMBOLS)))
+                
+                # 2. Fan the chart + AI steps out over the pool
+                jobs = []
+                for symbol in SYMBOLS:
+                    for timeframe in TIMEFRAMES:
+                        data = frames.get(symbol, {}).get(timeframe)
+                        if data is None or data.empty:
+                            print(f"❌ No data available for {symbol} {timeframe}")
+                            continue
+                        jobs.append(executor.submit(self._chart_and_analyze, symbol, timeframe, data))
+                
+                # 3. Report in SYMBOLS x TIMEFRAMES order so announcements never overlap
+                for job in jobs:
+                    try:
+                        self._report(job.result())
+                    except Exception as e:
+                        print(f"❌ Error in chart analysis job: {str(e)}")
+                        traceback.print_exc()
                     
         except Exception as e:
             print(f"❌ Error in monitoring cycle: {str(e)}")
@@ -421,6 +441,7 @@ class ChartAnalysisAgent(BaseAgent):
                 
             except KeyboardInterrupt:
                 print("\n👋 Chuck the Chart Agent shutting down gracefully...")
+                self.renderer.shutdown()
                 break
             except Exception as e:
                 print(f"❌ Error in main loop: {str(e)}")
@@ -21,10 +21,14 @@ import time
 from src.config import *
 from src import nice_funcs as n
 from src.data.ohlcv_collector import collect_all_tokens, collect_token_data
+from src.data.market_encoder import encode_market_data
 
 # Data path for current copybot portfolio
 COPYBOT_PORTFOLIO_PATH = '/Users/md/Dropbox/dev/github/solana-copy-trader/csvs/current_portfolio.csv'
 
+# Token budget for the encoded market data in each position prompt
+COPYBOT_PROMPT_TOKEN_BUDGET = 1500
+
 # LLM Prompts
 PORTFOLIO_ANALYSIS_PROMPT = """
 You are Moon Dev's CopyBot Agent 🌙
@@ -126,7 +130,7 @@ class CopyBotAgent:
             full_prompt = f"""
 {PORTFOLIO_ANALYSIS_PROMPT.format(
     portfolio_data=position_data.to_string(),
-    market_data=token_market_data
+    market_data=encode_market_data(token_market_data, max_tokens=COPYBOT_PROMPT_TOKEN_BUDGET)
 )}
 """
             print("\n📝 Full Prompt Being Sent to LLM:")
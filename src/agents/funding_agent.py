@@ -30,6 +30,8 @@ from src import nice_funcs_hl as hl
 from src.agents.api import MoonDevAPI
 from collections import deque
 from src.agents.base_agent import BaseAgent
+from src.data.storage import TimeSeriesStore
+from src.announcer import announcer
 import traceback
 import numpy as np
 import re
@@ -65,6 +67,18 @@ AI_MODEL = False  # Set to model name to override config.AI_MODEL
 AI_TEMPERATURE = 0  # Set > 0 to override config.AI_TEMPERATURE
 AI_MAX_TOKENS = 25  # Set > 0 to override config.AI_MAX_TOKENS
 
+# Funding history settings
+FUNDING_HISTORY_HOURS = 24 * 7  # Kept on disk and in memory
+CHANGE_LOOKBACK_MINUTES = 60  # Rates are compared against this far back
+
+# Long-format funding history schema - one row per (event_time, symbol)
+FUNDING_HISTORY_SCHEMA = {
+    'event_time': 'datetime64[ns]',
+    'symbol': 'string',
+    'funding_rate': 'float64',
+    'annual_rate': 'float64',
+}
+
 # Voice settings
 VOICE_MODEL = "tts-1"
 VOICE_NAME = "fable"  # Options: alloy, echo, fable, onyx, nova, shimmer
@@ -91,6 +105,30 @@ Remember:
 - Use BTC's trend to gauge overall market direction
 """
 
+def _parse_event_times(values, now):
+    """
+    API event_time -> datetimes. Epoch numbers are ms; bare 'HH:MM:SS' strings
+    get the date of `now` (or the day before if that would be in the future).
+    """
+    if pd.api.types.is_numeric_dtype(values):
+        return pd.to_datetime(values, unit='ms')
+    values = values.astype(str)
+    has_date = values.str.contains(r'[-/]', regex=True)
+    parsed = pd.to_datetime(values.where(has_date, now.strftime('%Y-%m-%d ') + values),
+                            format='mixed', errors='coerce')
+    future = ~has_date & (parsed > now + timedelta(minutes=1))
+    return parsed.where(~future, parsed - timedelta(days=1))
+
+def _wide_to_long(wide, now):
+    """Old wide funding_history.csv ({symbol}_funding_rate / {symbol}_annual_rate columns) -> long rows"""
+    long = wide.melt(id_vars='event_time', var_name='column', value_name='value').dropna(subset=['value'])
+    parts = long['column'].str.rsplit('_', n=2, expand=True)
+    long['symbol'] = parts[0]
+    long['field'] = parts[1] + '_' + parts[2]
+    long = long.pivot_table(index=['event_time', 'symbol'], columns='field', values='value', aggfunc='last').reset_index()
+    long['event_time'] = _parse_event_times(long['event_time'], now)
+    return long[['event_time', 'symbol', 'funding_rate', 'annual_rate']]
+
 class FundingAgent(BaseAgent):
     """Fran the Funding Rate Monitor 💰"""
     
@@ -139,8 +177,9 @@ class FundingAgent(BaseAgent):
         self.audio_dir.mkdir(parents=True, exist_ok=True)
         self.data_dir.mkdir(parents=True, exist_ok=True)
         
-        # Initialize or load historical data
+        # Initialize or load historical data (long format, append-only partitions)
         self.history_file = self.data_dir / "funding_history.csv"
+        self.history_store = TimeSeriesStore('funding_history', FUNDING_HISTORY_SCHEMA, time_column='event_time')
         self.load_history()
         
         print("💰 Fran the Funding Agent initialized!")
@@ -274,35 +313,42 @@ class FundingAgent(BaseAgent):
         try:
             opportunities = {}
             
-            for _, row in current_data.iterrows():
+            # Change vs the lookback straight from the in-memory history
+            changes = self._rate_changes(current_data)
+            extreme = current_data[
+                (current_data['annual_rate'] < NEGATIVE_THRESHOLD) | (current_data['annual_rate'] > POSITIVE_THRESHOLD)
+            ]
+            
+            for _, row in extreme.iterrows():
                 try:
                     annual_rate = float(row['annual_rate'])
                     symbol = str(row['symbol'])
                     
-                    if annual_rate < NEGATIVE_THRESHOLD or annual_rate > POSITIVE_THRESHOLD:
-                        # Get OHLCV data silently
-                        market_data = hl.get_data(
+                    row[f'annual_rate_change_{CHANGE_LOOKBACK_MINUTES}m'] = changes.get(symbol)
+                    
+                    # Get OHLCV data silently
+                    market_data = hl.get_data(
+                        symbol=symbol,
+                        timeframe=TIMEFRAME,
+                        bars=LOOKBACK_BARS,
+                        add_indicators=True
+                    )
+                    
+                    if not market_data.empty:
+                        analysis = self._analyze_opportunity(
                             symbol=symbol,
-                            timeframe=TIMEFRAME,
-                            bars=LOOKBACK_BARS,
-                            add_indicators=True
+                            funding_data=row.to_frame().T,
+                            market_data=market_data
                         )
                         
-                        if not market_data.empty:
-                            analysis = self._analyze_opportunity(
-                                symbol=symbol,
-                                funding_data=row.to_frame().T,
-                                market_data=market_data
-                            )
-                            
-                            if analysis:
-                                opportunities[symbol] = {
-                                    'annual_rate': annual_rate,
-                                    'action': analysis['action'],
-                                    'analysis': analysis['analysis'],
-                                    'confidence': analysis['confidence']
-                                }
-                            
+                        if analysis:
+                            opportunities[symbol] = {
+                                'annual_rate': annual_rate,
+                                'action': analysis['action'],
+                                'analysis': analysis['analysis'],
+                                'confidence': analysis['confidence']
+                            }
+                        
                 except Exception as e:
                     continue
             
@@ -353,47 +399,63 @@ class FundingAgent(BaseAgent):
         try:
             print(f"\n📢 Announcing: {message}")
             
-            # Generate speech
-            response = openai.audio.speech.create(
-                model=VOICE_MODEL,
-                voice=VOICE_NAME,
-                input=message,
-                speed=VOICE_SPEED
-            )
-            
-            # Save audio file
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            audio_file = self.audio_dir / f"funding_alert_{timestamp}.mp3"
-            
-            response.stream_to_file(audio_file)
-            
-            # Play audio using system command
-            os.system(f"afplay {audio_file}")
+            # Queued on the shared announcer - synthesis and playback happen in the background
+            announcer.say(message, voice=VOICE_NAME, model=VOICE_MODEL, speed=VOICE_SPEED, key='funding')
             
         except Exception as e:
             print(f"❌ Error in announcement: {str(e)}")
 
     def load_history(self):
-        """Load or initialize historical funding rate data"""
+        """Load the funding history from the store (the old wide CSV is imported once)"""
         try:
-            # Always start with clean history using the new format
-            self.funding_history = pd.DataFrame(columns=['timestamp', 'symbol', 'funding_rate', 'annual_rate'])
-            print("📝 Initialized new funding rate history")
-            
             if self.history_file.exists():
+                if self.history_store.is_empty():
+                    file_time = datetime.fromtimestamp(self.history_file.stat().st_mtime)
+                    legacy = _wide_to_long(pd.read_csv(self.history_file), file_time)
+                    self.history_store.append(legacy)
+                    print(f"📦 Imported {len(legacy)} rows from the old funding history file")
+                
                 # Keep just one backup file
                 backup_file = self.data_dir / "funding_history_backup.csv"
-                os.rename(self.history_file, backup_file)
+                os.replace(self.history_file, backup_file)
                 print(f"📦 Backed up old history file")
+            
+            cutoff_time = datetime.now() - timedelta(hours=FUNDING_HISTORY_HOURS)
+            self.history_store.drop_before(cutoff_time)
+            history = self.history_store.read(start=cutoff_time)
+            self.funding_history = (
+                history.drop_duplicates(subset=['event_time', 'symbol'], keep='last')
+                .set_index(['event_time', 'symbol'])
+                .sort_index()
+            )
+            print(f"📈 Loaded {len(self.funding_history)} historical funding records")
                 
         except Exception as e:
             print(f"❌ Error loading history: {str(e)}")
-            self.funding_history = pd.DataFrame(columns=['timestamp', 'symbol', 'funding_rate', 'annual_rate'])
+            self.funding_history = pd.DataFrame(
+                columns=['event_time', 'symbol', 'funding_rate', 'annual_rate']
+            ).set_index(['event_time', 'symbol'])
+    
+    def funding_wide(self, value='annual_rate'):
+        """History as one row per event_time and one column per symbol (single vectorized pivot)"""
+        return self.funding_history[value].unstack('symbol')
+    
+    def _rates_at(self, when, value='annual_rate'):
+        """Latest rate per symbol at or before `when` (Series indexed by symbol)"""
+        wide = self.funding_wide(value)
+        wide = wide[wide.index <= pd.Timestamp(when)]
+        return wide.ffill().iloc[-1] if not wide.empty else pd.Series(dtype='float64')
+    
+    def _rate_changes(self, current_data, lookback_minutes=CHANGE_LOOKBACK_MINUTES):
+        """Change in annual rate per symbol vs lookback_minutes ago (NaN where there's no history yet)"""
+        previous = self._rates_at(datetime.now() - timedelta(minutes=lookback_minutes))
+        current = current_data.set_index('symbol')['annual_rate']
+        return current - previous.reindex(current.index)
             
     def _get_current_funding(self):
         """Get current funding rate data"""
         try:
-            df = self.api.get_funding_data()
+            df = self.api.get_funding_data(usecols=['symbol', 'event_time', 'funding_rate', 'yearly_funding_rate'])
             
             if df is not None and not df.empty:
                 # Get latest data for each symbol
@@ -416,42 +478,23 @@ class FundingAgent(BaseAgent):
             return None
 
     def _save_to_history(self, current_data):
-        """Save current funding data to history"""
+        """Append the new (event_time, symbol) rows to the store and the in-memory history"""
         try:
             if current_data is not None and not current_data.empty:
-                # Convert to wide format with all symbols in one row
-                wide_data = pd.DataFrame()
-                wide_data['event_time'] = [current_data['event_time'].iloc[0]]  # Use first event_time
-                
-                # Add columns for each symbol's funding and annual rates
-                for _, row in current_data.iterrows():
-                    symbol = row['symbol']
-                    wide_data[f'{symbol}_funding_rate'] = row['funding_rate']
-                    wide_data[f'{symbol}_annual_rate'] = row['annual_rate']
-                
-                # Concatenate with existing history
-                if self.funding_history.empty:
-                    self.funding_history = wide_data
-                else:
-                    self.funding_history = pd.concat([self.funding_history, wide_data], ignore_index=True)
-                
-                # Drop duplicates based on event_time
-                self.funding_history = self.funding_history.drop_duplicates(
-                    subset=['event_time'], 
-                    keep='last'
-                )
-                
-                # Keep only last 24 hours of data
-                cutoff_time = datetime.now() - timedelta(hours=24)
-                self.funding_history = self.funding_history[
-                    pd.to_datetime(self.funding_history['event_time']) > cutoff_time
-                ]
+                rows = current_data[['event_time', 'symbol', 'funding_rate', 'annual_rate']].copy()
+                rows['event_time'] = _parse_event_times(rows['event_time'], datetime.now())
+                rows = rows.dropna(subset=['event_time']).set_index(['event_time', 'symbol'])
                 
-                # Sort by event_time
-                self.funding_history = self.funding_history.sort_values('event_time')
+                # Only rows we haven't stored yet
+                rows = rows[~rows.index.isin(self.funding_history.index)]
+                if rows.empty:
+                    return
+                self.history_store.append(rows.reset_index())
                 
-                # Save to file
-                self.funding_history.to_csv(self.history_file, index=False)
+                cutoff_time = datetime.now() - timedelta(hours=FUNDING_HISTORY_HOURS)
+                history = pd.concat([self.funding_history, rows]).sort_index()
+                self.funding_history = history[history.index.get_level_values('event_time') > cutoff_time]
+                self.history_store.drop_before(cutoff_time)
                 
         except Exception as e:
             print(f"❌ Error saving to history: {str(e)}")
@@ -13,6 +13,7 @@ import traceback
 from datetime import datetime
 from pathlib import Path
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 import pandas as pd
 from anthropic import Anthropic
@@ -20,12 +21,15 @@ from dotenv import load_dotenv
 import openai
 
 from src.agents.base_agent import BaseAgent
-from src.nice_funcs_hl import get_funding_rates
+from src.nice_funcs_hl import get_asset_contexts
+from src import rate_limiter
+from src.announcer import announcer
 from src.config import AI_MODEL, AI_TEMPERATURE, AI_MAX_TOKENS
 
 # Configuration
 CHECK_INTERVAL_MINUTES = 15  # How often to check funding rates
 YEARLY_FUNDING_THRESHOLD = 100 # 100% yearly funding rate threshold - only for positive rates
+ANALYSIS_WORKERS = 4  # Max AI analyses running at once (each provider is also rate limited)
 
 # Model override settings - Adding DeepSeek support
 MODEL_OVERRIDE = "deepseek-chat"  # Set to "deepseek-chat" or "deepseek-reasoner" to use DeepSeek, "0" to use default
@@ -153,36 +157,38 @@ class FundingArbAgent(BaseAgent):
             # Use DeepSeek if configured
             if self.deepseek_client and MODEL_OVERRIDE.lower() == "deepseek-chat":
                 print("🚀 Using DeepSeek for analysis...")
-                response = self.deepseek_client.chat.completions.create(
-                    model="deepseek-chat",
-                    messages=[
-                        {"role": "system", "content": "You are a funding arbitrage analyst. You must respond in exactly 2 lines: ARBITRAGE/SKIP and your reason."},
-                        {"role": "user", "content": FUNDING_ANALYSIS_PROMPT.format(
-                            market_data=context,
-                            threshold=YEARLY_FUNDING_THRESHOLD
-                        )}
-                    ],
-                    max_tokens=self.ai_max_tokens,
-                    temperature=self.ai_temperature,
-                    stream=False
-                )
+                with rate_limiter.limit('deepseek'):
+                    response = self.deepseek_client.chat.completions.create(
+                        model="deepseek-chat",
+                        messages=[
+                            {"role": "system", "content": "You are a funding arbitrage analyst. You must respond in exactly 2 lines: ARBITRAGE/SKIP and your reason."},
+                            {"role": "user", "content": FUNDING_ANALYSIS_PROMPT.format(
+                                market_data=context,
+                                threshold=YEARLY_FUNDING_THRESHOLD
+                            )}
+                        ],
+                        max_tokens=self.ai_max_tokens,
+                        temperature=self.ai_temperature,
+                        stream=False
+                    )
                 content = response.choices[0].message.content.strip()
             else:
                 # Use Claude as before
                 print("🤖 Using Claude for analysis...")
-                response = self.client.messages.create(
-                    model=self.ai_model,
-                    max_tokens=self.ai_max_tokens,
-                    temperature=self.ai_temperature,
-                    system="You are a funding arbitrage analyst. You must respond in exactly 2 lines: ARBITRAGE/SKIP and your reason.",
-                    messages=[{
-                        "role": "user",
-                        "content": FUNDING_ANALYSIS_PROMPT.format(
-                            market_data=context,
-                            threshold=YEARLY_FUNDING_THRESHOLD
-                        )
-                    }]
-                )
+                with rate_limiter.limit('anthropic'):
+                    response = self.client.messages.create(
+                        model=self.ai_model,
+                        max_tokens=self.ai_max_tokens,
+                        temperature=self.ai_temperature,
+                        system="You are a funding arbitrage analyst. You must respond in exactly 2 lines: ARBITRAGE/SKIP and your reason.",
+                        messages=[{
+                            "role": "user",
+                            "content": FUNDING_ANALYSIS_PROMPT.format(
+                                market_data=context,
+                                threshold=YEARLY_FUNDING_THRESHOLD
+                            )
+                        }]
+                    )
                 content = str(response.content)
             
             print(f"\n🤖 Raw AI response:\n{content}")  # Debug print
@@ -251,22 +257,8 @@ class FundingArbAgent(BaseAgent):
         try:
             print(f"\n📢 Announcing: {message}")
             
-            # Generate speech
-            response = openai.audio.speech.create(
-                model=VOICE_MODEL,
-                voice=VOICE_NAME,
-                input=message,
-                speed=VOICE_SPEED
-            )
-            
-            # Save audio file
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            audio_file = self.audio_dir / f"fundingarb_alert_{timestamp}.mp3"
-            
-            response.stream_to_file(audio_file)
-            
-            # Play audio using system command
-            os.system(f"afplay {audio_file}")
+            # Queued on the shared announcer - synthesis and playback happen in the background
+            announcer.say(message, voice=VOICE_NAME, model=VOICE_MODEL, speed=VOICE_SPEED, key='fundingarb')
             
         except Exception as e:
             print(f"❌ Error in announcement: {str(e)}")
@@ -275,53 +267,80 @@ class FundingArbAgent(BaseAgent):
         """Wrapper for _announce to match base agent interface"""
         self._announce(message)
     
+    def _screen_tokens(self):
+        """
+        Pre-filter every monitored token against YEARLY_FUNDING_THRESHOLD using
+        one funding snapshot. Returns [(symbol, data, annual_rate)] for the ones
+        that cross it, in MONITOR_TOKENS order.
+        """
+        snapshot = get_asset_contexts()
+        if snapshot is None:
+            print("❌ Couldn't get a fresh funding snapshot from Hyperliquid")
+            return []
+        print(f"📸 Screening on a funding snapshot {snapshot.age():.0f}s old")
+        
+        annual_rates = snapshot.annual_funding_pct().reindex(MONITOR_TOKENS)
+        missing = annual_rates.index[annual_rates.isna()].tolist()
+        if missing:
+            print(f"❌ Not found in Hyperliquid universe: {', '.join(missing)}")
+        
+        for symbol, annual_rate in annual_rates.dropna().items():
+            print(f"💰 {symbol:<10} Annual Rate: {annual_rate:.2f}%")
+        
+        # Only positive rates above threshold move on to the AI stage
+        hot = annual_rates[annual_rates > YEARLY_FUNDING_THRESHOLD]
+        return [(symbol, snapshot.get(symbol), float(annual_rate)) for symbol, annual_rate in hot.items()]
+    
+    def _evaluate(self, symbol, data, annual_rate):
+        """AI stage for one token that passed the screen (runs on the worker pool)"""
+        hourly_rate = float(data['funding_rate']) * 100
+        
+        # Get market data for context
+        market_data = f"""
+            Symbol: {symbol}
+            Current Price: ${data['mark_price']:,.2f}
+            Hourly Funding Rate: {hourly_rate:.4f}%
+            Annualized Rate: {annual_rate:.2f}%
+            Open Interest: {data['open_interest']:,.2f}
+            """
+        
+        print(f"🤖 Analyzing {symbol} opportunity...")
+        return self._analyze_opportunity(symbol, data, market_data)
+    
     def run_monitoring_cycle(self):
         """Run one monitoring cycle checking all tokens"""
         try:
             print("\n🔍 Scanning monitored tokens for funding arbitrage opportunities...")
             print(f"📊 Checking {len(MONITOR_TOKENS)} tokens: {', '.join(MONITOR_TOKENS)}")
             
-            # Check each monitored symbol
-            for symbol in MONITOR_TOKENS:
-                try:
-                    print(f"\n🔄 Fetching funding rate for {symbol}...")
-                    data = get_funding_rates(symbol)
-                    if data:
-                        hourly_rate = float(data['funding_rate']) * 100
-                        annual_rate = hourly_rate * 24 * 365
-                        
-                        # Always show the funding rate
-                        print(f"💰 Annual Rate: {annual_rate:.2f}%")
-                        
-                        # Only check positive rates above threshold
-                        if annual_rate > YEARLY_FUNDING_THRESHOLD:
-                            print(f"\n🎯 High positive funding detected on {symbol}!")
-                            
-                            # Get market data for context
-                            market_data = f"""
-                            Symbol: {symbol}
-                            Current Price: ${data['mark_price']:,.2f}
-                            Hourly Funding Rate: {hourly_rate:.4f}%
-                            Annualized Rate: {annual_rate:.2f}%
-                            Open Interest: {data['open_interest']:,.2f}
-                            """
-                            
-                            # Analyze opportunity with debug prints
-                            print(f"🤖 Analyzing {symbol} opportunity...")
-                            analysis = self._analyze_opportunity(symbol, data, market_data)
+            # 1. Screen every token at once from a single funding snapshot
+            candidates = self._screen_tokens()
+            if not candidates:
+                print(f"\n😴 No tokens above {YEARLY_FUNDING_THRESHOLD}% yearly funding")
+                print("\n✨ Monitoring cycle complete!")
+                return
+            print(f"\n🎯 High positive funding detected on {', '.join(symbol for symbol, _, _ in candidates)}!")
+            
+            # 2. AI analysis for the survivors only, a few at a time
+            with ThreadPoolExecutor(max_workers=min(ANALYSIS_WORKERS, len(candidates))) as executor:
+                futures = [executor.submit(self._evaluate, *candidate) for candidate in candidates]
+                
+                # 3. Announce in MONITOR_TOKENS order as results come in
+                for (symbol, data, _), future in zip(candidates, futures):
+                    try:
+                        analysis = future.result()
+                        if analysis:
+                            print(f"✅ Analysis received for {symbol}: {analysis}")
+                            if analysis['action'] == "ARBITRAGE":
+                                # Format and speak announcement
+                                announcement = self._format_announcement(symbol, data, analysis)
+                                self.speak(announcement)
+                        else:
+                            print(f"❌ No valid analysis received for {symbol}")
                             
-                            if analysis:
-                                print(f"✅ Analysis received: {analysis}")
-                                if analysis['action'] == "ARBITRAGE":
-                                    # Format and speak announcement
-                                    announcement = self._format_announcement(symbol, data, analysis)
-                                    self.speak(announcement)
-                            else:
-                                print("❌ No valid analysis received")
-                                
-                except Exception as e:
-                    print(f"❌ Error processing {symbol}: {str(e)}")
-                    continue
+                    except Exception as e:
+                        print(f"❌ Error processing {symbol}: {str(e)}")
+                        continue
             
             print("\n✨ Monitoring cycle complete!")
             
@@ -21,6 +21,9 @@ from src import nice_funcs_hl as hl
 from src.agents.api import MoonDevAPI
 from collections import deque
 from src.agents.base_agent import BaseAgent
+from src.data.storage import TimeSeriesStore
+from src.data.liquidation_store import LiquidationEventStore
+from src.announcer import announcer
 import traceback
 import numpy as np
 import re
@@ -30,7 +33,7 @@ PROJECT_ROOT = Path(__file__).parent.parent.parent
 
 # Configuration
 CHECK_INTERVAL_MINUTES = 10  # How often to check liquidations
-LIQUIDATION_ROWS = 10000   # Number of rows to fetch each time
+LIQUIDATION_SEED_BYTES = 8 * 1024 * 1024  # First sync reads this much of the end of the feed, later ones only new rows
 LIQUIDATION_THRESHOLD = .5  # Multiplier for average liquidation to detect significant events
 
 # Model override settings - Adding DeepSeek support
@@ -55,6 +58,14 @@ AI_MODEL = False  # Set to model name to override config.AI_MODEL
 AI_TEMPERATURE = 0  # Set > 0 to override config.AI_TEMPERATURE
 AI_MAX_TOKENS = 50  # Set > 0 to override config.AI_MAX_TOKENS
 
+# Liquidation history schema
+LIQUIDATION_HISTORY_SCHEMA = {
+    'timestamp': 'datetime64[ns]',
+    'long_size': 'float64',
+    'short_size': 'float64',
+    'total_size': 'float64',
+}
+
 # Voice settings
 VOICE_MODEL = "tts-1"
 VOICE_NAME = "nova"  # Options: alloy, echo, fable, onyx, nova, shimmer
@@ -71,7 +82,7 @@ Analyze market with total {pct_change}% increase in liquidations:
 
 Current Long Liquidations: ${current_longs:,.2f} ({pct_change_longs:+.1f}% change)
 Current Short Liquidations: ${current_shorts:,.2f} ({pct_change_shorts:+.1f}% change)
-Time Period: Last {LIQUIDATION_ROWS} liquidation events
+Time Period: Last {COMPARISON_WINDOW} minutes of liquidation events
 
 Market Data (Last {LOOKBACK_BARS} {TIMEFRAME} candles):
 {market_data}
@@ -131,91 +142,54 @@ class LiquidationAgent(BaseAgent):
         
         self.api = MoonDevAPI()
         
+        # Local liquidation event store - tails the API feed and keeps rolling window totals
+        self.events = LiquidationEventStore(self.api, windows_minutes=(15, 60, 240), seed_bytes=LIQUIDATION_SEED_BYTES)
+        
         # Create data directories if they don't exist
         self.audio_dir = PROJECT_ROOT / "src" / "audio"
         self.data_dir = PROJECT_ROOT / "src" / "data"
         self.audio_dir.mkdir(parents=True, exist_ok=True)
         self.data_dir.mkdir(parents=True, exist_ok=True)
         
-        # Initialize or load historical data
+        # Initialize or load historical data (liquidation_history.csv is imported once if present)
         self.history_file = self.data_dir / "liquidation_history.csv"
+        self.history_store = TimeSeriesStore('liquidation_history', LIQUIDATION_HISTORY_SCHEMA, legacy_csv=self.history_file)
         self.load_history()
         
         print("🌊 Luna the Liquidation Agent initialized!")
         print(f"🎯 Alerting on liquidation increases above +{LIQUIDATION_THRESHOLD*100:.0f}% from previous")
-        print(f"📊 Analyzing last {LIQUIDATION_ROWS} liquidation events")
+        print(f"📊 Comparing the last {COMPARISON_WINDOW} minutes of liquidations")
         print(f"📈 Using {LOOKBACK_BARS} {TIMEFRAME} candles for market context")
         
     def load_history(self):
-        """Load or initialize historical liquidation data"""
+        """Load the last 24h of liquidation history from the store"""
         try:
-            if self.history_file.exists():
-                self.liquidation_history = pd.read_csv(self.history_file)
-                
-                # Handle transition from old format to new format
-                if 'long_size' not in self.liquidation_history.columns:
-                    print("📝 Converting history to new format with long/short tracking...")
-                    # Assume 50/50 split for old records (we'll get accurate data on next update)
-                    self.liquidation_history['long_size'] = self.liquidation_history['total_size'] / 2
-                    self.liquidation_history['short_size'] = self.liquidation_history['total_size'] / 2
-                
-                print(f"📈 Loaded {len(self.liquidation_history)} historical liquidation records")
-            else:
-                self.liquidation_history = pd.DataFrame(columns=['timestamp', 'long_size', 'short_size', 'total_size'])
-                print("📝 Created new liquidation history file")
-                
-            # Clean up old data (keep only last 24 hours)
-            if not self.liquidation_history.empty:
-                cutoff_time = datetime.now() - timedelta(hours=24)
-                self.liquidation_history = self.liquidation_history[
-                    pd.to_datetime(self.liquidation_history['timestamp']) > cutoff_time
-                ]
-                self.liquidation_history.to_csv(self.history_file, index=False)
+            cutoff_time = datetime.now() - timedelta(hours=24)
+            
+            # Old partitions are dropped as whole files - no rewrite needed
+            self.history_store.drop_before(cutoff_time)
+            self.liquidation_history = self.history_store.read(start=cutoff_time)
+            print(f"📈 Loaded {len(self.liquidation_history)} historical liquidation records")
                 
         except Exception as e:
             print(f"❌ Error loading history: {str(e)}")
-            self.liquidation_history = pd.DataFrame(columns=['timestamp', 'long_size', 'short_size', 'total_size'])
+            self.liquidation_history = pd.DataFrame(columns=list(LIQUIDATION_HISTORY_SCHEMA))
             
     def _get_current_liquidations(self):
         """Get current liquidation data"""
         try:
             print("\n🔍 Fetching fresh liquidation data...")
-            df = self.api.get_liquidation_data(limit=LIQUIDATION_ROWS)
+            new_events = self.events.sync()
+            print(f"📥 {new_events} new liquidation events")
             
-            if df is not None and not df.empty:
-                # Set column names
-                df.columns = ['symbol', 'side', 'type', 'time_in_force', 
-                            'quantity', 'price', 'price2', 'status', 
-                            'filled_qty', 'total_qty', 'timestamp', 'usd_value']
-                
-                # Convert timestamp to datetime (UTC)
-                df['datetime'] = pd.to_datetime(df['timestamp'], unit='ms')
-                current_time = datetime.utcnow()
-                
-                # Calculate time windows
-                fifteen_min = current_time - timedelta(minutes=15)
-                one_hour = current_time - timedelta(hours=1)
-                four_hours = current_time - timedelta(hours=4)
-                
-                # Separate long and short liquidations
-                longs = df[df['side'] == 'SELL']  # SELL side = long liquidation
-                shorts = df[df['side'] == 'BUY']  # BUY side = short liquidation
-                
-                # Calculate totals for each time window and type
-                fifteen_min_longs = longs[longs['datetime'] >= fifteen_min]['usd_value'].sum()
-                fifteen_min_shorts = shorts[shorts['datetime'] >= fifteen_min]['usd_value'].sum()
-                one_hour_longs = longs[longs['datetime'] >= one_hour]['usd_value'].sum()
-                one_hour_shorts = shorts[shorts['datetime'] >= one_hour]['usd_value'].sum()
-                four_hour_longs = longs[longs['datetime'] >= four_hours]['usd_value'].sum()
-                four_hour_shorts = shorts[shorts['datetime'] >= four_hours]['usd_value'].sum()
-                
-                # Get event counts
-                fifteen_min_long_events = len(longs[longs['datetime'] >= fifteen_min])
-                fifteen_min_short_events = len(shorts[shorts['datetime'] >= fifteen_min])
-                one_hour_long_events = len(longs[longs['datetime'] >= one_hour])
-                one_hour_short_events = len(shorts[shorts['datetime'] >= one_hour])
-                four_hour_long_events = len(longs[longs['datetime'] >= four_hours])
-                four_hour_short_events = len(shorts[shorts['datetime'] >= four_hours])
+            if self.events.last_timestamp is not None:
+                # Rolling window totals are kept up to date as events arrive
+                fifteen_min_longs, fifteen_min_long_events = self.events.window(15, 'long')
+                fifteen_min_shorts, fifteen_min_short_events = self.events.window(15, 'short')
+                one_hour_longs, one_hour_long_events = self.events.window(60, 'long')
+                one_hour_shorts, one_hour_short_events = self.events.window(60, 'short')
+                four_hour_longs, four_hour_long_events = self.events.window(240, 'long')
+                four_hour_shorts, four_hour_short_events = self.events.window(240, 'short')
                 
                 # Calculate percentage change for active window
                 pct_change_longs = 0
@@ -310,7 +284,7 @@ class LiquidationAgent(BaseAgent):
                 pct_change=f"{total_pct_change:.2f}",
                 current_size=current_longs + current_shorts,
                 previous_size=previous_longs + previous_shorts,
-                LIQUIDATION_ROWS=LIQUIDATION_ROWS,
+                COMPARISON_WINDOW=COMPARISON_WINDOW,
                 current_longs=current_longs,
                 current_shorts=current_shorts,
                 pct_change_longs=pct_change_longs,
@@ -440,22 +414,8 @@ class LiquidationAgent(BaseAgent):
         try:
             print(f"\n📢 Announcing: {message}")
             
-            # Generate speech
-            response = openai.audio.speech.create(
-                model=VOICE_MODEL,
-                voice=VOICE_NAME,
-                input=message,
-                speed=VOICE_SPEED
-            )
-            
-            # Save audio file
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            audio_file = self.audio_dir / f"liquidation_alert_{timestamp}.mp3"
-            
-            response.stream_to_file(audio_file)
-            
-            # Play audio using system command
-            os.system(f"afplay {audio_file}")
+            # Queued on the shared announcer - synthesis and playback happen in the background
+            announcer.say(message, voice=VOICE_NAME, model=VOICE_MODEL, speed=VOICE_SPEED, key='liquidation')
             
         except Exception as e:
             print(f"❌ Error in announcement: {str(e)}")
@@ -484,8 +444,9 @@ class LiquidationAgent(BaseAgent):
                     pd.to_datetime(self.liquidation_history['timestamp']) > cutoff_time
                 ]
                 
-                # Save to file
-                self.liquidation_history.to_csv(self.history_file, index=False)
+                # Append just the new row to the store
+                self.history_store.append(new_row)
+                self.history_store.drop_before(cutoff_time)
                 
         except Exception as e:
             print(f"❌ Error saving to history: {str(e)}")
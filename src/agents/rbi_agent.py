@@ -224,6 +224,7 @@ import threading
 import itertools
 import sys
 from src.config import *  # Import config settings including AI_MODEL
+from src.models.response_cache import anthropic_system
 
 # DeepSeek Configuration
 DEEPSEEK_BASE_URL = "https://api.deepseek.com"
@@ -331,7 +332,7 @@ def chat_with_deepseek(system_prompt, user_content, model):
                     model=active_model,
                     max_tokens=AI_MAX_TOKENS,
                     temperature=AI_TEMPERATURE,
-                    system=system_prompt,
+                    system=anthropic_system(system_prompt),  # Static agent prompts get provider-side caching
                     messages=[
                         {"role": "user", "content": user_content}
                     ]
@@ -55,6 +55,7 @@ from datetime import datetime, timedelta
 import time
 from src.config import *
 from src.agents.base_agent import BaseAgent
+from src.data.storage import TimeSeriesStore
 import traceback
 
 # Load environment variables
@@ -108,6 +109,13 @@ class RiskAgent(BaseAgent):
         self.override_active = False
         self.last_override_check = None
         
+        # Portfolio balance log (portfolio_balance.csv is imported once if present)
+        self.balance_store = TimeSeriesStore(
+            'portfolio_balance',
+            {'timestamp': 'datetime64[ns]', 'balance': 'float64'},
+            legacy_csv=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'portfolio_balance.csv')
+        )
+        
         # Initialize start balance using portfolio value
         self.start_balance = self.get_portfolio_value()
         print(f"🏦 Initial Portfolio Balance: ${self.start_balance:.2f}")
@@ -139,20 +147,23 @@ class RiskAgent(BaseAgent):
             print(f"🎯 Total tokens to check: {len(config.MONITORED_TOKENS)}")
             print(f"📝 Token list: {config.MONITORED_TOKENS}")
             
-            for token in config.MONITORED_TOKENS:
-                if token != config.USDC_ADDRESS:  # Skip USDC as we already counted it
-                    try:
-                        print(f"\n🪙 Checking token: {token[:8]}...")
-                        token_value = n.get_token_balance_usd(token)
-                        if token_value > 0:
-                            print(f"💰 Found position worth: ${token_value:.2f}")
-                            total_value += token_value
-                        else:
-                            print("ℹ️ No balance found for this token")
-                    except Exception as e:
-                        print(f"❌ Error getting balance for {token[:8]}: {str(e)}")
-                        print("🔍 Full error trace:")
-                        traceback.print_exc()
+            # Skip USDC as we already counted it - every other token is priced in one batched call
+            tokens = [token for token in config.MONITORED_TOKENS if token != config.USDC_ADDRESS]
+            try:
+                token_values = n.get_token_balances_usd(tokens)
+            except Exception as e:
+                print(f"❌ Error getting token balances: {str(e)}")
+                print("🔍 Full error trace:")
+                traceback.print_exc()
+                token_values = {}
+            
+            for token, token_value in token_values.items():
+                print(f"\n🪙 Checking token: {token[:8]}...")
+                if token_value > 0:
+                    print(f"💰 Found position worth: ${token_value:.2f}")
+                    total_value += token_value
+                else:
+                    print("ℹ️ No balance found for this token")
             
             print(f"\n💎 Moon Dev's Total Portfolio Value: ${total_value:.2f} 🌙")
             return total_value
@@ -168,29 +179,16 @@ class RiskAgent(BaseAgent):
         try:
             print("\n📝 Checking if we need to log daily balance...")
             
-            # Create data directory if it doesn't exist
-            os.makedirs('src/data', exist_ok=True)
-            balance_file = 'src/data/portfolio_balance.csv'
-            print(f"📁 Using balance file: {balance_file}")
-            
-            # Check if we already have a recent log
-            if os.path.exists(balance_file):
-                print("✅ Found existing balance log file")
-                df = pd.read_csv(balance_file)
-                if not df.empty:
-                    df['timestamp'] = pd.to_datetime(df['timestamp'])
-                    last_log = df['timestamp'].max()
-                    hours_since_log = (datetime.now() - last_log).total_seconds() / 3600
-                    
-                    print(f"⏰ Hours since last log: {hours_since_log:.1f}")
-                    print(f"⚙️ Max hours between checks: {config.MAX_LOSS_GAIN_CHECK_HOURS}")
-                    
-                    if hours_since_log < config.MAX_LOSS_GAIN_CHECK_HOURS:
-                        cprint(f"✨ Recent balance log found ({hours_since_log:.1f} hours ago)", "white", "on_blue")
-                        return
-            else:
-                print("📊 Creating new balance log file")
-                df = pd.DataFrame(columns=['timestamp', 'balance'])
+            # Only the partitions inside the check window are read
+            check_start = datetime.now() - timedelta(hours=config.MAX_LOSS_GAIN_CHECK_HOURS)
+            recent = self.balance_store.read(start=check_start)
+            print(f"⚙️ Max hours between checks: {config.MAX_LOSS_GAIN_CHECK_HOURS}")
+            
+            if not recent.empty:
+                last_log = recent['timestamp'].max()
+                hours_since_log = (datetime.now() - last_log).total_seconds() / 3600
+                cprint(f"✨ Recent balance log found ({hours_since_log:.1f} hours ago)", "white", "on_blue")
+                return
             
             # Get current portfolio value
             print("\n💰 Getting fresh portfolio value...")
@@ -198,15 +196,13 @@ class RiskAgent(BaseAgent):
             
             # Add new row
             new_row = {
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'timestamp': datetime.now(),
                 'balance': current_value
             }
             print(f"📝 Adding new balance record: {new_row}")
             
-            df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
-            
-            # Save updated log
-            df.to_csv(balance_file, index=False)
+            # Append just the new row
+            self.balance_store.append(pd.DataFrame([new_row]))
             cprint(f"💾 New portfolio balance logged: ${current_value:.2f}", "white", "on_green")
             
         except Exception as e:
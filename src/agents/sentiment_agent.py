@@ -16,11 +16,18 @@ TOKENS_TO_TRACK = ["solana", "bitcoin", "ethereum"]  # Add tokens you want to tr
 TWEETS_PER_RUN = 30  # Number of tweets to collect per run
 DATA_FOLDER = "src/data/sentiment"  # Where to store sentiment data
 SENTIMENT_HISTORY_FILE = "src/data/sentiment_history.csv"  # Store sentiment scores over time
+SENTIMENT_HISTORY_SCHEMA = {
+    'timestamp': 'datetime64[ns]',
+    'sentiment_score': 'float64',
+    'num_tweets': 'int64',
+}
 IGNORE_LIST = ['t.co', 'discord', 'join', 'telegram', 'discount', 'pay']
 CHECK_INTERVAL_MINUTES = 15  # How often to run sentiment analysis
 
 # Sentiment settings
 SENTIMENT_ANNOUNCE_THRESHOLD = 0.4  # Announce vocally if abs(sentiment) > this value (-1 to 1 scale)
+SENTIMENT_BACKEND = "torch"  # torch, int8 (quantized, faster on CPU) or onnx (needs optimum[onnxruntime])
+SENTIMENT_THREADS = None     # Torch intra-op threads, None = cores available to this process
 
 # Voice settings (copied from whale agent)
 VOICE_MODEL = "tts-1"  # or tts-1-hd for higher quality
@@ -39,11 +46,14 @@ from random import randint
 import pathlib
 import asyncio
 import pandas as pd
-import torch
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
 import numpy as np
+from collections import deque
 import openai
 from pathlib import Path
+from src.data.storage import TimeSeriesStore
+from src.data.sentiment_scorer import SentimentScorer
+from src.data.tweet_store import TweetStore
+from src.announcer import announcer
 
 # Create data directory if it doesn't exist
 pathlib.Path(DATA_FOLDER).mkdir(parents=True, exist_ok=True)
@@ -98,54 +108,34 @@ class SentimentAgent:
     def __init__(self):
         """Initialize the Sentiment Agent"""
         self.client = None
-        self.tokenizer = None
-        self.model = None
         self.audio_dir = Path("src/audio")
         self.audio_dir.mkdir(parents=True, exist_ok=True)
         
-        # Initialize sentiment history file
-        if not os.path.exists(SENTIMENT_HISTORY_FILE):
-            pd.DataFrame(columns=['timestamp', 'sentiment_score', 'num_tweets']).to_csv(SENTIMENT_HISTORY_FILE, index=False)
+        # Sentiment history store (the old sentiment_history.csv is imported once if present)
+        self.history_store = TimeSeriesStore('sentiment_history', SENTIMENT_HISTORY_SCHEMA, legacy_csv=SENTIMENT_HISTORY_FILE)
+        self.recent_scores = self._load_recent_scores()
         
-        # Load the sentiment model at initialization
-        cprint("🤖 Loading sentiment model...", "cyan")
-        self.init_sentiment_model()
+        # Tweets by token in SQLite (each old {token}_tweets.csv is imported once)
+        self.tweet_store = TweetStore(legacy_folder=DATA_FOLDER)
+        
+        # Sentiment model + per-tweet score cache (the model loads on the first new tweets)
+        self.scorer = SentimentScorer(backend=SENTIMENT_BACKEND, num_threads=SENTIMENT_THREADS)
             
         cprint("🌙 Moon Dev's Sentiment Agent initialized!", "green")
         
     def init_sentiment_model(self):
         """Initialize the BERT model for sentiment analysis"""
-        if self.model is None:
-            self.tokenizer = AutoTokenizer.from_pretrained("finiteautomata/bertweet-base-sentiment-analysis")
-            self.model = AutoModelForSequenceClassification.from_pretrained("finiteautomata/bertweet-base-sentiment-analysis")
-            cprint("✨ Sentiment model loaded!", "green")
-
-    def analyze_sentiment(self, texts):
-        """Analyze sentiment of a batch of texts"""
-        self.init_sentiment_model()
-        
-        sentiments = []
-        batch_size = 8  # Process in small batches to avoid memory issues
-        
-        for i in range(0, len(texts), batch_size):
-            batch_texts = texts[i:i + batch_size]
-            inputs = self.tokenizer(batch_texts, padding=True, truncation=True, max_length=128, return_tensors="pt")
-            
-            with torch.no_grad():
-                outputs = self.model(**inputs)
-                predictions = torch.nn.functional.softmax(outputs.logits, dim=-1)
-                sentiments.extend(predictions.tolist())
-        
-        # Convert to sentiment scores (-1 to 1)
-        scores = []
-        for sentiment in sentiments:
-            # NEG, NEU, POS
-            neg, neu, pos = sentiment
-            # Convert to -1 to 1 scale
-            score = pos - neg  # Will be between -1 and 1
-            scores.append(score)
-            
-        return np.mean(scores)
+        self.scorer.load()
+
+    def analyze_sentiment(self, texts, tweet_ids=None):
+        """Average sentiment (-1 to 1) of a batch of texts - tweets scored on an earlier run come from the cache"""
+        if not texts:
+            return 0.0
+        if tweet_ids is None:
+            scores = self.scorer.score_texts(texts)
+        else:
+            scores = self.scorer.score(tweet_ids, texts)
+        return float(np.mean(scores))
 
     def _announce(self, message, is_important=False):
         """Announce a message using text-to-speech"""
@@ -156,64 +146,37 @@ class SentimentAgent:
             if not is_important:
                 return
                 
-            # Generate unique filename based on timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            speech_file = self.audio_dir / f"sentiment_audio_{timestamp}.mp3"
-            
-            # Generate speech using OpenAI
-            response = openai.audio.speech.create(
-                model=VOICE_MODEL,
-                voice=VOICE_NAME,
-                speed=VOICE_SPEED,
-                input=message
-            )
-            
-            # Save and play the audio
-            with open(speech_file, 'wb') as f:
-                for chunk in response.iter_bytes():
-                    f.write(chunk)
-            
-            # Play the audio
-            if os.name == 'posix':  # macOS/Linux
-                os.system(f"afplay {speech_file}")
-            else:  # Windows
-                os.system(f"start {speech_file}")
-                time.sleep(5)
-            
-            # Clean up
-            try:
-                speech_file.unlink()
-            except Exception as e:
-                print(f"⚠️ Couldn't delete audio file: {e}")
-                
+            # Queued on the shared announcer - synthesis and playback happen in the background
+            announcer.say(message, voice=VOICE_NAME, model=VOICE_MODEL, speed=VOICE_SPEED, key='sentiment')
+
         except Exception as e:
             print(f"❌ Error in text-to-speech: {str(e)}")
 
+    def _load_recent_scores(self):
+        """Last two saved scores from the store - read once at startup, then kept in memory"""
+        recent = deque(maxlen=2)
+        try:
+            history_df = self.history_store.read(start=datetime.now() - timedelta(hours=24))
+            for row in history_df.tail(2).itertuples(index=False):
+                recent.append((row.timestamp, float(row.sentiment_score)))
+        except Exception as e:
+            cprint(f"⚠️ Couldn't load sentiment history: {str(e)}", "yellow")
+        return recent
+
     def save_sentiment_score(self, sentiment_score, num_tweets):
         """Save sentiment score to history"""
         try:
+            now = datetime.now()
             new_data = pd.DataFrame([{
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': now,
                 'sentiment_score': sentiment_score,
                 'num_tweets': num_tweets
             }])
             
-            # Load existing data
-            if os.path.exists(SENTIMENT_HISTORY_FILE):
-                history_df = pd.read_csv(SENTIMENT_HISTORY_FILE)
-                # Convert timestamps to datetime for comparison
-                history_df['timestamp'] = pd.to_datetime(history_df['timestamp'])
-                # Keep only last 24 hours of data
-                cutoff_time = datetime.now() - timedelta(hours=24)
-                history_df = history_df[history_df['timestamp'] > cutoff_time]
-                # Convert back to ISO format for consistent storage
-                history_df['timestamp'] = history_df['timestamp'].dt.isoformat()
-                # Append new data
-                history_df = pd.concat([history_df, new_data], ignore_index=True)
-            else:
-                history_df = new_data
-                
-            history_df.to_csv(SENTIMENT_HISTORY_FILE, index=False)
+            # Append just the new score and drop partitions older than 24 hours
+            self.history_store.append(new_data)
+            self.history_store.drop_before(now - timedelta(hours=24))
+            self.recent_scores.append((pd.Timestamp(now), float(sentiment_score)))
             
         except Exception as e:
             cprint(f"❌ Error saving sentiment history: {str(e)}", "red")
@@ -221,22 +184,14 @@ class SentimentAgent:
     def get_sentiment_change(self):
         """Calculate sentiment change from last run"""
         try:
-            if not os.path.exists(SENTIMENT_HISTORY_FILE):
+            # The last two scores are kept in memory - the history isn't re-read on every run
+            if len(self.recent_scores) < 2:
                 return None, None
-                
-            history_df = pd.read_csv(SENTIMENT_HISTORY_FILE)
-            if len(history_df) < 2:
-                return None, None
-                
-            # Convert timestamps using ISO format
-            history_df['timestamp'] = pd.to_datetime(history_df['timestamp'], format='ISO8601')
-            history_df = history_df.sort_values('timestamp')
             
-            current_score = float(history_df.iloc[-1]['sentiment_score'])
-            previous_score = float(history_df.iloc[-2]['sentiment_score'])
+            (previous_time, previous_score), (current_time, current_score) = self.recent_scores
             
             # Calculate time difference in minutes
-            time_diff = (history_df.iloc[-1]['timestamp'] - history_df.iloc[-2]['timestamp']).total_seconds() / 60
+            time_diff = (current_time - previous_time).total_seconds() / 60
             
             # Calculate percentage change relative to the scale (-1 to 1)
             # Convert to 0-100 scale for easier understanding
@@ -255,11 +210,15 @@ class SentimentAgent:
         if not tweets:
             return
             
-        # Extract text from tweets
-        texts = [tweet.text for tweet in tweets]
+        # Extract text from tweets (the same tweet can turn up under several tokens)
+        unique = {str(tweet.id): tweet.text for tweet in tweets}
+        texts = list(unique.values())
         
-        # Get sentiment score
-        sentiment_score = self.analyze_sentiment(texts)
+        # Get sentiment score - only tweets we haven't seen before go through the model
+        scored_before = self.scorer.scored
+        sentiment_score = self.analyze_sentiment(texts, tweet_ids=list(unique.keys()))
+        new_count = self.scorer.scored - scored_before
+        cprint(f"🧠 Scored {new_count} new tweets, {len(texts) - new_count} from cache", "cyan")
         
         # Save score to history
         self.save_sentiment_score(sentiment_score, len(texts))
@@ -402,9 +361,7 @@ class SentimentAgent:
         return collected_tweets
 
     def save_tweets(self, tweets, token):
-        """Save tweets to CSV file using pandas, appending new ones and avoiding duplicates"""
-        filename = f"{DATA_FOLDER}/{token}_tweets.csv"
-        
+        """Append new tweets to the tweet store (already stored tweet_ids are skipped)"""
         # Prepare new tweets data
         new_tweets_data = []
         for tweet in tweets:
@@ -434,29 +391,14 @@ class SentimentAgent:
             cprint("ℹ️ No new tweets to save", "yellow")
             return
             
-        # Convert to DataFrame
-        new_df = pd.DataFrame(new_tweets_data)
-        
         try:
-            # Load existing data if file exists
-            if os.path.exists(filename):
-                existing_df = pd.read_csv(filename)
-                # Remove duplicates based on tweet_id
-                new_df = new_df[~new_df['tweet_id'].isin(existing_df['tweet_id'])]
-                # Append new data
-                if not new_df.empty:
-                    pd.concat([existing_df, new_df], ignore_index=True).to_csv(filename, index=False)
-            else:
-                # Save new file
-                new_df.to_csv(filename, index=False)
-            
-            cprint(f"📝 Added {len(new_df)} new tweets to {token}_tweets.csv", "green")
-            if os.path.exists(filename):
-                total_tweets = len(pd.read_csv(filename))
-                cprint(f"📊 Total tweets in database: {total_tweets}", "green")
+            # Duplicates are skipped by the store's (token, tweet_id) index - nothing is re-read
+            added = self.tweet_store.add(token, new_tweets_data)
+            cprint(f"📝 Added {added} new {token} tweets to the tweet store", "green")
+            cprint(f"📊 Total tweets in database: {self.tweet_store.count(token)}", "green")
                 
         except Exception as e:
-            cprint(f"❌ Error saving to CSV: {str(e)}", "red")
+            cprint(f"❌ Error saving tweets: {str(e)}", "red")
 
     async def run_async(self):
         """Async function to run sentiment analysis"""
@@ -12,6 +12,10 @@ import importlib
 import inspect
 import time
 from src import nice_funcs as n
+from src.data.market_encoder import encode_market_data
+
+# Token budget for the encoded market context in each evaluation prompt
+STRATEGY_PROMPT_TOKEN_BUDGET = 1000
 
 # 🎯 Strategy Evaluation Prompt
 STRATEGY_EVAL_PROMPT = """
@@ -92,7 +96,7 @@ class StrategyAgent:
                     "role": "user",
                     "content": STRATEGY_EVAL_PROMPT.format(
                         strategy_signals=signals_str,
-                        market_data=market_data
+                        market_data=encode_market_data(market_data, max_tokens=STRATEGY_PROMPT_TOKEN_BUDGET)
                     )
                 }]
             )
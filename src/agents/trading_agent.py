@@ -66,23 +66,42 @@ from termcolor import colored, cprint
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Local imports
 from src.config import *
 from src import nice_funcs as n
-from src.data.ohlcv_collector import collect_all_tokens
+from src.data.ohlcv_collector import collect_token_data
+from src import rate_limiter
+from src.data.market_encoder import encode_market_data
+from src.models.response_cache import response_cache, make_key
 
 # Load environment variables
 load_dotenv()
 
+# Token budget for the encoded market data in each analysis prompt
+TRADING_PROMPT_TOKEN_BUDGET = 1500
+
+# Identical analysis prompts within one cycle are answered from the response cache (config.TRADING_RESPONSE_CACHE)
+TRADING_CACHE_TTL = SLEEP_BETWEEN_RUNS_MINUTES * 60
+
 class TradingAgent:
     def __init__(self):
         self.client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_KEY"))
         self.recommendations_df = pd.DataFrame(columns=['token', 'action', 'confidence', 'reasoning'])
         print("🤖 Moon Dev's LLM Trading Agent initialized!")
 
-    def analyze_market_data(self, token, market_data):
+    def analyze_market_data(self, token, market_data, strategy_signals=None):
         """Analyze market data using Claude"""
+        result = self._analyze_token(token, market_data, strategy_signals)
+        if result is None:
+            return None
+        row, response = result
+        self.recommendations_df = pd.concat([self.recommendations_df, pd.DataFrame([row])], ignore_index=True)
+        return response
+
+    def _analyze_token(self, token, market_data, strategy_signals=None):
+        """Ask Claude about one token -> (recommendation row, response), or None if skipped"""
         try:
             # Skip analysis for excluded tokens
             if token in EXCLUDED_TOKENS:
@@ -91,34 +110,49 @@ class TradingAgent:
             
             # Prepare strategy context
             strategy_context = ""
-            if 'strategy_signals' in market_data:
+            if strategy_signals:
                 strategy_context = f"""
 Strategy Signals Available:
-{json.dumps(market_data['strategy_signals'], indent=2)}
+{json.dumps(strategy_signals, indent=2)}
                 """
             else:
                 strategy_context = "No strategy signals available."
             
-            message = self.client.messages.create(
-                model=AI_MODEL,
-                max_tokens=AI_MAX_TOKENS,
-                temperature=AI_TEMPERATURE,
-                messages=[
-                    {
-                        "role": "user", 
-                        "content": f"{TRADING_PROMPT.format(strategy_context=strategy_context)}\n\nMarket Data to Analyze:\n{market_data}"
-                    }
-                ]
-            )
+            # Compact, token-budgeted encoding instead of the DataFrame repr
+            encoded_data = encode_market_data(market_data, max_tokens=TRADING_PROMPT_TOKEN_BUDGET)
             
-            # Parse the response - handle both string and list responses
-            response = message.content
-            if isinstance(response, list):
-                # Extract text from TextBlock objects if present
-                response = '\n'.join([
-                    item.text if hasattr(item, 'text') else str(item)
-                    for item in response
-                ])
+            content = f"{TRADING_PROMPT.format(strategy_context=strategy_context)}\n\nMarket Data to Analyze:\n{encoded_data}"
+            
+            # Same prompt within one cycle window -> reuse the earlier answer
+            cache_key = make_key(AI_MODEL, None, content, AI_TEMPERATURE, AI_MAX_TOKENS)
+            cached = response_cache.get(cache_key) if TRADING_RESPONSE_CACHE else None
+            if cached is not None:
+                print(f"⚡ Reusing cached AI analysis for {token[:4]}")
+                response = cached.content
+            else:
+                with rate_limiter.limit('anthropic'):
+                    message = self.client.messages.create(
+                        model=AI_MODEL,
+                        max_tokens=AI_MAX_TOKENS,
+                        temperature=AI_TEMPERATURE,
+                        messages=[
+                            {
+                                "role": "user", 
+                                "content": content
+                            }
+                        ]
+                    )
+                
+                # Parse the response - handle both string and list responses
+                response = message.content
+                if isinstance(response, list):
+                    # Extract text from TextBlock objects if present
+                    response = '\n'.join([
+                        item.text if hasattr(item, 'text') else str(item)
+                        for item in response
+                    ])
+                if TRADING_RESPONSE_CACHE:
+                    response_cache.put(cache_key, response, AI_MODEL, ttl=TRADING_CACHE_TTL)
             
             lines = response.split('\n')
             action = lines[0].strip() if lines else "NOTHING"
@@ -133,34 +167,69 @@ Strategy Signals Available:
                     except:
                         confidence = 50  # Default if not found
             
-            # Add to recommendations DataFrame with proper reasoning
+            # Recommendation row with proper reasoning
             reasoning = '\n'.join(lines[1:]) if len(lines) > 1 else "No detailed reasoning provided"
-            self.recommendations_df = pd.concat([
-                self.recommendations_df,
-                pd.DataFrame([{
-                    'token': token,
-                    'action': action,
-                    'confidence': confidence,
-                    'reasoning': reasoning
-                }])
-            ], ignore_index=True)
+            row = {
+                'token': token,
+                'action': action,
+                'confidence': confidence,
+                'reasoning': reasoning
+            }
             
             print(f"🎯 Moon Dev's AI Analysis Complete for {token[:4]}!")
-            return response
+            return row, response
             
         except Exception as e:
             print(f"❌ Error in AI analysis: {str(e)}")
-            # Still add to DataFrame even on error, but mark as NOTHING with 0 confidence
-            self.recommendations_df = pd.concat([
-                self.recommendations_df,
-                pd.DataFrame([{
-                    'token': token,
-                    'action': "NOTHING",
-                    'confidence': 0,
-                    'reasoning': f"Error during analysis: {str(e)}"
-                }])
-            ], ignore_index=True)
+            # Still return a row on error, but mark as NOTHING with 0 confidence
+            row = {
+                'token': token,
+                'action': "NOTHING",
+                'confidence': 0,
+                'reasoning': f"Error during analysis: {str(e)}"
+            }
+            return row, None
+
+    def _fetch_and_analyze(self, token, strategy_signals=None):
+        """Pipeline step for one token: fetch its candles, then analyze them"""
+        with rate_limiter.limit('birdeye'):
+            data = collect_token_data(token)
+        if data is None:
             return None
+        
+        # Include strategy signals in analysis if available
+        token_signals = None
+        if strategy_signals and token in strategy_signals:
+            cprint(f"📊 Including {len(strategy_signals[token])} strategy signals in analysis for {token[:4]}", "cyan")
+            token_signals = strategy_signals[token]
+        
+        return self._analyze_token(token, data, token_signals)
+
+    def analyze_all_tokens(self, strategy_signals=None):
+        """
+        Fetch and analyze every monitored token through a bounded thread pool.
+        
+        One token's data fetch overlaps another's Claude call; both are capped by
+        the per-provider rate limits. Results are merged into recommendations_df
+        in MONITORED_TOKENS order no matter which finishes first.
+        """
+        tokens = [token for token in MONITORED_TOKENS if token not in EXCLUDED_TOKENS]
+        with ThreadPoolExecutor(max_workers=TRADING_ANALYSIS_WORKERS) as executor:
+            futures = [executor.submit(self._fetch_and_analyze, token, strategy_signals) for token in tokens]
+            results = [future.result() for future in futures]
+        
+        rows = []
+        for token, result in zip(tokens, results):
+            if result is None:
+                continue
+            row, analysis = result
+            rows.append(row)
+            cprint(f"\n🤖 AI Agent Analysis for Token: {token}", "white", "on_green")
+            print(analysis)
+            print("\n" + "="*50 + "\n")
+        
+        if rows:
+            self.recommendations_df = pd.concat([self.recommendations_df, pd.DataFrame(rows)], ignore_index=True)
     
     def allocate_portfolio(self):
         """Get AI-recommended portfolio allocation"""
@@ -385,23 +454,9 @@ Example format:
             current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             cprint(f"\n⏰ AI Agent Run Starting at {current_time}", "white", "on_green")
             
-            # Collect OHLCV data for all tokens
-            cprint("📊 Collecting market data...", "white", "on_blue")
-            market_data = collect_all_tokens()
-            
-            # Analyze each token's data
-            for token, data in market_data.items():
-                cprint(f"\n🤖 AI Agent Analyzing Token: {token}", "white", "on_green")
-                
-                # Include strategy signals in analysis if available
-                if strategy_signals and token in strategy_signals:
-                    cprint(f"📊 Including {len(strategy_signals[token])} strategy signals in analysis", "cyan")
-                    data['strategy_signals'] = strategy_signals[token]
-                
-                analysis = self.analyze_market_data(token, data)
-                print(f"\n📈 Analysis for contract: {token}")
-                print(analysis)
-                print("\n" + "="*50 + "\n")
+            # Collect OHLCV data and analyze all tokens in parallel
+            cprint("📊 Collecting and analyzing market data...", "white", "on_blue")
+            self.analyze_all_tokens(strategy_signals)
             
             # Show recommendations summary
             cprint("\n📊 Moon Dev's Trading Recommendations:", "white", "on_blue")
@@ -425,16 +480,6 @@ Example format:
             else:
                 cprint("\n⚠️ No allocations to execute!", "white", "on_yellow")
             
-            # Clean up temp data
-            cprint("\n🧹 Cleaning up temporary data...", "white", "on_blue")
-            try:
-                for file in os.listdir('temp_data'):
-                    if file.endswith('_latest.csv'):
-                        os.remove(os.path.join('temp_data', file))
-                cprint("✨ Temp data cleaned successfully!", "white", "on_green")
-            except Exception as e:
-                cprint(f"⚠️ Error cleaning temp data: {str(e)}", "white", "on_yellow")
-            
         except Exception as e:
             cprint(f"\n❌ Error in trading cycle: {str(e)}", "white", "on_red")
             cprint("🔧 Moon Dev suggests checking the logs and trying again!", "white", "on_blue")
@@ -27,6 +27,9 @@ from src import nice_funcs_hl as hl  # Add import for hyperliquid functions
 from src.agents.api import MoonDevAPI
 from collections import deque
 from src.agents.base_agent import BaseAgent
+from src.data.storage import TimeSeriesStore
+from src.data.ring_buffer import TimeRingBuffer
+from src.announcer import announcer
 import traceback
 import numpy as np
 import anthropic
@@ -51,6 +54,22 @@ AI_MODEL = False  # Set to model name to override config.AI_MODEL
 AI_TEMPERATURE = 0  # Set > 0 to override config.AI_TEMPERATURE
 AI_MAX_TOKENS = 50  # Set > 0 to override config.AI_MAX_TOKENS
 
+# OI history settings
+OI_HISTORY_HOURS = 24
+OI_HISTORY_CAPACITY = 2880  # In-memory rows - 24h even at 30 second checks
+OI_HISTORY_PRINT_ROWS = 5  # Rows shown when calculating changes
+
+# OI history schema
+OI_HISTORY_SCHEMA = {
+    'timestamp': 'datetime64[ns]',
+    'btc_oi': 'float64',
+    'eth_oi': 'float64',
+    'total_oi': 'float64',
+    'btc_change_pct': 'float64',
+    'eth_change_pct': 'float64',
+    'total_change_pct': 'float64',
+}
+
 # Voice settings
 VOICE_MODEL = "tts-1"  # or tts-1-hd for higher quality
 VOICE_NAME = "shimmer"   # Options: alloy, echo, fable, onyx, nova, shimmer
@@ -132,57 +151,31 @@ class WhaleAgent(BaseAgent):
         self.audio_dir.mkdir(parents=True, exist_ok=True)
         self.data_dir.mkdir(parents=True, exist_ok=True)
         
-        # Initialize or load historical data
+        # Initialize or load historical data (oi_history.csv is imported once if present)
         self.history_file = self.data_dir / "oi_history.csv"
+        self.history_store = TimeSeriesStore('oi_history', OI_HISTORY_SCHEMA, legacy_csv=self.history_file)
         self.load_history()
         
         print("🐋 Dez the Whale Agent initialized!")
         
     def load_history(self):
-        """Load or initialize historical OI data with change tracking"""
+        """Load the last 24h of OI history from the store into the ring buffer"""
+        self.oi_history = TimeRingBuffer(OI_HISTORY_CAPACITY, [c for c in OI_HISTORY_SCHEMA if c != 'timestamp'])
         try:
             print("🔄 Starting history load...")
-            if self.history_file.exists():
-                print("📂 Found existing history file")
-                df = pd.read_csv(self.history_file)
-                
-                # Check if we have the new column format
-                required_columns = ['timestamp', 'btc_oi', 'eth_oi', 'total_oi', 'btc_change_pct', 'eth_change_pct', 'total_change_pct']
-                if all(col in df.columns for col in required_columns):
-                    print("✅ Column format is correct")
-                    self.oi_history = df
-                    self.oi_history['timestamp'] = pd.to_datetime(self.oi_history['timestamp'])
-                    print(f"📈 Loaded {len(self.oi_history)} historical OI records")
-                else:
-                    print("🔄 Detected old format, creating new history file")
-                    print(f"Current columns: {df.columns.tolist()}")
-                    self.oi_history = pd.DataFrame(columns=required_columns)
-                    if self.history_file.exists():
-                        print("🗑️ Removing old history file")
-                        self.history_file.unlink()
-            else:
-                print("📝 No history file found, creating new one")
-                self.oi_history = pd.DataFrame(columns=['timestamp', 'btc_oi', 'eth_oi', 'total_oi', 
-                                                      'btc_change_pct', 'eth_change_pct', 'total_change_pct'])
-                
-            # Clean up old data (keep only last 24 hours)
-            if not self.oi_history.empty:
-                print(f"🧹 Cleaning old data. Current size: {len(self.oi_history)}")
-                cutoff_time = datetime.now() - timedelta(hours=24)
-                self.oi_history = self.oi_history[self.oi_history['timestamp'] > cutoff_time]
-                print(f"✨ New size after cleanup: {len(self.oi_history)}")
-                print("💾 Saving cleaned history to file...")
-                self.oi_history.to_csv(self.history_file, index=False)
-                print("✅ History save complete")
-                
+            cutoff_time = datetime.now() - timedelta(hours=OI_HISTORY_HOURS)
+            
+            # Old partitions are dropped as whole files, the rest of the append log is merged once per start
+            self.history_store.drop_before(cutoff_time)
+            self.history_store.compact()
+            self.oi_history.extend(self.history_store.read(start=cutoff_time))
+            print(f"📈 Loaded {len(self.oi_history)} historical OI records")
             print("🎉 History load complete!")
             
         except Exception as e:
             print(f"❌ Error loading history: {str(e)}")
             print(f"📋 Stack trace: {traceback.format_exc()}")
-            self.oi_history = pd.DataFrame(columns=['timestamp', 'btc_oi', 'eth_oi', 'total_oi', 
-                                                  'btc_change_pct', 'eth_change_pct', 'total_change_pct'])
-            print("⚠️ Created empty history due to error")
+            print("⚠️ Starting with empty history due to error")
             
     def _save_oi_data(self, timestamp, btc_oi, eth_oi, total_oi):
         """Save new OI data point with change percentages"""
@@ -198,7 +191,7 @@ class WhaleAgent(BaseAgent):
             btc_change_pct = eth_change_pct = total_change_pct = 0.0
             
             if not self.oi_history.empty:
-                prev_data = self.oi_history.iloc[-1]
+                prev_data = self.oi_history.latest()
                 print("\n📊 Previous vs Current OI:")
                 print(f"Previous BTC OI: ${prev_data['btc_oi']:,.2f}")
                 print(f"Current BTC OI: ${btc_oi:,.2f}")
@@ -216,31 +209,31 @@ class WhaleAgent(BaseAgent):
             
             # Add new data point
             print("\n📝 Creating new data row...")
-            new_row = pd.DataFrame([{
-                'timestamp': timestamp,
+            row = {
                 'btc_oi': float(btc_oi),
                 'eth_oi': float(eth_oi),
                 'total_oi': float(total_oi),
                 'btc_change_pct': btc_change_pct,
                 'eth_change_pct': eth_change_pct,
                 'total_change_pct': total_change_pct
-            }])
+            }
             
             print("\n📊 Adding new data point to history...")
-            print(f"History size before: {len(self.oi_history)}")
-            self.oi_history = pd.concat([self.oi_history, new_row], ignore_index=True)
-            print(f"History size after: {len(self.oi_history)}")
+            if not self.oi_history.append(timestamp, **row):
+                print("⚠️ Data point is older than the latest one in history, skipping")
+                return
             
-            # Clean up old data
+            # Clean up old data (moves the ring buffer's start pointer, no copying)
             print("\n🧹 Cleaning up old data...")
-            cutoff_time = datetime.now() - timedelta(hours=24)
+            cutoff_time = datetime.now() - timedelta(hours=OI_HISTORY_HOURS)
             old_size = len(self.oi_history)
-            self.oi_history = self.oi_history[self.oi_history['timestamp'] > cutoff_time]
-            print(f"Removed {old_size - len(self.oi_history)} old records")
+            self.oi_history.drop_before(cutoff_time)
+            print(f"History size: {len(self.oi_history)} (removed {old_size - len(self.oi_history)} old records)")
+            self.history_store.drop_before(cutoff_time)
             
-            # Save to file
-            print("\n💾 Saving to history file...")
-            self.oi_history.to_csv(self.history_file, index=False)
+            # Append just the new row to the store
+            print("\n💾 Appending to history store...")
+            self.history_store.append(pd.DataFrame([{'timestamp': timestamp, **row}]))
             print("✅ Save complete!")
             
         except Exception as e:
@@ -259,7 +252,7 @@ class WhaleAgent(BaseAgent):
         """Get current open interest data from API"""
         try:
             print("\n🔍 Fetching fresh OI data from API...")
-            df = self.api.get_oi_data()  # Changed from get_open_interest to get_oi_data
+            df = self.api.get_oi_data(usecols=['symbol', 'time', 'openInterest', 'price'])
             
             if df is None:
                 print("❌ Failed to get current OI data")
@@ -296,11 +289,11 @@ class WhaleAgent(BaseAgent):
         try:
             target_time = datetime.now() - timedelta(minutes=minutes_ago)
             
-            # Find closest data point before target time
-            historical_data = self.oi_history[self.oi_history['timestamp'] <= target_time]
+            # Closest data point at or before target time (binary search)
+            historical_data = self.oi_history.at_or_before(target_time)
             
-            if not historical_data.empty:
-                return float(historical_data.iloc[-1]['total_oi'])
+            if historical_data is not None:
+                return historical_data['total_oi']
             return None
             
         except Exception as e:
@@ -318,8 +311,9 @@ class WhaleAgent(BaseAgent):
             print("❌ No history data available")
             return None
             
-        current_btc = float(self.oi_history.iloc[-1]['btc_oi'])
-        current_time = self.oi_history.iloc[-1]['timestamp']
+        latest = self.oi_history.latest()
+        current_btc = latest['btc_oi']
+        current_time = latest['timestamp']
         print(f"Current BTC OI: ${current_btc:,.2f}")
         print(f"Current Time: {current_time}")
         
@@ -330,24 +324,20 @@ class WhaleAgent(BaseAgent):
         target_time = current_time - timedelta(minutes=interval)
         
         print(f"\n🔍 Looking for data {interval}m ago from {target_time}")
-        print("\n📅 Full Historical Data:")
+        print(f"\n📅 Recent Historical Data ({len(self.oi_history)} records since {self.oi_history.first()['timestamp']}):")
         print("=" * 80)
         print("Timestamp | BTC OI | ETH OI | Total OI | BTC Change% | ETH Change% | Total Change%")
         print("-" * 80)
-        for idx, row in self.oi_history.iterrows():
+        for row in self.oi_history.tail(OI_HISTORY_PRINT_ROWS):
             print(f"{row['timestamp']} | ${row['btc_oi']:,.2f} | ${row['eth_oi']:,.2f} | ${row['total_oi']:,.2f} | {row['btc_change_pct']:,.4f}% | {row['eth_change_pct']:,.4f}% | {row['total_change_pct']:,.4f}%")
         print("=" * 80)
         
-        # Get historical data from X minutes ago
-        historical_data = self.oi_history[
-            self.oi_history['timestamp'] <= target_time
-        ]
-        
-        print(f"\n📊 Found {len(historical_data)} historical records")
+        # Get historical data from X minutes ago (binary search)
+        historical_data = self.oi_history.at_or_before(target_time)
         
-        if not historical_data.empty:
-            historical_btc = float(historical_data.iloc[-1]['btc_oi'])
-            historical_time = historical_data.iloc[-1]['timestamp']
+        if historical_data is not None:
+            historical_btc = historical_data['btc_oi']
+            historical_time = historical_data['timestamp']
             print(f"Historical BTC OI ({interval}m ago): ${historical_btc:,.2f}")
             print(f"Historical Time: {historical_time}")
             
@@ -561,22 +551,8 @@ class WhaleAgent(BaseAgent):
             if not is_whale:
                 return
                 
-            # Generate speech using OpenAI
-            response = openai.audio.speech.create(
-                model=VOICE_MODEL,
-                voice=VOICE_NAME,
-                speed=VOICE_SPEED,
-                input=message
-            )
-            
-            # Save and play the audio
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            audio_file = self.audio_dir / f"whale_alert_{timestamp}.mp3"
-            
-            response.stream_to_file(audio_file)
-            
-            # Play audio using system command
-            os.system(f"afplay {audio_file}")
+            # Queued on the shared announcer - synthesis and playback happen in the background
+            announcer.say(message, voice=VOICE_NAME, model=VOICE_MODEL, speed=VOICE_SPEED, key='whale')
             
         except Exception as e:
             print(f"❌ Error in announcement: {str(e)}")
@@ -587,8 +563,8 @@ class WhaleAgent(BaseAgent):
         try:
             if self.oi_history.empty:
                 current_data = self._get_current_oi()
-                if current_data is not None:
-                    latest_data = self.oi_history.iloc[-1]
+                if current_data is not None and not self.oi_history.empty:
+                    latest_data = self.oi_history.latest()
                     btc_oi = latest_data['btc_oi']
                     eth_oi = latest_data['eth_oi']
                     total_oi = latest_data['total_oi']
@@ -600,7 +576,7 @@ class WhaleAgent(BaseAgent):
                 return
                 
             # Rest of the method remains unchanged
-            current_oi = float(self.oi_history.iloc[-1]['total_oi'])
+            current_oi = self.oi_history.latest()['total_oi']
             changes = {}
             available_periods = []
             
@@ -613,8 +589,8 @@ class WhaleAgent(BaseAgent):
                     available_periods.append(period_name)
             
             if not changes:
-                earliest_data = self.oi_history.iloc[0]
-                latest_data = self.oi_history.iloc[-1]
+                earliest_data = self.oi_history.first()
+                latest_data = self.oi_history.latest()
                 minutes_diff = (latest_data['timestamp'] - earliest_data['timestamp']).total_seconds() / 60
                 pct_change = ((latest_data['total_oi'] - earliest_data['total_oi']) / earliest_data['total_oi']) * 100
                 
@@ -641,7 +617,7 @@ class WhaleAgent(BaseAgent):
                 return False
             
             # Get rolling average of absolute changes
-            historical_changes = self.oi_history['btc_change_pct'].abs().rolling(window=10).mean().dropna()
+            historical_changes = pd.Series(self.oi_history.column('btc_change_pct')).abs().rolling(window=10).mean().dropna()
             if historical_changes.empty:
                 print("⚠️ No historical changes available")
                 return False
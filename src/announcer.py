@@ -0,0 +1,263 @@
+"""
+🌙 Moon Dev's Announcer
+Built with love by Moon Dev 🚀
+
+One background voice for every agent. say() drops the message on a queue
+and returns right away; a worker thread synthesizes it with OpenAI TTS and
+plays it through a pluggable audio sink. Repeats within a few minutes are
+dropped, a newer message with the same key replaces one that's still
+waiting, announcements are rate limited, and synthesized clips are cached
+on disk so repeated phrases never hit the API twice.
+
+Set MOONDEV_AUDIO_SINK=null on headless servers (nothing is synthesized).
+"""
+
+import hashlib
+import os
+import platform
+import shutil
+import subprocess
+import threading
+import time
+from collections import OrderedDict, deque
+from pathlib import Path
+from termcolor import cprint
+
+from src import rate_limiter
+
+# Announcer settings 🔊
+AUDIO_SINK = os.getenv('MOONDEV_AUDIO_SINK', 'auto')  # auto, afplay, mpg123, ffplay, windows, null
+TTS_CACHE_DIR = Path(__file__).parent / "audio" / "tts_cache"
+MAX_CACHED_CLIPS = 200     # Oldest clips are deleted past this
+DEDUPE_SECONDS = 300       # Same text isn't spoken twice within this window
+MIN_GAP_SECONDS = 2        # Pause between announcements
+MAX_PER_MINUTE = 6         # Announcements started per minute
+MAX_PENDING = 20           # Oldest waiting message is dropped past this
+DEFAULT_MODEL = "tts-1"
+DEFAULT_VOICE = "shimmer"
+
+# ---------- audio sinks ----------
+
+class NullSink:
+    """Headless servers - nothing is synthesized or played"""
+    name = 'null'
+    needs_audio = False
+
+    def play(self, path):
+        pass
+
+class CommandSink:
+    """Plays a file with a command line player (afplay, mpg123, ffplay) and waits for it to finish"""
+    needs_audio = True
+
+    def __init__(self, name, command):
+        self.name = name
+        self.command = command
+
+    def play(self, path):
+        subprocess.run(self.command + [str(path)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+
+class WindowsSink:
+    """Hands the file to the default Windows player"""
+    name = 'windows'
+    needs_audio = True
+
+    def play(self, path):
+        os.startfile(str(path))
+        time.sleep(5)
+
+PLAYER_COMMANDS = {
+    'afplay': ['afplay'],
+    'mpg123': ['mpg123', '-q'],
+    'ffplay': ['ffplay', '-nodisp', '-autoexit', '-loglevel', 'quiet'],
+}
+
+def get_sink(name=AUDIO_SINK):
+    """Audio sink by name - 'auto' picks the first player installed, or the null sink"""
+    if name == 'null':
+        return NullSink()
+    if name == 'windows' or (name == 'auto' and platform.system() == 'Windows'):
+        return WindowsSink()
+    if name in PLAYER_COMMANDS:
+        return CommandSink(name, PLAYER_COMMANDS[name])
+    for player, command in PLAYER_COMMANDS.items():
+        if shutil.which(command[0]):
+            return CommandSink(player, command)
+    cprint("🔇 No audio player found - announcements will be printed only", "yellow")
+    return NullSink()
+
+# ---------- announcer ----------
+
+class _Clip:
+    __slots__ = ('text', 'voice', 'model', 'speed')
+
+    def __init__(self, text, voice, model, speed):
+        self.text = text
+        self.voice = voice
+        self.model = model
+        self.speed = speed
+
+    def cache_key(self):
+        return hashlib.sha256(f"{self.model}|{self.voice}|{self.speed}|{self.text}".encode('utf-8')).hexdigest()
+
+class Announcer:
+    """Queue + worker thread turning text into speech without blocking the caller"""
+
+    def __init__(self, sink=None, cache_dir=TTS_CACHE_DIR, dedupe_seconds=DEDUPE_SECONDS,
+                 min_gap=MIN_GAP_SECONDS, max_per_minute=MAX_PER_MINUTE, max_pending=MAX_PENDING):
+        self._sink = sink
+        self.cache_dir = Path(cache_dir)
+        self.dedupe_seconds = dedupe_seconds
+        self.min_gap = min_gap
+        self.max_per_minute = max_per_minute
+        self.max_pending = max_pending
+
+        self._pending = OrderedDict()  # coalesce key -> _Clip, oldest first
+        self._recent = {}              # text/voice -> when it was last queued
+        self._starts = deque()         # when recent announcements started
+        self._cond = threading.Condition()
+        self._busy = False
+        self._thread = None
+        self._client = None
+        self.stats = {'queued': 0, 'spoken': 0, 'deduped': 0, 'coalesced': 0,
+                      'dropped': 0, 'cache_hits': 0, 'errors': 0}
+
+    @property
+    def sink(self):
+        if self._sink is None:
+            self._sink = get_sink()
+        return self._sink
+
+    def say(self, text, voice=DEFAULT_VOICE, model=DEFAULT_MODEL, speed=1.0, key=None):
+        """
+        Queue text to be spoken and return immediately. A message with the
+        same key (e.g. the agent name) still waiting in the queue is replaced
+        by this one. Returns False if it was dropped as a recent duplicate.
+        """
+        text = (text or '').strip()
+        if not text:
+            return False
+        clip = _Clip(text, voice, model, speed)
+        dedupe_key = (text, voice)
+        now = time.monotonic()
+
+        with self._cond:
+            last = self._recent.get(dedupe_key)
+            if last is not None and now - last < self.dedupe_seconds:
+                self.stats['deduped'] += 1
+                return False
+            self._recent = {k: t for k, t in self._recent.items() if now - t < self.dedupe_seconds}
+            self._recent[dedupe_key] = now
+
+            coalesce_key = key if key is not None else dedupe_key
+            if coalesce_key in self._pending:
+                replaced = self._pending.pop(coalesce_key)
+                if replaced.text != text:
+                    self._recent.pop((replaced.text, replaced.voice), None)  # Never spoken, may repeat
+                self.stats['coalesced'] += 1
+            elif len(self._pending) >= self.max_pending:
+                self._pending.popitem(last=False)
+                self.stats['dropped'] += 1
+            self._pending[coalesce_key] = clip
+            self.stats['queued'] += 1
+            self._cond.notify()
+
+        self._ensure_worker()
+        return True
+
+    def flush(self, timeout=None):
+        """Wait until everything queued has been spoken (for scripts about to exit)"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._cond:
+            while self._pending or self._busy:
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def _ensure_worker(self):
+        with self._cond:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='announcer', daemon=True)
+                self._thread.start()
+
+    def _rate_wait(self, now):
+        """Seconds until the next announcement may start"""
+        while self._starts and now - self._starts[0] >= 60:
+            self._starts.popleft()
+        wait = 0.0
+        if self._starts:
+            wait = self.min_gap - (now - self._starts[-1])
+        if len(self._starts) >= self.max_per_minute:
+            wait = max(wait, 60 - (now - self._starts[0]))
+        return wait
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                wait = self._rate_wait(time.monotonic())
+                if wait > 0:
+                    # Newer messages can still replace waiting ones meanwhile
+                    self._cond.wait(wait)
+                    continue
+                _, clip = self._pending.popitem(last=False)
+                self._starts.append(time.monotonic())
+                self._busy = True
+
+            try:
+                if self.sink.needs_audio:
+                    self.sink.play(self._synthesize(clip))
+                self.stats['spoken'] += 1
+            except Exception as e:
+                self.stats['errors'] += 1
+                cprint(f"❌ Error in announcement: {str(e)}", "red")
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _synthesize(self, clip):
+        """mp3 for a clip - from the cache, or OpenAI TTS (then cached)"""
+        path = self.cache_dir / f"{clip.cache_key()}.mp3"
+        if path.exists():
+            os.utime(path)
+            self.stats['cache_hits'] += 1
+            return path
+
+        if self._client is None:
+            import openai
+            self._client = openai.OpenAI(api_key=os.getenv("OPENAI_KEY"))
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix('.part')
+        with rate_limiter.limit('openai'):
+            response = self._client.audio.speech.create(
+                model=clip.model,
+                voice=clip.voice,
+                input=clip.text,
+                speed=clip.speed,
+            )
+        with open(temp_path, 'wb') as f:
+            for chunk in response.iter_bytes():
+                f.write(chunk)
+        os.replace(temp_path, path)
+        self._prune_cache()
+        return path
+
+    def _prune_cache(self):
+        clips = sorted(self.cache_dir.glob("*.mp3"), key=lambda p: p.stat().st_mtime)
+        for old in clips[:max(0, len(clips) - MAX_CACHED_CLIPS)]:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+
+# Shared announcer used by all the voice agents
+announcer = Announcer()
+
+def announce(text, voice=DEFAULT_VOICE, model=DEFAULT_MODEL, speed=1.0, key=None):
+    """Queue text on the shared announcer (never blocks)"""
+    return announcer.say(text, voice=voice, model=model, speed=speed, key=key)
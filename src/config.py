@@ -75,7 +75,7 @@ sell_over = 1
 # Data collection settings 📈
 DAYSBACK_4_DATA = 3
 DATA_TIMEFRAME = '1H'  # 1m, 3m, 5m, 15m, 30m, 1H, 2H, 4H, 6H, 8H, 12H, 1D, 3D, 1W, 1M
-SAVE_OHLCV_DATA = False  # 🌙 Set to True to save data permanently, False will only use temp data during run
+SAVE_OHLCV_DATA = False  # 🌙 Set to True to also export each run's data to data/{token}_latest.csv (candles are always cached in src/data/store/ohlcv)
 
 # AI Model Settings 🤖
 AI_MODEL = "claude-3-haiku-20240307"  # Model Options:
@@ -84,6 +84,8 @@ AI_MODEL = "claude-3-haiku-20240307"  # Model Options:
                                      # - claude-3-opus-20240229 (Most powerful Claude model)
 AI_MAX_TOKENS = 1024  # Max tokens for response
 AI_TEMPERATURE = 0.7  # Creativity vs precision (0-1)
+TRADING_ANALYSIS_WORKERS = 4  # Tokens fetched + analyzed in parallel by the trading agent 🧵
+TRADING_RESPONSE_CACHE = True  # Reuse the AI analysis of an unchanged token within one cycle (False = always ask the model) 🗄️
 
 # Trading Strategy Agent Settings - MAY NOT BE USED YET 1/5/25
 ENABLE_STRATEGIES = True  # Set this to True to use strategies
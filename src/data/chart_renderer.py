@@ -0,0 +1,154 @@
+"""
+🌙 Moon Dev's Chart Renderer
+Built with love by Moon Dev 🚀
+
+Candlestick charts rendered off the main thread. mplfinance runs in a small
+process pool where each worker builds its figure once per layout and just
+clears + redraws the axes on later renders. Charts come back as PNG bytes
+(no disk write), and a chart whose last N candles haven't changed since the
+previous render is served from memory instead of being drawn again.
+"""
+
+import hashlib
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from io import BytesIO
+
+import pandas as pd
+
+# Renderer settings 🎨
+RENDER_WORKERS = 2        # Processes drawing charts
+HASH_BARS = 100           # Candles that go into the "has it changed?" hash
+CHART_DPI = 100
+CHART_SIZE = (12, 8)      # inches
+SMA_COLORS = {'SMA20': 'blue', 'SMA50': 'orange', 'SMA200': 'purple'}
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+# ---------- worker process side ----------
+
+_templates = {}  # (style, volume) -> (fig, price_ax, volume_ax), one set per worker process
+_render_lock = threading.Lock()  # pyplot isn't thread-safe and the figures above are shared
+
+def _template(style, volume):
+    """Figure + axes for this layout, created once per worker and reused"""
+    key = (style, volume)
+    if key not in _templates:
+        import matplotlib
+        matplotlib.use('Agg')
+        import mplfinance as mpf
+
+        fig = mpf.figure(style=style, figsize=CHART_SIZE)
+        if volume:
+            price_ax = fig.add_axes([0.07, 0.36, 0.86, 0.56])
+            volume_ax = fig.add_axes([0.07, 0.14, 0.86, 0.20], sharex=price_ax)
+        else:
+            price_ax = fig.add_axes([0.07, 0.14, 0.86, 0.78])
+            volume_ax = None
+        _templates[key] = (fig, price_ax, volume_ax)
+    return _templates[key]
+
+def _render_png(df, title, style, volume, sma_columns):
+    """Draw one candlestick chart into the reused figure and return PNG bytes (one render at a time per process)"""
+    with _render_lock:
+        return _draw(df, title, style, volume, sma_columns)
+
+def _draw(df, title, style, volume, sma_columns):
+    import mplfinance as mpf
+
+    fig, price_ax, volume_ax = _template(style, volume)
+    price_ax.clear()
+    if volume_ax is not None:
+        volume_ax.clear()
+
+    addplot = [
+        mpf.make_addplot(df[column], ax=price_ax, color=SMA_COLORS.get(column, 'gray'))
+        for column in sma_columns
+    ]
+    mpf.plot(df,
+             type='candle',
+             ax=price_ax,
+             volume=volume_ax if volume_ax is not None else False,
+             addplot=addplot if addplot else [],
+             style=style)
+    price_ax.set_title(title)
+    if volume_ax is not None:
+        price_ax.tick_params(labelbottom=False)
+
+    buffer = BytesIO()
+    fig.savefig(buffer, format='png', dpi=CHART_DPI)
+    return buffer.getvalue()
+
+# ---------- caller side ----------
+
+def bars_hash(df, hash_bars=HASH_BARS):
+    """Content hash of the last hash_bars candles (time + OHLCV)"""
+    tail = df.tail(hash_bars)
+    digest = hashlib.sha256()
+    digest.update(pd.to_datetime(tail.index).asi8.tobytes())
+    digest.update(tail[OHLCV_COLUMNS].to_numpy(dtype='float64').tobytes())
+    return digest.hexdigest()
+
+class ChartRenderer:
+    """Process-pool chart renderer with a per-(symbol, timeframe) last-render cache"""
+
+    def __init__(self, max_workers=RENDER_WORKERS, hash_bars=HASH_BARS, style='charles', volume=True):
+        self.max_workers = max_workers
+        self.hash_bars = hash_bars
+        self.style = style
+        self.volume = volume
+        self.renders = 0
+        self.skipped = 0
+        self._pool = None
+        self._last = {}      # (symbol, timeframe) -> (hash, Future of PNG bytes)
+        self._lock = threading.Lock()
+
+    def _executor(self):
+        # spawn, not fork - the agents that call us are multi-threaded
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers,
+                                             mp_context=multiprocessing.get_context('spawn'))
+        return self._pool
+
+    @staticmethod
+    def _prepare(data):
+        """Chart frame with a DatetimeIndex from either a timestamp column or the index"""
+        df = data
+        if 'timestamp' in df.columns:
+            df = df.set_index('timestamp')
+        df = df.copy()
+        df.index = pd.to_datetime(df.index)
+        return df
+
+    def render(self, symbol, timeframe, data, indicators=('SMA20', 'SMA50', 'SMA200'), title=None):
+        """
+        Future resolving to PNG bytes for this chart. If the last hash_bars
+        candles match the previous render for (symbol, timeframe) the earlier
+        result is returned without drawing again.
+        """
+        df = self._prepare(data)
+        if df.empty:
+            future = Future()
+            future.set_result(None)
+            return future
+
+        sma_columns = [c for c in indicators if c in df.columns and not df[c].isna().all()]
+        key = (symbol, timeframe)
+        content_hash = bars_hash(df, self.hash_bars)
+        with self._lock:
+            last = self._last.get(key)
+            if last and last[0] == content_hash and not (last[1].done() and last[1].exception()):
+                self.skipped += 1
+                return last[1]
+
+            title = title or f"{symbol} {timeframe} Chart Analysis by Moon Dev 🌙"
+            payload = df[OHLCV_COLUMNS + sma_columns]
+            future = self._executor().submit(_render_png, payload, title, self.style, self.volume, sma_columns)
+            self._last[key] = (content_hash, future)
+            self.renders += 1
+        return future
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
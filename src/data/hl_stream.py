@@ -0,0 +1,321 @@
+"""
+🌙 Moon Dev's Hyperliquid Stream
+Built with love by Moon Dev 🚀
+
+Websocket subscriptions for Hyperliquid candles, mid prices and asset
+contexts (funding / OI / mark). A background thread keeps everything in
+memory so agents read the latest state instead of polling REST every
+cycle. Drops reconnect automatically with backoff, and any candles missed
+while disconnected are backfilled through nice_funcs_hl.fetch_candles.
+
+Usage:
+    stream = HyperliquidStream()
+    stream.subscribe_candles('BTC', '1m')
+    stream.subscribe_mids()
+    stream.start()
+    stream.get_mid('BTC'), stream.get_candles('BTC', '1m')
+"""
+
+import asyncio
+import json
+import random
+import threading
+import time
+from collections import deque
+from termcolor import cprint
+
+import pandas as pd
+import websockets
+
+# Stream settings 📡
+HL_WS_URL = 'wss://api.hyperliquid.xyz/ws'
+CANDLE_BUFFER_SIZE = 1000  # Candles kept per (coin, interval)
+PING_INTERVAL = 30         # Hyperliquid drops connections idle for 60s
+RECONNECT_BASE = 1         # seconds, doubles on every failed attempt
+RECONNECT_MAX = 30         # seconds
+
+def _default_backfill(coin, interval, start_ms, end_ms):
+    """REST backfill through the candle cache - imported lazily so tests can swap it out"""
+    from src import nice_funcs_hl as hl
+    df = hl.fetch_candles(coin, interval, pd.to_datetime(start_ms, unit='ms'), pd.to_datetime(end_ms, unit='ms'))
+    return df.to_dict('records')
+
+def _interval_ms(interval):
+    from src.nice_funcs_hl import INTERVAL_MS
+    return INTERVAL_MS[interval]
+
+class HyperliquidStream:
+    """In-memory candles, mids and asset contexts kept fresh by one websocket"""
+
+    def __init__(self, url=HL_WS_URL, candle_buffer=CANDLE_BUFFER_SIZE,
+                 backfill_fn=_default_backfill, interval_ms_fn=_interval_ms):
+        self.url = url
+        self.candle_buffer = candle_buffer
+        self.backfill_fn = backfill_fn
+        self.interval_ms_fn = interval_ms_fn
+
+        self._subscriptions = []
+        self._sub_lock = threading.Lock()  # Guards _subscriptions against the connect handshake
+        self._candles = {}     # (coin, interval) -> deque of candle dicts, order of arrival
+        self._mids = {}        # coin -> float
+        self._asset_ctx = {}   # coin -> {'funding_rate', 'mark_price', 'open_interest', ...}
+        self._lock = threading.Lock()
+
+        self._loop = None
+        self._task = None
+        self._thread = None
+        self._ws = None
+        self._stopping = False
+        self.connected = threading.Event()
+        self.last_message_at = None
+        self.reconnects = 0
+
+    # ---------- subscriptions ----------
+
+    def _add_subscription(self, subscription):
+        with self._sub_lock:
+            if subscription in self._subscriptions:
+                return
+            self._subscriptions.append(subscription)
+            # Before connected is set, _subscribe_all picks it up instead
+            ws = self._ws if self.connected.is_set() else None
+        if ws is not None:
+            asyncio.run_coroutine_threadsafe(self._send_subscribe(ws, subscription), self._loop)
+
+    def subscribe_candles(self, coin, interval):
+        with self._lock:
+            self._candles.setdefault((coin, interval), deque(maxlen=self.candle_buffer))
+        self._add_subscription({'type': 'candle', 'coin': coin, 'interval': interval})
+
+    def subscribe_mids(self):
+        self._add_subscription({'type': 'allMids'})
+
+    def subscribe_asset_ctx(self, coin):
+        self._add_subscription({'type': 'activeAssetCtx', 'coin': coin})
+
+    # ---------- reads (any thread) ----------
+
+    def get_mid(self, coin):
+        with self._lock:
+            return self._mids.get(coin)
+
+    def get_mids(self):
+        with self._lock:
+            return dict(self._mids)
+
+    def get_asset_ctx(self, coin):
+        with self._lock:
+            ctx = self._asset_ctx.get(coin)
+            return dict(ctx) if ctx else None
+
+    def get_candles(self, coin, interval, as_dataframe=True):
+        """Buffered candles oldest first (t/o/h/l/c/v), as a DataFrame or list of dicts"""
+        with self._lock:
+            candles = list(self._candles.get((coin, interval), ()))
+        if not as_dataframe:
+            return candles
+        columns = ['t', 'o', 'h', 'l', 'c', 'v']
+        if not candles:
+            return pd.DataFrame(columns=columns)
+        return pd.DataFrame(candles)[columns].astype({'t': 'int64', 'o': 'float64', 'h': 'float64',
+                                                      'l': 'float64', 'c': 'float64', 'v': 'float64'})
+
+    # ---------- message handling ----------
+
+    def _store_candle(self, candle):
+        """Insert/replace a candle; returns the (coin, interval, start_ms, end_ms) gap it revealed, if any"""
+        key = (candle['s'], candle['i'])
+        row = {
+            't': int(candle['t']),
+            'o': float(candle['o']),
+            'h': float(candle['h']),
+            'l': float(candle['l']),
+            'c': float(candle['c']),
+            'v': float(candle['v']),
+        }
+        gap = None
+        with self._lock:
+            buffer = self._candles.setdefault(key, deque(maxlen=self.candle_buffer))
+            if buffer and buffer[-1]['t'] == row['t']:
+                buffer[-1] = row  # Forming candle update
+            elif buffer and buffer[-1]['t'] > row['t']:
+                return None  # Late update for an older bar
+            else:
+                if buffer:
+                    step = self.interval_ms_fn(key[1])
+                    if row['t'] - buffer[-1]['t'] > step:
+                        gap = (key[0], key[1], buffer[-1]['t'] + step, row['t'] - step)
+                buffer.append(row)
+        return gap
+
+    def _merge_backfill(self, coin, interval, candles):
+        """Merge REST candles into the buffer, keeping it sorted by open time"""
+        if not candles:
+            return
+        with self._lock:
+            buffer = self._candles.setdefault((coin, interval), deque(maxlen=self.candle_buffer))
+            merged = {row['t']: row for row in buffer}
+            for candle in candles:
+                t = int(candle['t'])
+                if t not in merged:
+                    merged[t] = {
+                        't': t,
+                        'o': float(candle['o']),
+                        'h': float(candle['h']),
+                        'l': float(candle['l']),
+                        'c': float(candle['c']),
+                        'v': float(candle['v']),
+                    }
+            buffer.clear()
+            buffer.extend(merged[t] for t in sorted(merged)[-self.candle_buffer:])
+
+    def handle_message(self, message):
+        """Apply one decoded websocket message to the in-memory state; returns any candle gap found"""
+        channel = message.get('channel')
+        data = message.get('data')
+        self.last_message_at = time.time()
+
+        if channel == 'candle':
+            candles = data if isinstance(data, list) else [data]
+            gaps = [self._store_candle(candle) for candle in candles]
+            return next((gap for gap in gaps if gap), None)
+        if channel == 'allMids':
+            mids = {coin: float(px) for coin, px in data.get('mids', {}).items()}
+            with self._lock:
+                self._mids.update(mids)
+        elif channel == 'activeAssetCtx':
+            ctx = data.get('ctx', {})
+            with self._lock:
+                self._asset_ctx[data.get('coin')] = {
+                    'funding_rate': float(ctx.get('funding', 0) or 0),
+                    'mark_price': float(ctx.get('markPx', 0) or 0),
+                    'open_interest': float(ctx.get('openInterest', 0) or 0),
+                    'oracle_price': float(ctx.get('oraclePx', 0) or 0),
+                }
+        return None
+
+    # ---------- connection ----------
+
+    async def _send_subscribe(self, ws, subscription):
+        await ws.send(json.dumps({'method': 'subscribe', 'subscription': subscription}))
+
+    async def _subscribe_all(self, ws):
+        """Send every subscription, then mark connected - ones added meanwhile are sent before that"""
+        sent = []
+        while True:
+            with self._sub_lock:
+                pending = [sub for sub in self._subscriptions if sub not in sent]
+                if not pending:
+                    self.connected.set()
+                    return
+            for subscription in pending:
+                await self._send_subscribe(ws, subscription)
+                sent.append(subscription)
+
+    async def _backfill(self, coin, interval, start_ms, end_ms):
+        """Fetch missed candles over REST without blocking the socket"""
+        try:
+            candles = await asyncio.get_running_loop().run_in_executor(
+                None, self.backfill_fn, coin, interval, start_ms, end_ms
+            )
+            self._merge_backfill(coin, interval, candles)
+            cprint(f"🧩 Backfilled {len(candles or [])} {coin} {interval} candles", "cyan")
+        except Exception as e:
+            cprint(f"⚠️ Backfill failed for {coin} {interval}: {str(e)}", "yellow")
+
+    async def _backfill_after_reconnect(self):
+        """Close the hole between the last buffered candle and now for every candle subscription"""
+        now_ms = int(time.time() * 1000)
+        with self._lock:
+            keys = [(key, buffer[-1]['t'] if buffer else None) for key, buffer in self._candles.items()]
+        for (coin, interval), last_t in keys:
+            step = self.interval_ms_fn(interval)
+            start_ms = last_t + step if last_t is not None else now_ms - step * self.candle_buffer
+            if start_ms <= now_ms:
+                await self._backfill(coin, interval, start_ms, now_ms)
+
+    async def _ping(self, ws):
+        while True:
+            await asyncio.sleep(PING_INTERVAL)
+            await ws.send(json.dumps({'method': 'ping'}))
+
+    async def _run(self):
+        attempt = 0
+        while not self._stopping:
+            try:
+                async with websockets.connect(self.url, ping_interval=None) as ws:
+                    self._ws = ws
+                    await self._subscribe_all(ws)
+                    if attempt or self.reconnects:
+                        cprint("🔌 Hyperliquid stream reconnected", "green")
+                    attempt = 0
+                    await self._backfill_after_reconnect()
+
+                    pinger = asyncio.ensure_future(self._ping(ws))
+                    try:
+                        async for raw in ws:
+                            message = json.loads(raw)
+                            gap = self.handle_message(message)
+                            if gap:
+                                asyncio.ensure_future(self._backfill(*gap))
+                    finally:
+                        pinger.cancel()
+            except Exception as e:
+                if self._stopping:
+                    break
+                cprint(f"⚠️ Hyperliquid stream dropped: {str(e)}", "yellow")
+            finally:
+                with self._sub_lock:
+                    self.connected.clear()
+                    self._ws = None
+
+            if self._stopping:
+                break
+            self.reconnects += 1
+            delay = random.uniform(0, min(RECONNECT_MAX, RECONNECT_BASE * (2 ** attempt)))
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def start(self):
+        """Run the stream on a background thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stopping = False
+        self._loop = asyncio.new_event_loop()
+        self._task = self._loop.create_task(self._run())
+        self._thread = threading.Thread(target=self._thread_main, name='hl-stream', daemon=True)
+        self._thread.start()
+        cprint("📡 Moon Dev's Hyperliquid stream starting...", "cyan")
+        return self
+
+    def _thread_main(self):
+        loop = self._loop
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass  # stop()
+        finally:
+            # Backfills still in flight are cancelled so the loop can be closed cleanly
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+
+    def stop(self, timeout=5):
+        """Close the socket, wait for the thread to exit and close its event loop"""
+        self._stopping = True
+        if self._task is not None:
+            # Cancelling also wakes a reconnect backoff; leaving the connect block closes the socket
+            self._loop.call_soon_threadsafe(self._task.cancel)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                cprint("⚠️ Hyperliquid stream thread didn't exit in time - leaving its loop open", "yellow")
+                return
+            self._thread = None
+        if self._loop is not None:
+            self._loop.close()
+            self._loop = None
+            self._task = None
+        self.connected.clear()
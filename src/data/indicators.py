@@ -0,0 +1,246 @@
+"""
+🌙 Moon Dev's Incremental Indicator Engine
+Built with love by Moon Dev 🚀
+
+Streaming versions of the indicators we use everywhere (SMA, EMA, RSI,
+MACD, Bollinger Bands, ATR). Each one keeps a little running state so a
+new bar costs O(1) instead of recomputing pandas_ta over the whole frame.
+Warm an engine up from history once, feed it candles as they close, and
+read the latest values straight from memory.
+"""
+
+import copy
+import math
+import threading
+from collections import deque
+
+class SMA:
+    """Simple moving average over the last `length` values (running sum)"""
+
+    def __init__(self, length=20):
+        self.length = length
+        self.window = deque(maxlen=length)
+        self.total = 0.0
+        self.value = None
+
+    def update(self, x):
+        if len(self.window) == self.length:
+            self.total -= self.window[0]
+        self.window.append(x)
+        self.total += x
+        self.value = self.total / self.length if len(self.window) == self.length else None
+        return self.value
+
+class EMA:
+    """Exponential moving average seeded with the SMA of the first `length` values"""
+
+    def __init__(self, length=20):
+        self.length = length
+        self.alpha = 2 / (length + 1)
+        self._seed = SMA(length)
+        self.value = None
+
+    def update(self, x):
+        if self.value is None:
+            self.value = self._seed.update(x)
+        else:
+            self.value += self.alpha * (x - self.value)
+        return self.value
+
+class WilderAverage:
+    """Wilder's smoothing (RMA): SMA seed, then alpha = 1 / length"""
+
+    def __init__(self, length=14):
+        self.length = length
+        self._seed = SMA(length)
+        self.value = None
+
+    def update(self, x):
+        if self.value is None:
+            self.value = self._seed.update(x)
+        else:
+            self.value += (x - self.value) / self.length
+        return self.value
+
+class RSI:
+    """Wilder RSI on closes"""
+
+    def __init__(self, length=14):
+        self.length = length
+        self.gain = WilderAverage(length)
+        self.loss = WilderAverage(length)
+        self.prev_close = None
+        self.value = None
+
+    def update(self, close):
+        if self.prev_close is not None:
+            change = close - self.prev_close
+            avg_gain = self.gain.update(max(change, 0.0))
+            avg_loss = self.loss.update(max(-change, 0.0))
+            if avg_gain is not None:
+                if avg_loss == 0:
+                    self.value = 100.0 if avg_gain > 0 else 50.0
+                else:
+                    self.value = 100 - 100 / (1 + avg_gain / avg_loss)
+        self.prev_close = close
+        return self.value
+
+class MACD:
+    """MACD line, signal line and histogram"""
+
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.fast = EMA(fast)
+        self.slow = EMA(slow)
+        self.signal = EMA(signal)
+        self.value = None
+
+    def update(self, close):
+        fast = self.fast.update(close)
+        slow = self.slow.update(close)
+        if fast is None or slow is None:
+            return None
+        line = fast - slow
+        signal = self.signal.update(line)
+        self.value = {
+            'macd': line,
+            'signal': signal,
+            'histogram': line - signal if signal is not None else None,
+        }
+        return self.value
+
+class BollingerBands:
+    """Middle/upper/lower bands from a running sum and sum of squares"""
+
+    def __init__(self, length=20, std=2.0, ddof=0):
+        self.length = length
+        self.std = std
+        self.ddof = ddof
+        self.window = deque(maxlen=length)
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.value = None
+
+    def update(self, close):
+        if len(self.window) == self.length:
+            old = self.window[0]
+            self.total -= old
+            self.total_sq -= old * old
+        self.window.append(close)
+        self.total += close
+        self.total_sq += close * close
+        if len(self.window) < self.length:
+            return None
+        mean = self.total / self.length
+        variance = max(0.0, (self.total_sq - self.length * mean * mean) / (self.length - self.ddof))
+        deviation = math.sqrt(variance)
+        self.value = {
+            'lower': mean - self.std * deviation,
+            'middle': mean,
+            'upper': mean + self.std * deviation,
+            'bandwidth': (2 * self.std * deviation / mean * 100) if mean else None,
+        }
+        return self.value
+
+class ATR:
+    """Average true range with Wilder smoothing"""
+
+    def __init__(self, length=14):
+        self.average = WilderAverage(length)
+        self.prev_close = None
+        self.value = None
+
+    def update(self, high, low, close):
+        if self.prev_close is None:
+            true_range = high - low
+        else:
+            true_range = max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+        self.prev_close = close
+        self.value = self.average.update(true_range)
+        return self.value
+
+# Default indicator set - same names as add_technical_indicators where they overlap
+DEFAULT_INDICATORS = {
+    'sma_20': lambda: SMA(20),
+    'sma_50': lambda: SMA(50),
+    'ema_20': lambda: EMA(20),
+    'rsi': lambda: RSI(14),
+    'macd': lambda: MACD(12, 26, 9),
+    'bbands': lambda: BollingerBands(20, 2.0),
+    'atr': lambda: ATR(14),
+}
+
+def _bar_value(bar, name):
+    """Read open/high/low/close from a dict or row with either lower or Title case keys"""
+    for key in (name, name.title(), name[0]):
+        try:
+            return float(bar[key])
+        except (KeyError, IndexError, TypeError):
+            continue
+    raise KeyError(name)
+
+def _bar_time(bar):
+    for key in ('timestamp', 'Datetime (UTC)', 't', 'unixTime'):
+        try:
+            return bar[key]
+        except (KeyError, IndexError, TypeError):
+            continue
+    return None
+
+class IndicatorEngine:
+    """
+    A set of streaming indicators for one symbol/timeframe.
+
+    update(bar) commits a closed bar in O(1). update(bar, closed=False) shows
+    the still-forming bar: it's applied to a copy of the state so latest()
+    reflects it without committing, and the next closed bar replaces it.
+    """
+
+    def __init__(self, indicators=None):
+        factories = indicators or DEFAULT_INDICATORS
+        self._indicators = {name: factory() for name, factory in factories.items()}
+        self._preview = None
+        self.last_time = None
+        self.bars = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _apply(indicators, bar):
+        high = _bar_value(bar, 'high')
+        low = _bar_value(bar, 'low')
+        close = _bar_value(bar, 'close')
+        for indicator in indicators.values():
+            if isinstance(indicator, ATR):
+                indicator.update(high, low, close)
+            else:
+                indicator.update(close)
+
+    def update(self, bar, closed=True):
+        """Feed one candle (dict / Series with high, low, close and optionally a time)"""
+        with self._lock:
+            if not closed:
+                preview = copy.deepcopy(self._indicators)
+                self._apply(preview, bar)
+                self._preview = preview
+                return
+            bar_time = _bar_time(bar)
+            if bar_time is not None and self.last_time is not None and bar_time <= self.last_time:
+                return  # Already have this bar
+            self._apply(self._indicators, bar)
+            self._preview = None
+            self.last_time = bar_time
+            self.bars += 1
+
+    def warm_up(self, df):
+        """Feed historical candles (oldest first) - works with any of our OHLCV frames"""
+        for _, bar in df.iterrows():
+            self.update(bar)
+        return self
+
+    def latest(self):
+        """{indicator name: latest value} including the forming bar if one was shown"""
+        with self._lock:
+            indicators = self._preview or self._indicators
+            return {name: copy.copy(indicator.value) for name, indicator in indicators.items()}
+
+    def value(self, name):
+        return self.latest().get(name)
@@ -0,0 +1,181 @@
+"""
+🌙 Moon Dev's Liquidation Event Store
+Built with love by Moon Dev 🚀
+
+Keeps a local copy of the Moon Dev API liquidation feed in sync by tailing
+liq_data.csv (byte ranges - only new rows come down the wire), persists the
+events in a TimeSeriesStore, and maintains rolling long/short sums for each
+window with one deque per (window, side). Reading a window total is O(1);
+each event is added and evicted exactly once.
+"""
+
+import time
+from collections import Counter, deque
+
+import pandas as pd
+from termcolor import cprint
+
+from src.data.storage import TimeSeriesStore
+
+# Feed settings 🌊
+LIQUIDATION_FILE = "liq_data.csv"
+LIQUIDATION_COLUMNS = ['symbol', 'side', 'type', 'time_in_force',
+                       'quantity', 'price', 'price2', 'status',
+                       'filled_qty', 'total_qty', 'timestamp', 'usd_value']
+LIQUIDATION_USECOLS = ['side', 'timestamp', 'usd_value']  # Only these are parsed from the feed
+SEED_BYTES = 8 * 1024 * 1024    # First sync reads this much of the end of the file (~100k events)
+WINDOWS_MINUTES = (15, 60, 240)
+RETENTION_HOURS = 24            # Events kept in the local store
+
+# SELL side = long liquidation, BUY side = short liquidation
+SIDES = {'SELL': 'long', 'BUY': 'short'}
+
+LIQUIDATION_EVENT_SCHEMA = {
+    'timestamp': 'int64',   # ms since epoch
+    'side': 'string',
+    'usd_value': 'float64',
+}
+
+class RollingSum:
+    """Sum + count of values over the last `window_ms` (late events are slotted in by time)"""
+
+    def __init__(self, window_ms):
+        self.window_ms = window_ms
+        self.events = deque()
+        self.total = 0.0
+
+    def add(self, t, value):
+        events = self.events
+        if events and t < events[-1][0]:
+            # Late event - keep the deque time-ordered so eviction from the left stays correct
+            i = len(events)
+            while i and events[i - 1][0] > t:
+                i -= 1
+            events.insert(i, (t, value))
+        else:
+            events.append((t, value))
+        self.total += value
+
+    def advance(self, now_ms):
+        """Evict events older than the window"""
+        cutoff = now_ms - self.window_ms
+        while self.events and self.events[0][0] < cutoff:
+            self.total -= self.events.popleft()[1]
+        if not self.events:
+            self.total = 0.0  # Clear float drift
+
+    @property
+    def count(self):
+        return len(self.events)
+
+class LiquidationEventStore:
+    """Tail-synced liquidation events with incremental rolling window sums"""
+
+    def __init__(self, api, windows_minutes=WINDOWS_MINUTES, seed_bytes=SEED_BYTES):
+        self.api = api
+        self.windows_minutes = tuple(windows_minutes)
+        self.seed_bytes = seed_bytes
+        self.store = TimeSeriesStore('liquidation_events', LIQUIDATION_EVENT_SCHEMA,
+                                     time_column='timestamp', time_unit='ms')
+        self.windows = {
+            (minutes, side): RollingSum(minutes * 60_000)
+            for minutes in self.windows_minutes for side in SIDES.values()
+        }
+        self.last_timestamp = None
+        self._last_ms_events = Counter()  # (side, usd_value) of the events stored at last_timestamp
+        self._warm_up()
+
+    def _warm_up(self):
+        """Replay the stored events inside the longest window so a restart keeps its totals"""
+        now_ms = int(time.time() * 1000)
+        self.store.drop_before(pd.Timestamp(now_ms - RETENTION_HOURS * 3_600_000, unit='ms'))
+        if self.store.is_empty():
+            return
+        events = self.store.read(start=pd.Timestamp(now_ms - max(self.windows_minutes) * 60_000, unit='ms'))
+        self._add_events(events)
+        if self.last_timestamp is None:
+            # Nothing inside the window - still remember where the store ends
+            tail = self.store.read(columns=['timestamp', 'side', 'usd_value'])
+            if not tail.empty:
+                self.last_timestamp = int(tail['timestamp'].max())
+                self._last_ms_events = Counter(self._event_keys(tail[tail['timestamp'] == self.last_timestamp]))
+        cprint(f"📦 Loaded {len(events)} stored liquidation events", "cyan")
+
+    @staticmethod
+    def _event_keys(events):
+        return list(zip(events['side'].astype(str), events['usd_value'].astype('float64')))
+
+    def _add_events(self, events):
+        """Feed new events into the rolling windows - ones older than what we've seen are slotted in by time"""
+        if events.empty:
+            return
+        events = events.sort_values('timestamp', kind='stable')
+        for t, side, value in zip(events['timestamp'].to_numpy('int64'),
+                                  events['side'].astype(str).to_numpy(),
+                                  events['usd_value'].to_numpy('float64')):
+            bucket = SIDES.get(side)
+            if bucket is None:
+                continue
+            for minutes in self.windows_minutes:
+                self.windows[(minutes, bucket)].add(t, value)
+
+        newest = int(events['timestamp'].iloc[-1])
+        at_newest = Counter(self._event_keys(events[events['timestamp'] == newest]))
+        if self.last_timestamp is None or newest > self.last_timestamp:
+            self.last_timestamp = newest
+            self._last_ms_events = at_newest
+        elif newest == self.last_timestamp:
+            self._last_ms_events += at_newest
+
+    def _drop_stored(self, df):
+        """Snapshot rows not stored yet - ones at the last stored ms are matched on (side, usd_value)"""
+        df = df[df['timestamp'] >= self.last_timestamp]
+        at_last = (df['timestamp'] == self.last_timestamp).to_numpy()
+        if not at_last.any():
+            return df
+        seen = self._last_ms_events.copy()
+        keep = ~at_last
+        for i in at_last.nonzero()[0]:
+            key = (str(df['side'].iat[i]), float(df['usd_value'].iat[i]))
+            if seen[key] > 0:
+                seen[key] -= 1
+            else:
+                keep[i] = True
+        return df[keep]
+
+    def sync(self):
+        """Pull the rows appended to the feed since the last sync; returns how many events were new"""
+        df, snapshot = self.api.tail_csv(
+            LIQUIDATION_FILE,
+            names=LIQUIDATION_COLUMNS,
+            usecols=LIQUIDATION_USECOLS,
+            dtype={'usd_value': 'float64'},
+            initial_bytes=self.seed_bytes,
+        )
+        if df is None or df.empty:
+            return 0
+
+        df = df.dropna(subset=['timestamp', 'usd_value'])
+        df['timestamp'] = df['timestamp'].astype('int64')
+        if snapshot and self.last_timestamp is not None:
+            # A fresh snapshot overlaps what we already stored
+            df = self._drop_stored(df)
+        if df.empty:
+            return 0
+
+        self.store.append(df)
+        self._add_events(df)
+        now_ms = int(time.time() * 1000)
+        self.store.drop_before(pd.Timestamp(now_ms - RETENTION_HOURS * 3_600_000, unit='ms'))
+        return len(df)
+
+    def window(self, minutes, side, now_ms=None):
+        """(usd total, event count) of 'long' or 'short' liquidations in the last `minutes`"""
+        rolling = self.windows[(minutes, side)]
+        rolling.advance(now_ms if now_ms is not None else int(time.time() * 1000))
+        return float(rolling.total), rolling.count
+
+    def stats(self, now_ms=None):
+        """{(minutes, side): (usd total, event count)} for every window"""
+        now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+        return {key: self.window(key[0], key[1], now_ms) for key in self.windows}
@@ -0,0 +1,138 @@
+"""
+🌙 Moon Dev's Market Data Prompt Encoder
+Built with love by Moon Dev 🚀
+
+Turns an OHLCV + indicator DataFrame into a compact, deterministic block of
+text for LLM prompts instead of pandas' truncated repr. Older bars are
+summarized into a few buckets, the most recent bars are kept at full
+resolution, numbers use fixed significant digits, and the whole thing is
+shrunk until it fits a token budget.
+"""
+
+import math
+import pandas as pd
+
+# Encoder settings 🧮
+RECENT_BARS = 24           # Bars kept at full resolution
+SUMMARY_BUCKETS = 6        # Older bars are summarized into this many buckets
+SIG_DIGITS = 6             # Significant digits for every number
+DEFAULT_TOKEN_BUDGET = 1500
+MIN_RECENT_BARS = 5
+CHARS_PER_TOKEN = 4        # Rough average for English + numbers
+
+TIME_COLUMNS = ['datetime (utc)', 'timestamp', 'datetime', 'time', 'date']
+OHLCV_NAMES = ['open', 'high', 'low', 'close', 'volume']
+
+def estimate_tokens(text):
+    """Cheap, deterministic token count estimate (~4 chars per token)"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+def _fmt(value):
+    """Fixed-precision number formatting (bools as 1/0, missing as '-')"""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return '-'
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, (int, float)):
+        return f"{value:.{SIG_DIGITS}g}"
+    return str(value)
+
+def _time_str(value):
+    try:
+        return pd.Timestamp(value).strftime('%Y-%m-%d %H:%M')
+    except (ValueError, TypeError):
+        return str(value)
+
+def _columns(df):
+    """Map the frame's own column names onto time / ohlcv / indicator roles"""
+    lower = {column.lower(): column for column in df.columns if isinstance(column, str)}
+    time_column = next((lower[name] for name in TIME_COLUMNS if name in lower), None)
+    ohlcv = {name: lower[name] for name in OHLCV_NAMES if name in lower}
+    used = set(ohlcv.values()) | {time_column}
+    indicators = [
+        column for column in df.columns
+        if column not in used and (
+            pd.api.types.is_numeric_dtype(df[column]) or pd.api.types.is_bool_dtype(df[column])
+        )
+    ]
+    return time_column, ohlcv, indicators
+
+def _summary_lines(df, time_column, ohlcv, buckets):
+    """One line per bucket of older bars: time range, open, high, low, close, volume"""
+    if df.empty or buckets <= 0:
+        return []
+    lines = ["from,to,open,high,low,close,volume"]
+    size = math.ceil(len(df) / buckets)
+    for start in range(0, len(df), size):
+        chunk = df.iloc[start:start + size]
+        line = [
+            _time_str(chunk[time_column].iloc[0]) if time_column else str(start),
+            _time_str(chunk[time_column].iloc[-1]) if time_column else str(start + len(chunk) - 1),
+            _fmt(chunk[ohlcv['open']].iloc[0]) if 'open' in ohlcv else '-',
+            _fmt(chunk[ohlcv['high']].max()) if 'high' in ohlcv else '-',
+            _fmt(chunk[ohlcv['low']].min()) if 'low' in ohlcv else '-',
+            _fmt(chunk[ohlcv['close']].iloc[-1]) if 'close' in ohlcv else '-',
+            _fmt(chunk[ohlcv['volume']].sum()) if 'volume' in ohlcv else '-',
+        ]
+        lines.append(','.join(line))
+    return lines
+
+def _recent_lines(df, time_column, ohlcv, indicators):
+    """Full-resolution rows for the latest bars"""
+    columns = ([time_column] if time_column else []) + list(ohlcv.values()) + indicators
+    header = (['time'] if time_column else []) + list(ohlcv) + [str(c) for c in indicators]
+    lines = [','.join(header)]
+    for row in df[columns].itertuples(index=False):
+        values = list(row)
+        if time_column:
+            values[0] = _time_str(values[0])
+            values[1:] = [_fmt(v.item() if hasattr(v, 'item') else v) for v in values[1:]]
+        else:
+            values = [_fmt(v.item() if hasattr(v, 'item') else v) for v in values]
+        lines.append(','.join(values))
+    return lines
+
+def _encode(df, recent_bars, summary_buckets):
+    time_column, ohlcv, indicators = _columns(df)
+    recent = df.tail(recent_bars)
+    older = df.iloc[:max(0, len(df) - recent_bars)]
+
+    parts = [f"bars={len(df)}"]
+    if time_column and len(df):
+        parts.append(f"from={_time_str(df[time_column].iloc[0])} to={_time_str(df[time_column].iloc[-1])}")
+    lines = [' '.join(parts)]
+
+    summary = _summary_lines(older, time_column, ohlcv, summary_buckets)
+    if summary:
+        lines.append(f"Older {len(older)} bars summarized in {len(summary) - 1} buckets:")
+        lines.extend(summary)
+    lines.append(f"Last {len(recent)} bars:")
+    lines.extend(_recent_lines(recent, time_column, ohlcv, indicators))
+    return '\n'.join(lines)
+
+def encode_market_data(market_data, max_tokens=DEFAULT_TOKEN_BUDGET,
+                       recent_bars=RECENT_BARS, summary_buckets=SUMMARY_BUCKETS):
+    """
+    Compact text for an OHLCV(+indicators) DataFrame that fits max_tokens.
+
+    Works with both the Birdeye frames (Datetime (UTC), Open, ...) and the
+    Hyperliquid ones (timestamp, open, ...). Anything that isn't a DataFrame
+    is passed through as text. If the encoding is over budget the number of
+    full-resolution bars is halved (down to MIN_RECENT_BARS), then the
+    summary buckets are dropped.
+    """
+    if market_data is None:
+        return "No market data available"
+    if not isinstance(market_data, pd.DataFrame):
+        return str(market_data)
+    if market_data.empty:
+        return "No market data available"
+
+    df = market_data.reset_index(drop=True)
+    text = _encode(df, recent_bars, summary_buckets)
+    while estimate_tokens(text) > max_tokens and recent_bars > MIN_RECENT_BARS:
+        recent_bars = max(MIN_RECENT_BARS, recent_bars // 2)
+        text = _encode(df, recent_bars, summary_buckets)
+    if estimate_tokens(text) > max_tokens and summary_buckets:
+        text = _encode(df, recent_bars, 0)
+    return text
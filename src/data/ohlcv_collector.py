@@ -26,18 +26,16 @@ def collect_token_data(token, days_back=DAYSBACK_4_DATA, timeframe=DATA_TIMEFRAM
             
         cprint(f"📊 Moon Dev's AI Agent processed {len(data)} candles for analysis", "white", "on_blue")
         
-        # Save data if configured
+        # Candles are already cached in the OHLCV store - only export a copy if configured
         if SAVE_OHLCV_DATA:
             save_path = f"data/{token}_latest.csv"
-        else:
-            save_path = f"temp_data/{token}_latest.csv"
             
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(save_path), exist_ok=True)
-        
-        # Save to CSV
-        data.to_csv(save_path)
-        cprint(f"💾 Moon Dev's AI Agent cached data for {token[:4]}", "white", "on_green")
+            # Ensure directory exists
+            os.makedirs(os.path.dirname(save_path), exist_ok=True)
+            
+            # Save to CSV
+            data.to_csv(save_path)
+            cprint(f"💾 Moon Dev's AI Agent saved data for {token[:4]}", "white", "on_green")
         
         return data
         
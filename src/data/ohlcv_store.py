@@ -0,0 +1,212 @@
+"""
+🌙 Moon Dev's Incremental OHLCV Store
+Built with love by Moon Dev 🚀
+
+Persistent candle store keyed by (mint, timeframe). Closed candles are
+appended to a monthly-partitioned TimeSeriesStore per key and never
+re-downloaded - a sync only asks
+the API for bars newer than the last one we have, and any window inside
+the stored range is served from local data.
+"""
+
+import json
+import os
+import threading
+import time
+import pandas as pd
+from termcolor import cprint
+
+from src.data.storage import TimeSeriesStore, STORE_ROOT
+
+# Store settings 🗄️
+OHLCV_STORE_DIR = os.path.join(STORE_ROOT, 'ohlcv')
+OHLCV_SCHEMA = {
+    'unixTime': 'int64',
+    'o': 'float64',
+    'h': 'float64',
+    'l': 'float64',
+    'c': 'float64',
+    'v': 'float64',
+}
+OHLCV_COLUMNS = list(OHLCV_SCHEMA)
+COVERAGE_FILE = 'coverage.json'  # (mint, timeframe) -> earliest time a full fetch has covered
+
+# Birdeye timeframe -> candle length in seconds
+TIMEFRAME_SECONDS = {
+    '1m': 60,
+    '3m': 3 * 60,
+    '5m': 5 * 60,
+    '15m': 15 * 60,
+    '30m': 30 * 60,
+    '1H': 60 * 60,
+    '2H': 2 * 60 * 60,
+    '4H': 4 * 60 * 60,
+    '6H': 6 * 60 * 60,
+    '8H': 8 * 60 * 60,
+    '12H': 12 * 60 * 60,
+    '1D': 24 * 60 * 60,
+    '3D': 3 * 24 * 60 * 60,
+    '1W': 7 * 24 * 60 * 60,
+    '1M': 30 * 24 * 60 * 60,
+}
+
+class OHLCVStore:
+    """
+    Append-only candle store.
+
+    fetch_fn(mint, timeframe, time_from, time_to) must return a list of
+    {'unixTime', 'o', 'h', 'l', 'c', 'v'} dicts, or None on failure.
+    Only closed candles are persisted; the candle still forming is fetched
+    on every sync and returned with the window but never written.
+    """
+
+    def __init__(self, fetch_fn, root=OHLCV_STORE_DIR):
+        self.fetch_fn = fetch_fn
+        self.root = root
+        self._frames = {}  # (mint, timeframe) -> closed candles DataFrame
+        self._stores = {}  # (mint, timeframe) -> TimeSeriesStore
+        self._key_locks = {}  # (mint, timeframe) -> RLock, so different tokens sync in parallel
+        self._coverage = None  # "mint_timeframe" -> unix seconds, loaded on first use
+        self._lock = threading.Lock()
+
+    def _key_lock(self, mint, timeframe):
+        with self._lock:
+            return self._key_locks.setdefault((mint, timeframe), threading.RLock())
+
+    def _store(self, mint, timeframe):
+        key = (mint, timeframe)
+        with self._lock:
+            if key not in self._stores:
+                self._stores[key] = TimeSeriesStore(
+                    f"{mint}_{timeframe}", OHLCV_SCHEMA, time_column='unixTime',
+                    time_unit='s', partition='M', root=self.root,
+                )
+            return self._stores[key]
+
+    def _coverage_path(self):
+        return os.path.join(self.root, COVERAGE_FILE)
+
+    def covered_from(self, mint, timeframe):
+        """
+        Earliest time a full fetch has covered for (mint, timeframe), or None.
+        The API had no bars between this and the first stored candle (e.g. a
+        token listed after it), so that stretch counts as history too.
+        """
+        with self._lock:
+            if self._coverage is None:
+                try:
+                    with open(self._coverage_path()) as f:
+                        self._coverage = json.load(f)
+                except (OSError, ValueError):
+                    self._coverage = {}
+            return self._coverage.get(f"{mint}_{timeframe}")
+
+    def _set_covered_from(self, mint, timeframe, time_from):
+        current = self.covered_from(mint, timeframe)
+        if current is not None and current <= time_from:
+            return
+        with self._lock:
+            self._coverage[f"{mint}_{timeframe}"] = int(time_from)
+            os.makedirs(self.root, exist_ok=True)
+            temp_path = self._coverage_path() + '.tmp'
+            with open(temp_path, 'w') as f:
+                json.dump(self._coverage, f)
+            os.replace(temp_path, self._coverage_path())
+
+    def load(self, mint, timeframe):
+        """Closed candles stored for (mint, timeframe), oldest first"""
+        key = (mint, timeframe)
+        with self._key_lock(mint, timeframe):
+            if key not in self._frames:
+                df = self._store(mint, timeframe).read()
+                df = df.drop_duplicates('unixTime', keep='last')
+                self._frames[key] = df.reset_index(drop=True)
+            return self._frames[key]
+
+    def _write(self, mint, timeframe, df, append):
+        store = self._store(mint, timeframe)
+        if append:
+            store.append(df[OHLCV_COLUMNS])
+        else:
+            store.overwrite(df[OHLCV_COLUMNS])
+
+    def sync(self, mint, timeframe, time_from, time_to=None):
+        """
+        Make sure closed candles from time_from onwards are stored.
+
+        Returns the still-forming candles (not persisted), or None if the
+        API call needed to extend the store failed.
+        """
+        time_to = int(time_to or time.time())
+        step = TIMEFRAME_SECONDS.get(timeframe, 60)
+
+        with self._key_lock(mint, timeframe):
+            stored = self.load(mint, timeframe)
+            have_history = False
+            if not stored.empty:
+                earliest = int(stored['unixTime'].iloc[0])
+                covered = self.covered_from(mint, timeframe)
+                if covered is not None:
+                    earliest = min(earliest, covered)
+                have_history = earliest <= time_from + step
+
+            if have_history:
+                # Steady state: only ask for bars after the last closed one
+                fetch_from = int(stored['unixTime'].iloc[-1]) + step
+            else:
+                # Empty store or a longer window than we've seen - rebuild the range once
+                fetch_from = time_from
+
+            items = self.fetch_fn(mint, timeframe, fetch_from, time_to)
+            if items is None:
+                return None
+
+            new = pd.DataFrame(items, columns=OHLCV_COLUMNS)
+            if new.empty:
+                return new
+
+            new = new.drop_duplicates('unixTime', keep='last').sort_values('unixTime')
+            closed_mask = new['unixTime'] + step <= time.time()
+            closed, forming = new[closed_mask], new[~closed_mask]
+
+            if have_history:
+                closed = closed[closed['unixTime'] > stored['unixTime'].iloc[-1]]
+                if not closed.empty:
+                    self._write(mint, timeframe, closed, append=True)
+                    stored = pd.concat([stored, closed], ignore_index=True)
+            else:
+                if not stored.empty:
+                    # Keep anything we stored after the refetched range
+                    newer = stored[stored['unixTime'] > closed['unixTime'].max()] if not closed.empty else stored
+                    closed = pd.concat([closed, newer], ignore_index=True)
+                self._write(mint, timeframe, closed, append=False)
+                stored = closed.reset_index(drop=True)
+                if not stored.empty:
+                    # Everything the API had from time_from on is stored now
+                    self._set_covered_from(mint, timeframe, time_from)
+
+            self._frames[(mint, timeframe)] = stored
+            return forming
+
+    def get_window(self, mint, timeframe, time_from, time_to=None):
+        """
+        Candles between time_from and time_to (unix seconds), oldest first.
+
+        Syncs new bars first; if the API is down we fall back to whatever is
+        stored. Returns None only if there's nothing at all to serve.
+        """
+        time_to = int(time_to or time.time())
+        forming = self.sync(mint, timeframe, time_from, time_to)
+        if forming is None:
+            cprint(f"⚠️ Moon Dev serving stored candles only for {mint[:4]} {timeframe}", "yellow")
+
+        with self._key_lock(mint, timeframe):
+            df = self.load(mint, timeframe)
+            if forming is not None and not forming.empty:
+                df = pd.concat([df, forming], ignore_index=True)
+
+        if df.empty and forming is None:
+            return None
+
+        window = df[(df['unixTime'] >= time_from) & (df['unixTime'] <= time_to)]
+        return window.reset_index(drop=True)
@@ -0,0 +1,126 @@
+"""
+🌙 Moon Dev's Time Ring Buffer
+Built with love by Moon Dev 🚀
+
+Fixed-capacity, time-indexed history held in preallocated numpy arrays.
+Appends overwrite the oldest slot in O(1), "value at or before time t"
+is a binary search over the (sorted) timestamps in O(log n), and nothing
+is ever concatenated or copied as the history grows. Persistence is left
+to an append-only TimeSeriesStore next to it.
+"""
+
+import numpy as np
+import pandas as pd
+
+class TimeRingBuffer:
+    """Circular buffer of (timestamp, float fields...) rows, oldest first"""
+
+    def __init__(self, capacity, fields, time_column='timestamp'):
+        self.capacity = int(capacity)
+        self.fields = list(fields)
+        self.time_column = time_column
+        self._times = np.zeros(self.capacity, dtype='int64')  # ns since epoch
+        self._values = {field: np.full(self.capacity, np.nan) for field in self.fields}
+        self._start = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def empty(self):
+        return self._size == 0
+
+    def _slot(self, i):
+        """Physical array index of the i-th oldest row"""
+        return (self._start + i) % self.capacity
+
+    def _row(self, i):
+        slot = self._slot(i)
+        row = {self.time_column: pd.Timestamp(int(self._times[slot]))}
+        row.update({field: float(self._values[field][slot]) for field in self.fields})
+        return row
+
+    # ---------- writes ----------
+
+    def append(self, timestamp, **values):
+        """Add a row; timestamps must not go backwards (older rows are ignored, returns False)"""
+        t = pd.Timestamp(timestamp).value
+        if self._size and t < self._times[self._slot(self._size - 1)]:
+            return False
+        if self._size < self.capacity:
+            slot = self._slot(self._size)
+            self._size += 1
+        else:
+            slot = self._start  # Full - overwrite the oldest row
+            self._start = (self._start + 1) % self.capacity
+        self._times[slot] = t
+        for field in self.fields:
+            self._values[field][slot] = float(values.get(field, np.nan))
+        return True
+
+    def extend(self, df):
+        """Load rows from a DataFrame (sorted by time first); only the newest `capacity` are kept"""
+        if df is None or df.empty:
+            return
+        df = df.sort_values(self.time_column, kind='stable').tail(self.capacity)
+        for row in df.itertuples(index=False):
+            row = row._asdict()
+            self.append(row[self.time_column], **{field: row.get(field, np.nan) for field in self.fields})
+
+    def drop_before(self, cutoff):
+        """Forget rows older than cutoff - O(log n), just moves the start pointer"""
+        keep_from = self.index_at_or_before(cutoff, strict=True) + 1
+        if keep_from > 0:
+            self._start = self._slot(keep_from)
+            self._size -= keep_from
+
+    # ---------- reads ----------
+
+    def index_at_or_before(self, when, strict=False):
+        """Logical index of the newest row with time <= when (< when if strict), or -1"""
+        t = pd.Timestamp(when).value
+        lo, hi = 0, self._size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            mid_t = self._times[self._slot(mid)]
+            if mid_t < t or (mid_t == t and not strict):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo - 1
+
+    def at_or_before(self, when):
+        """Newest row at or before `when` as a dict, or None"""
+        i = self.index_at_or_before(when)
+        return self._row(i) if i >= 0 else None
+
+    def ago(self, delta):
+        """Row at or before (latest time - delta), e.g. ago(timedelta(minutes=15))"""
+        if self.empty:
+            return None
+        return self.at_or_before(self.latest()[self.time_column] - delta)
+
+    def latest(self):
+        return self._row(self._size - 1) if self._size else None
+
+    def first(self):
+        return self._row(0) if self._size else None
+
+    def tail(self, n):
+        """Last n rows, oldest first"""
+        return [self._row(i) for i in range(max(0, self._size - n), self._size)]
+
+    def column(self, field):
+        """One field in time order as a numpy array"""
+        order = self._slot(np.arange(self._size))
+        if field == self.time_column:
+            return self._times[order].astype('datetime64[ns]')
+        return self._values[field][order]
+
+    def to_frame(self):
+        """Whole buffer as a DataFrame (for debugging / export)"""
+        return pd.DataFrame({
+            self.time_column: self.column(self.time_column),
+            **{field: self.column(field) for field in self.fields},
+        })
@@ -0,0 +1,178 @@
+"""
+🌙 Moon Dev's Sentiment Scorer
+Built with love by Moon Dev 🚀
+
+CPU sentiment inference for tweets with the bertweet model. Scores are
+cached by tweet_id in a TimeSeriesStore so a tweet is only ever run through
+the model once. New texts are tokenized in one pass, sorted by length and
+split into dynamic batches capped by total tokens, so short tweets aren't
+padded out to the longest one in the run. Torch threads are pinned to the
+cores we actually have, and the model can optionally run int8-quantized or
+through ONNX Runtime.
+"""
+
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import torch
+from termcolor import cprint
+from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+from src.data.storage import TimeSeriesStore
+
+try:
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+# Scorer settings 🧠
+SENTIMENT_MODEL = "finiteautomata/bertweet-base-sentiment-analysis"
+MAX_LENGTH = 128              # Tokens per tweet (longer ones are truncated)
+MAX_BATCH_TOKENS = 4096       # Padded tokens per forward pass
+MAX_BATCH_SIZE = 64           # Tweets per forward pass
+SCORE_CACHE_DAYS = 7          # Cached scores older than this are dropped
+BACKENDS = ('torch', 'int8', 'onnx')
+
+SCORE_CACHE_SCHEMA = {
+    'scored_at': 'datetime64[ns]',
+    'tweet_id': 'string',
+    'model': 'string',
+    'score': 'float64',
+}
+
+def default_threads():
+    """Intra-op threads - the cores this process may use (env MOONDEV_TORCH_THREADS overrides)"""
+    configured = int(os.getenv('MOONDEV_TORCH_THREADS', '0') or 0)
+    if configured > 0:
+        return configured
+    try:
+        cores = len(os.sched_getaffinity(0))  # Respects container CPU limits
+    except AttributeError:
+        cores = os.cpu_count() or 1
+    return max(1, min(cores, 8))
+
+def length_batches(lengths, max_batch_tokens=MAX_BATCH_TOKENS, max_batch_size=MAX_BATCH_SIZE):
+    """
+    Index batches over texts sorted by token length. A batch closes once
+    adding the next text would push (batch size x longest length) past
+    max_batch_tokens, so every batch pads to roughly its own length.
+    """
+    order = np.argsort(np.asarray(lengths), kind='stable')
+    batches, batch = [], []
+    for i in order:
+        # Sorted ascending - the text being added is the longest in the batch
+        if batch and ((len(batch) + 1) * lengths[i] > max_batch_tokens or len(batch) >= max_batch_size):
+            batches.append(batch)
+            batch = []
+        batch.append(int(i))
+    if batch:
+        batches.append(batch)
+    return batches
+
+class SentimentScorer:
+    """bertweet sentiment (-1 to 1, pos - neg) with a per-tweet score cache"""
+
+    def __init__(self, model_name=SENTIMENT_MODEL, backend='torch', num_threads=None,
+                 max_length=MAX_LENGTH, max_batch_tokens=MAX_BATCH_TOKENS, max_batch_size=MAX_BATCH_SIZE,
+                 cache_days=SCORE_CACHE_DAYS):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown sentiment backend {backend!r}, expected one of {BACKENDS}")
+        if backend == 'onnx' and not ONNX_AVAILABLE:
+            cprint("⚠️ optimum[onnxruntime] not installed - falling back to int8 torch", "yellow")
+            backend = 'int8'
+
+        self.model_name = model_name
+        self.backend = backend
+        self.num_threads = num_threads or default_threads()
+        self.max_length = max_length
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_size = max_batch_size
+        self.cache_days = cache_days
+        self.model_key = f"{model_name}:{backend}"
+        self.tokenizer = None
+        self.model = None
+        self.cache_hits = 0
+        self.scored = 0
+
+        self.store = TimeSeriesStore('sentiment_scores', SCORE_CACHE_SCHEMA, time_column='scored_at')
+        self._scores = self._load_cache()
+
+    def _load_cache(self):
+        """tweet_id -> score for everything scored by this model in the last cache_days"""
+        self.store.drop_before(datetime.now() - timedelta(days=self.cache_days))
+        if self.store.is_empty():
+            return {}
+        cached = self.store.read(columns=['tweet_id', 'model', 'score'])
+        cached = cached[cached['model'] == self.model_key]
+        scores = dict(zip(cached['tweet_id'].astype(str), cached['score'].astype(float)))
+        if scores:
+            cprint(f"📦 Loaded {len(scores)} cached sentiment scores", "cyan")
+        return scores
+
+    def load(self):
+        """Load tokenizer + model once (lazily, on the first tweets that need scoring)"""
+        if self.model is not None:
+            return
+        torch.set_num_threads(self.num_threads)
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            pass  # Already set once torch has started running work
+
+        self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+        if self.backend == 'onnx':
+            self.model = ORTModelForSequenceClassification.from_pretrained(self.model_name, export=True)
+        else:
+            model = AutoModelForSequenceClassification.from_pretrained(self.model_name)
+            model.eval()
+            if self.backend == 'int8':
+                # Dynamic int8 for the Linear layers - most of bertweet's CPU time
+                model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+            self.model = model
+        cprint(f"✨ Sentiment model loaded ({self.backend}, {self.num_threads} threads)", "green")
+
+    def score_texts(self, texts):
+        """Model scores for raw texts (no cache), in input order"""
+        if not texts:
+            return np.array([], dtype='float64')
+        self.load()
+
+        encoded = self.tokenizer(list(texts), truncation=True, max_length=self.max_length)
+        lengths = [len(ids) for ids in encoded['input_ids']]
+        scores = np.empty(len(texts), dtype='float64')
+
+        with torch.inference_mode():
+            for batch in length_batches(lengths, self.max_batch_tokens, self.max_batch_size):
+                features = [{key: encoded[key][i] for key in encoded.keys()} for i in batch]
+                inputs = self.tokenizer.pad(features, padding=True, return_tensors='pt')
+                logits = self.model(**inputs).logits
+                probs = torch.softmax(logits.float(), dim=-1).cpu().numpy()
+                # NEG, NEU, POS
+                scores[batch] = probs[:, 2] - probs[:, 0]
+
+        self.scored += len(texts)
+        return scores
+
+    def score(self, tweet_ids, texts):
+        """Scores for tweets in input order - only tweet_ids not seen before go through the model"""
+        tweet_ids = [str(tweet_id) for tweet_id in tweet_ids]
+        new = {}
+        for tweet_id, text in zip(tweet_ids, texts):
+            if tweet_id not in self._scores and tweet_id not in new:
+                new[tweet_id] = text
+        self.cache_hits += len(tweet_ids) - len(new)
+
+        if new:
+            new_scores = self.score_texts(list(new.values()))
+            self._scores.update(zip(new.keys(), new_scores.tolist()))
+            self.store.append(pd.DataFrame({
+                'scored_at': datetime.now(),
+                'tweet_id': list(new.keys()),
+                'model': self.model_key,
+                'score': new_scores,
+            }))
+
+        return np.array([self._scores[tweet_id] for tweet_id in tweet_ids], dtype='float64')
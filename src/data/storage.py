@@ -0,0 +1,209 @@
+"""
+🌙 Moon Dev's Time Series Storage
+Built with love by Moon Dev 🚀
+
+Typed, time-partitioned storage for the agents' history files. Every
+append writes a small part file into its time partition instead of
+re-serializing the whole history, reads only touch the partitions inside
+the requested range, and old partitions are dropped as whole directories.
+
+Parquet (via pyarrow, memory-mapped reads) is used when it's installed,
+otherwise partitions fall back to plain appendable CSV files.
+"""
+
+import glob
+import os
+import shutil
+import threading
+import time
+import uuid
+import pandas as pd
+from termcolor import cprint
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+# Storage settings 🗄️
+STORE_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'store')
+MAX_PARTS_PER_PARTITION = 32  # Compact a partition once it has this many part files
+
+# Partition frequency -> directory name format
+PARTITION_FORMATS = {
+    'D': '%Y-%m-%d',
+    'M': '%Y-%m',
+}
+
+class TimeSeriesStore:
+    """
+    Append-only, time-partitioned table with a fixed schema.
+
+    schema maps column -> pandas dtype ('datetime64[ns]', 'float64', 'int64',
+    'string', ...). time_column is the column used for partitioning and range
+    reads; set time_unit (e.g. 's') when it holds unix timestamps instead of
+    datetimes. legacy_csv is imported once if the store is still empty.
+    """
+
+    def __init__(self, name, schema, time_column='timestamp', time_unit=None,
+                 partition='D', root=STORE_ROOT, backend=None, legacy_csv=None):
+        self.name = name
+        self.path = os.path.join(root, name)
+        self.schema = dict(schema)
+        self.time_column = time_column
+        self.time_unit = time_unit
+        self.partition_format = PARTITION_FORMATS[partition]
+        self.backend = backend or ('parquet' if PARQUET_AVAILABLE else 'csv')
+        self.ext = '.parquet' if self.backend == 'parquet' else '.csv'
+        self._lock = threading.RLock()
+
+        if legacy_csv and self.is_empty() and os.path.exists(legacy_csv):
+            self._import_legacy_csv(legacy_csv)
+
+    # ---------- helpers ----------
+
+    def _coerce(self, df, columns=None):
+        """Force df onto the schema (or a subset of its columns): missing columns become NA, extras are dropped"""
+        df = df.copy()
+        columns = list(columns) if columns else list(self.schema)
+        for column in columns:
+            dtype = self.schema[column]
+            if column not in df.columns:
+                df[column] = float('nan')
+            if dtype.startswith('datetime'):
+                df[column] = pd.to_datetime(df[column], format='mixed')
+            else:
+                df[column] = df[column].astype(dtype)
+        return df[columns]
+
+    def _times(self, values):
+        """Time column values as datetimes"""
+        if self.time_unit:
+            return pd.to_datetime(values, unit=self.time_unit)
+        return pd.to_datetime(values)
+
+    def _to_time_value(self, when):
+        """Convert a datetime bound into the time column's own representation"""
+        when = pd.Timestamp(when)
+        if self.time_unit:
+            return int(when.timestamp() // pd.Timedelta(1, unit=self.time_unit).total_seconds())
+        return when
+
+    def _partition_key(self, when):
+        return pd.Timestamp(when).strftime(self.partition_format)
+
+    def _partition_dir(self, key):
+        return os.path.join(self.path, f"part={key}")
+
+    def partitions(self):
+        """Sorted partition keys on disk"""
+        if not os.path.isdir(self.path):
+            return []
+        return sorted(
+            entry[len('part='):] for entry in os.listdir(self.path)
+            if entry.startswith('part=')
+        )
+
+    def _files(self, key):
+        return sorted(glob.glob(os.path.join(self._partition_dir(key), f"*{self.ext}")))
+
+    def is_empty(self):
+        return not any(self._files(key) for key in self.partitions())
+
+    def _read_file(self, path, columns=None):
+        if self.backend == 'parquet':
+            return pq.read_table(path, columns=columns, memory_map=True).to_pandas()
+        return pd.read_csv(path, usecols=columns)
+
+    def _write_part(self, key, df):
+        directory = self._partition_dir(key)
+        os.makedirs(directory, exist_ok=True)
+        if self.backend == 'parquet':
+            part = os.path.join(directory, f"part-{time.time_ns()}-{uuid.uuid4().hex[:6]}.parquet")
+            pq.write_table(pa.Table.from_pandas(df, preserve_index=False), part)
+        else:
+            # CSV partitions are a single file we can append to in place
+            part = os.path.join(directory, 'data.csv')
+            df.to_csv(part, mode='a', header=not os.path.exists(part), index=False)
+
+    def _import_legacy_csv(self, legacy_csv):
+        try:
+            df = pd.read_csv(legacy_csv)
+            if not df.empty and self.time_column in df.columns:
+                self.append(df)
+                cprint(f"📦 Imported {len(df)} rows from {os.path.basename(legacy_csv)} into {self.name} store", "cyan")
+        except Exception as e:
+            cprint(f"⚠️ Couldn't import {legacy_csv}: {str(e)}", "yellow")
+
+    # ---------- public API ----------
+
+    def append(self, df):
+        """Append rows - only the part files for the touched partitions are written"""
+        if df is None or len(df) == 0:
+            return
+        df = self._coerce(df)
+        keys = self._times(df[self.time_column]).dt.strftime(self.partition_format)
+        with self._lock:
+            for key, part in df.groupby(keys.values, sort=True):
+                self._write_part(key, part)
+                if self.backend == 'parquet' and len(self._files(key)) >= MAX_PARTS_PER_PARTITION:
+                    self.compact(key)
+
+    def read(self, start=None, end=None, columns=None):
+        """
+        Rows with start <= time <= end (datetime bounds, either optional),
+        sorted by time. Partitions outside the range are never opened.
+        """
+        columns = list(columns) if columns else list(self.schema)
+        if self.time_column not in columns:
+            columns = [self.time_column] + columns
+        start_key = self._partition_key(start) if start is not None else None
+        end_key = self._partition_key(end) if end is not None else None
+
+        frames = []
+        with self._lock:
+            for key in self.partitions():
+                if (start_key and key < start_key) or (end_key and key > end_key):
+                    continue
+                for path in self._files(key):
+                    frames.append(self._read_file(path, columns))
+
+        if not frames:
+            return self._coerce(pd.DataFrame(columns=columns), columns)
+
+        df = self._coerce(pd.concat(frames, ignore_index=True), columns)
+        if start is not None:
+            df = df[df[self.time_column] >= self._to_time_value(start)]
+        if end is not None:
+            df = df[df[self.time_column] <= self._to_time_value(end)]
+        return df.sort_values(self.time_column, kind='stable').reset_index(drop=True)
+
+    def compact(self, key=None):
+        """Merge the part files of one partition (or all of them) into a single file"""
+        with self._lock:
+            for k in ([key] if key else self.partitions()):
+                files = self._files(k)
+                if len(files) <= 1:
+                    continue
+                df = pd.concat([self._read_file(path) for path in files], ignore_index=True)
+                df = self._coerce(df).sort_values(self.time_column, kind='stable')
+                self._write_part(k, df)
+                for path in files:
+                    os.remove(path)
+
+    def drop_before(self, cutoff):
+        """Delete whole partitions that end before cutoff - rows inside the boundary partition stay"""
+        cutoff_key = self._partition_key(cutoff)
+        with self._lock:
+            for key in self.partitions():
+                if key < cutoff_key:
+                    shutil.rmtree(self._partition_dir(key), ignore_errors=True)
+
+    def overwrite(self, df):
+        """Replace the whole store with df"""
+        with self._lock:
+            if os.path.isdir(self.path):
+                shutil.rmtree(self.path)
+            self.append(df)
@@ -0,0 +1,151 @@
+"""
+🌙 Moon Dev's Token Metadata Store
+Built with love by Moon Dev 🚀
+
+Decimals, symbols and creation info never change for a mint, so we look
+them up once and keep them. Entries live in a small SQLite file keyed by
+mint with an in-memory LRU in front, and missing decimals are filled in
+batches through the Solana getMultipleAccounts RPC.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from termcolor import cprint
+
+from src import http_client as http
+
+# Store settings 🗄️
+SOLANA_RPC_URL = "https://api.mainnet-beta.solana.com/"
+METADATA_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'token_metadata.db')
+LRU_SIZE = 1024
+RPC_BATCH_SIZE = 100  # getMultipleAccounts accepts at most 100 pubkeys
+
+class TokenMetadataStore:
+    """Mint -> metadata dict, persisted in SQLite with an LRU cache in front"""
+
+    def __init__(self, db_path=METADATA_DB, lru_size=LRU_SIZE):
+        self.db_path = db_path
+        self.lru_size = lru_size
+        self._lru = OrderedDict()
+        self._lock = threading.RLock()
+        self._conn = None
+
+    def _db(self):
+        """Open the SQLite file on first use"""
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS token_metadata (mint TEXT PRIMARY KEY, data TEXT NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _remember(self, mint, metadata):
+        self._lru[mint] = metadata
+        self._lru.move_to_end(mint)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def get(self, mint):
+        """Return the stored metadata dict for a mint, or None if we've never seen it"""
+        with self._lock:
+            if mint in self._lru:
+                self._lru.move_to_end(mint)
+                return self._lru[mint]
+
+            row = self._db().execute(
+                "SELECT data FROM token_metadata WHERE mint = ?", (mint,)
+            ).fetchone()
+            if row is None:
+                return None
+            metadata = json.loads(row[0])
+            self._remember(mint, metadata)
+            return metadata
+
+    def update(self, mint, **fields):
+        """Merge fields into a mint's metadata and persist it"""
+        self.update_many({mint: fields})
+
+    def update_many(self, updates):
+        """Merge {mint: fields} for many mints in one transaction"""
+        if not updates:
+            return
+        with self._lock:
+            rows = []
+            for mint, fields in updates.items():
+                metadata = dict(self.get(mint) or {})
+                metadata.update({k: v for k, v in fields.items() if v is not None})
+                self._remember(mint, metadata)
+                rows.append((mint, json.dumps(metadata)))
+            db = self._db()
+            db.executemany(
+                "INSERT OR REPLACE INTO token_metadata (mint, data) VALUES (?, ?)", rows
+            )
+            db.commit()
+
+    def get_decimals_many(self, mints):
+        """
+        Return {mint: decimals} for every mint, fetching only the unknown ones.
+
+        Unknown mints are looked up with getMultipleAccounts, RPC_BATCH_SIZE at
+        a time. Mints the RPC can't resolve map to None.
+        """
+        result = {}
+        missing = []
+        for mint in dict.fromkeys(mints):
+            metadata = self.get(mint)
+            if metadata and metadata.get('decimals') is not None:
+                result[mint] = metadata['decimals']
+            else:
+                missing.append(mint)
+
+        for i in range(0, len(missing), RPC_BATCH_SIZE):
+            batch = missing[i:i + RPC_BATCH_SIZE]
+            fetched = _fetch_mint_decimals(batch)
+            self.update_many({mint: {'decimals': decimals} for mint, decimals in fetched.items()})
+            result.update(fetched)
+
+        return {mint: result.get(mint) for mint in mints}
+
+    def get_decimals(self, mint):
+        """Decimals for one mint (memory/disk hit after the first lookup) - raises if the RPC can't resolve it"""
+        decimals = self.get_decimals_many([mint])[mint]
+        if decimals is None:
+            raise ValueError(f"Could not fetch decimals for {mint}")
+        return decimals
+
+def _fetch_mint_decimals(mints):
+    """One getMultipleAccounts round trip -> {mint: decimals} for the mints that resolved"""
+    payload = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "getMultipleAccounts",
+        "params": [
+            mints,
+            {
+                "encoding": "jsonParsed"
+            }
+        ]
+    }
+
+    try:
+        response = http.post(SOLANA_RPC_URL, json=payload)
+        accounts = response.json()['result']['value']
+    except Exception as e:
+        cprint(f"❌ Error fetching mint accounts: {str(e)}", "white", "on_red")
+        return {}
+
+    decimals = {}
+    for mint, account in zip(mints, accounts):
+        try:
+            decimals[mint] = account['data']['parsed']['info']['decimals']
+        except (TypeError, KeyError):
+            cprint(f"⚠️ Could not read decimals for {mint[:8]}", "yellow")
+    return decimals
+
+# Shared store used by nice_funcs
+token_metadata = TokenMetadataStore()
@@ -0,0 +1,164 @@
+"""
+🌙 Moon Dev's Tweet Store
+Built with love by Moon Dev 🚀
+
+Append-only tweet storage for the sentiment agent, in one SQLite file.
+(token, tweet_id) is the primary key, so duplicate tweets are skipped by the
+index on insert instead of by re-reading everything we've collected. Per-token
+row counts are kept in their own table and updated in the same transaction,
+and an index on (token, created_at) lets readers range-scan by tweet time.
+Each token's old {token}_tweets.csv is imported once.
+"""
+
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+from termcolor import cprint
+
+# Tweet store settings 🐦
+TWEET_DB_FILE = "src/data/sentiment/tweets.db"
+TWEET_COLUMNS = ['tweet_id', 'token', 'created_at', 'collection_time', 'user_name', 'user_id',
+                 'text', 'retweet_count', 'favorite_count', 'reply_count', 'quote_count', 'language']
+TWITTER_TIME_FORMAT = '%a %b %d %H:%M:%S %z %Y'  # e.g. "Wed Oct 10 20:19:24 +0000 2018"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tweets (
+    token TEXT NOT NULL,
+    tweet_id TEXT NOT NULL,
+    created_at TEXT,
+    created_ms INTEGER,
+    collection_time TEXT,
+    user_name TEXT,
+    user_id TEXT,
+    text TEXT,
+    retweet_count INTEGER,
+    favorite_count INTEGER,
+    reply_count INTEGER,
+    quote_count INTEGER,
+    language TEXT,
+    PRIMARY KEY (token, tweet_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tweets_by_time ON tweets (token, created_ms);
+CREATE TABLE IF NOT EXISTS tweet_counts (
+    token TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+);
+"""
+
+def _created_ms(values):
+    """Twitter created_at strings (or datetimes) -> ms since epoch, None where unparseable"""
+    values = pd.Series(values, dtype='object')
+    times = pd.to_datetime(values, format=TWITTER_TIME_FORMAT, errors='coerce', utc=True)
+    missing = times.isna() & values.notna()
+    if missing.any():
+        # ISO strings / datetimes from older CSVs
+        times[missing] = pd.to_datetime(values[missing], errors='coerce', utc=True)
+    ms = (times - pd.Timestamp(0, tz='UTC')) // pd.Timedelta(milliseconds=1)  # Unit-agnostic
+    return [int(t) if pd.notna(t) else None for t in ms]
+
+def _to_ms(when):
+    """Datetime bound -> ms since epoch (naive times are taken as UTC)"""
+    when = pd.Timestamp(when)
+    if when.tzinfo is None:
+        when = when.tz_localize('UTC')
+    return int((when - pd.Timestamp(0, tz='UTC')) // pd.Timedelta(milliseconds=1))
+
+class TweetStore:
+    """Deduplicating, append-only tweet table with stored per-token counts"""
+
+    def __init__(self, path=TWEET_DB_FILE, legacy_folder=None):
+        self.path = path
+        self.legacy_folder = legacy_folder
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._checked_legacy = set()
+
+    def _import_legacy_csv(self, token):
+        """Pull {token}_tweets.csv in once, the first time the token is seen with an empty store"""
+        if self.legacy_folder is None or token in self._checked_legacy:
+            return
+        self._checked_legacy.add(token)
+        legacy_csv = os.path.join(self.legacy_folder, f"{token}_tweets.csv")
+        if self.count(token) or not os.path.exists(legacy_csv):
+            return
+        try:
+            df = pd.read_csv(legacy_csv, dtype={'tweet_id': str, 'user_id': str})
+            added = self.add(token, df.to_dict('records'))
+            cprint(f"📦 Imported {added} tweets from {os.path.basename(legacy_csv)} into the tweet store", "cyan")
+        except Exception as e:
+            cprint(f"⚠️ Couldn't import {legacy_csv}: {str(e)}", "yellow")
+
+    def add(self, token, tweets):
+        """Insert tweet dicts for a token, skipping ones already stored; returns how many were new"""
+        self._import_legacy_csv(token)
+        if not tweets:
+            return 0
+
+        created_ms = _created_ms([tweet.get('created_at') for tweet in tweets])
+        rows = [(
+            token,
+            str(tweet['tweet_id']),
+            None if pd.isna(tweet.get('created_at')) else str(tweet.get('created_at')),
+            ms,
+            tweet.get('collection_time'),
+            tweet.get('user_name'),
+            None if pd.isna(tweet.get('user_id')) else str(tweet.get('user_id')),
+            tweet.get('text'),
+            tweet.get('retweet_count'),
+            tweet.get('favorite_count'),
+            tweet.get('reply_count'),
+            tweet.get('quote_count'),
+            tweet.get('language'),
+        ) for tweet, ms in zip(tweets, created_ms)]
+
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO tweets (token, tweet_id, created_at, created_ms, collection_time, "
+                "user_name, user_id, text, retweet_count, favorite_count, reply_count, quote_count, language) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            added = self._conn.total_changes - before
+            if added:
+                self._conn.execute(
+                    "INSERT INTO tweet_counts (token, count) VALUES (?, ?) "
+                    "ON CONFLICT(token) DO UPDATE SET count = count + excluded.count", (token, added))
+        return added
+
+    def count(self, token=None):
+        """Stored tweet count for one token (or all of them) - no table scan"""
+        with self._lock:
+            if token is None:
+                row = self._conn.execute("SELECT COALESCE(SUM(count), 0) FROM tweet_counts").fetchone()
+            else:
+                row = self._conn.execute("SELECT count FROM tweet_counts WHERE token = ?", (token,)).fetchone()
+        return int(row[0]) if row else 0
+
+    def read(self, token, start=None, end=None, columns=None):
+        """Tweets for a token with start <= created_at <= end (either optional), oldest first"""
+        columns = list(columns) if columns else TWEET_COLUMNS
+        unknown = set(columns) - set(TWEET_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown tweet columns: {sorted(unknown)}")
+
+        query = f"SELECT {', '.join(columns)} FROM tweets WHERE token = ?"
+        params = [token]
+        if start is not None:
+            query += " AND created_ms >= ?"
+            params.append(_to_ms(start))
+        if end is not None:
+            query += " AND created_ms <= ?"
+            params.append(_to_ms(end))
+        query += " ORDER BY created_ms"
+
+        with self._lock:
+            return pd.read_sql_query(query, self._conn, params=params)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
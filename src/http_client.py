@@ -0,0 +1,160 @@
+"""
+🌙 Moon Dev's Pooled HTTP Client
+Built with love by Moon Dev 🚀
+
+One keep-alive session shared by all the API helpers so we stop paying a
+fresh TCP+TLS handshake on every call. Handles per-host pool sizes and
+timeouts, retries 429/5xx with backoff + jitter, and keeps request and
+latency stats per endpoint.
+"""
+
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from termcolor import cprint
+
+# Per-host connection settings 🔌
+DEFAULT_POOL_SIZE = 10
+DEFAULT_TIMEOUT = 10  # seconds
+HOST_SETTINGS = {
+    'public-api.birdeye.so': {'pool_size': 20, 'timeout': 10},
+    'api.hyperliquid.xyz': {'pool_size': 10, 'timeout': 10},
+    'api.mainnet-beta.solana.com': {'pool_size': 5, 'timeout': 15},
+}
+
+# Retry settings 🔄
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5  # seconds, doubles every attempt
+BACKOFF_MAX = 8     # seconds
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+_session = None
+_session_lock = threading.Lock()
+_stats = {}
+_stats_lock = threading.Lock()
+
+def get_session():
+    """Return the shared session, creating it (and its per-host pools) on first use"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                default_adapter = HTTPAdapter(pool_connections=DEFAULT_POOL_SIZE, pool_maxsize=DEFAULT_POOL_SIZE)
+                session.mount('https://', default_adapter)
+                session.mount('http://', default_adapter)
+                for host, settings in HOST_SETTINGS.items():
+                    pool_size = settings.get('pool_size', DEFAULT_POOL_SIZE)
+                    session.mount(f'https://{host}', HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size))
+                _session = session
+    return _session
+
+def _endpoint(url):
+    """Stats key for a url - host + path, query string dropped"""
+    parts = urlsplit(url)
+    return f"{parts.netloc}{parts.path}"
+
+def _timeout_for(url):
+    host = urlsplit(url).netloc
+    return HOST_SETTINGS.get(host, {}).get('timeout', DEFAULT_TIMEOUT)
+
+def _backoff_delay(attempt, retry_after=None):
+    """Exponential backoff with full jitter, honouring Retry-After when the server sends it"""
+    if retry_after:
+        try:
+            return min(float(retry_after), BACKOFF_MAX)
+        except ValueError:
+            pass
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+def _record(endpoint, elapsed, ok, retried):
+    with _stats_lock:
+        stats = _stats.setdefault(endpoint, {
+            'requests': 0,
+            'errors': 0,
+            'retries': 0,
+            'total_latency': 0.0,
+            'max_latency': 0.0,
+        })
+        stats['requests'] += 1
+        stats['total_latency'] += elapsed
+        stats['max_latency'] = max(stats['max_latency'], elapsed)
+        if not ok:
+            stats['errors'] += 1
+        if retried:
+            stats['retries'] += 1
+
+def request(method, url, max_retries=MAX_RETRIES, timeout=None, **kwargs):
+    """
+    Send a request through the shared session.
+
+    Retries connection errors and RETRY_STATUS_CODES up to max_retries times.
+    Returns the final requests.Response (which may still be a 429/5xx once
+    retries run out) so callers keep their usual status_code checks.
+    Connection errors on the last attempt are re-raised.
+    """
+    session = get_session()
+    endpoint = _endpoint(url)
+    timeout = timeout if timeout is not None else _timeout_for(url)
+
+    for attempt in range(max_retries + 1):
+        start = time.perf_counter()
+        try:
+            response = session.request(method, url, timeout=timeout, **kwargs)
+        except requests.exceptions.RequestException as e:
+            _record(endpoint, time.perf_counter() - start, False, attempt > 0)
+            if attempt >= max_retries:
+                raise
+            delay = _backoff_delay(attempt)
+            cprint(f"⚠️ {endpoint} request failed ({e}), retrying in {delay:.1f}s...", "yellow")
+            time.sleep(delay)
+            continue
+
+        ok = response.status_code < 400
+        _record(endpoint, time.perf_counter() - start, ok, attempt > 0)
+
+        if response.status_code in RETRY_STATUS_CODES and attempt < max_retries:
+            delay = _backoff_delay(attempt, response.headers.get('Retry-After'))
+            cprint(f"⚠️ {endpoint} returned {response.status_code}, retrying in {delay:.1f}s...", "yellow")
+            time.sleep(delay)
+            continue
+
+        return response
+
+def get(url, **kwargs):
+    """GET through the shared session"""
+    return request('GET', url, **kwargs)
+
+def post(url, **kwargs):
+    """POST through the shared session"""
+    return request('POST', url, **kwargs)
+
+def get_stats():
+    """Snapshot of per-endpoint stats with average latency filled in"""
+    with _stats_lock:
+        snapshot = {}
+        for endpoint, stats in _stats.items():
+            entry = dict(stats)
+            entry['avg_latency'] = stats['total_latency'] / stats['requests'] if stats['requests'] else 0.0
+            snapshot[endpoint] = entry
+        return snapshot
+
+def reset_stats():
+    """Clear all collected stats"""
+    with _stats_lock:
+        _stats.clear()
+
+def print_stats():
+    """Print a small table of request counts and latency per endpoint"""
+    stats = get_stats()
+    if not stats:
+        print("📡 No HTTP requests recorded yet")
+        return
+    cprint("\n📡 Moon Dev's HTTP Stats", "white", "on_blue")
+    for endpoint, s in sorted(stats.items(), key=lambda item: -item[1]['requests']):
+        print(f"  • {endpoint}: {s['requests']} reqs | {s['errors']} errors | {s['retries']} retries | "
+              f"avg {s['avg_latency'] * 1000:.0f}ms | max {s['max_latency'] * 1000:.0f}ms")
@@ -7,8 +7,6 @@ import os
 import sys
 from termcolor import cprint
 from dotenv import load_dotenv
-import time
-from datetime import datetime, timedelta
 from config import *
 
 # Add project root to Python path
@@ -21,6 +19,7 @@ from src.agents.risk_agent import RiskAgent
 from src.agents.strategy_agent import StrategyAgent
 from src.agents.copybot_agent import CopyBotAgent
 from src.agents.sentiment_agent import SentimentAgent
+from src.scheduler import AgentScheduler
 
 # Load environment variables
 load_dotenv()
@@ -37,61 +36,72 @@ ACTIVE_AGENTS = {
     # 'portfolio': False,  # Future portfolio optimization agent
 }
 
+# Per-agent cadence ⏱️ (minutes) - lower priority number starts first.
+# Risk preempts: while it runs no lower-priority agent is started.
+AGENT_SCHEDULE = {
+    'risk': {'interval_minutes': 5, 'priority': 0, 'deadline_minutes': 2, 'preempts': True},
+    'trading': {'interval_minutes': SLEEP_BETWEEN_RUNS_MINUTES, 'priority': 10, 'deadline_minutes': 10},
+    'strategy': {'interval_minutes': SLEEP_BETWEEN_RUNS_MINUTES, 'priority': 10, 'deadline_minutes': 10},
+    'copybot': {'interval_minutes': SLEEP_BETWEEN_RUNS_MINUTES, 'priority': 20, 'deadline_minutes': 10},
+    'sentiment': {'interval_minutes': SLEEP_BETWEEN_RUNS_MINUTES, 'priority': 30, 'deadline_minutes': 10},
+}
+
+def run_risk(risk_agent):
+    cprint("\n🛡️ Running Risk Management...", "cyan")
+    risk_agent.run()
+
+def run_trading(trading_agent):
+    cprint("\n🤖 Running Trading Analysis...", "cyan")
+    trading_agent.run()
+
+def run_strategy(strategy_agent):
+    cprint("\n📊 Running Strategy Analysis...", "cyan")
+    for token in MONITORED_TOKENS:
+        if token not in EXCLUDED_TOKENS:  # Skip USDC and other excluded tokens
+            cprint(f"\n🔍 Analyzing {token}...", "cyan")
+            strategy_agent.get_signals(token)
+
+def run_copybot(copybot_agent):
+    cprint("\n🤖 Running CopyBot Portfolio Analysis...", "cyan")
+    copybot_agent.run_analysis_cycle()
+
+def run_sentiment(sentiment_agent):
+    cprint("\n🎭 Running Sentiment Analysis...", "cyan")
+    sentiment_agent.run()
+
+AGENT_RUNNERS = {
+    'risk': (RiskAgent, run_risk),
+    'trading': (TradingAgent, run_trading),
+    'strategy': (StrategyAgent, run_strategy),
+    'copybot': (CopyBotAgent, run_copybot),
+    'sentiment': (SentimentAgent, run_sentiment),
+}
+
 def run_agents():
-    """Run all active agents in sequence"""
+    """Run all active agents, each on its own schedule"""
+    scheduler = AgentScheduler()
     try:
         # Initialize active agents
-        trading_agent = TradingAgent() if ACTIVE_AGENTS['trading'] else None
-        risk_agent = RiskAgent() if ACTIVE_AGENTS['risk'] else None
-        strategy_agent = StrategyAgent() if ACTIVE_AGENTS['strategy'] else None
-        copybot_agent = CopyBotAgent() if ACTIVE_AGENTS['copybot'] else None
-        sentiment_agent = SentimentAgent() if ACTIVE_AGENTS['sentiment'] else None
-
-        while True:
-            try:
-                # Run Risk Management
-                if risk_agent:
-                    cprint("\n🛡️ Running Risk Management...", "cyan")
-                    risk_agent.run()
-
-                # Run Trading Analysis
-                if trading_agent:
-                    cprint("\n🤖 Running Trading Analysis...", "cyan")
-                    trading_agent.run()
-
-                # Run Strategy Analysis
-                if strategy_agent:
-                    cprint("\n📊 Running Strategy Analysis...", "cyan")
-                    for token in MONITORED_TOKENS:
-                        if token not in EXCLUDED_TOKENS:  # Skip USDC and other excluded tokens
-                            cprint(f"\n🔍 Analyzing {token}...", "cyan")
-                            strategy_agent.get_signals(token)
-
-                # Run CopyBot Analysis
-                if copybot_agent:
-                    cprint("\n🤖 Running CopyBot Portfolio Analysis...", "cyan")
-                    copybot_agent.run_analysis_cycle()
-
-                # Run Sentiment Analysis
-                if sentiment_agent:
-                    cprint("\n🎭 Running Sentiment Analysis...", "cyan")
-                    sentiment_agent.run()
-
-                # Sleep until next cycle
-                next_run = datetime.now() + timedelta(minutes=SLEEP_BETWEEN_RUNS_MINUTES)
-                cprint(f"\n😴 Sleeping until {next_run.strftime('%H:%M:%S')}", "cyan")
-                time.sleep(60 * SLEEP_BETWEEN_RUNS_MINUTES)
-
-            except Exception as e:
-                cprint(f"\n❌ Error running agents: {str(e)}", "red")
-                cprint("🔄 Continuing to next cycle...", "yellow")
-                time.sleep(60)  # Sleep for 1 minute on error before retrying
+        for name, (agent_class, runner) in AGENT_RUNNERS.items():
+            if not ACTIVE_AGENTS.get(name):
+                continue
+            agent = agent_class()
+            scheduler.add(name, lambda agent=agent, runner=runner: runner(agent), **AGENT_SCHEDULE[name])
+
+        if not scheduler.jobs:
+            cprint("\n😴 No agents active - flip one on in ACTIVE_AGENTS", "yellow")
+            return
+
+        scheduler.run_forever()
 
     except KeyboardInterrupt:
         cprint("\n👋 Gracefully shutting down...", "yellow")
+        scheduler.print_metrics()
     except Exception as e:
         cprint(f"\n❌ Fatal error in main loop: {str(e)}", "red")
         raise
+    finally:
+        scheduler.shutdown()
 
 if __name__ == "__main__":
     cprint("\n🌙 Moon Dev AI Agent Trading System Starting...", "white", "on_blue")
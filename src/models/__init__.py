@@ -10,6 +10,7 @@ from .openai_model import OpenAIModel
 from .gemini_model import GeminiModel
 from .deepseek_model import DeepSeekModel
 from .model_factory import model_factory
+from .response_cache import response_cache, cacheable
 
 __all__ = [
     'BaseModel',
@@ -19,5 +20,7 @@ __all__ = [
     'OpenAIModel',
     'GeminiModel',
     'DeepSeekModel',
-    'model_factory'
+    'model_factory',
+    'response_cache',
+    'cacheable'
 ] 
\ No newline at end of file
@@ -34,19 +34,25 @@ class BaseModel(ABC):
         pass
     
     def generate_response(self, system_prompt, user_content, temperature=0.7, max_tokens=None):
-        """Generate a response from the model with no caching"""
+        """
+        Generate a response from the model.
+
+        Subclasses wrap this with @cacheable (models/response_cache.py) so
+        callers can pass cache=True to reuse identical earlier answers.
+        """
         try:
-            # Add random nonce to prevent caching
+            # Add random nonce so the provider never replays an old answer
             nonce = f"_{random.randint(1, 1000000)}"
             current_time = int(time.time())
             
-            # Each request will be unique
+            # Each request will be unique - only the user content changes, so the
+            # static system prompt stays a stable prefix for provider-side prompt caching
             unique_content = f"{user_content}_{nonce}_{current_time}"
             
             response = self.client.chat.completions.create(
                 model=self.model_name,
                 messages=[
-                    {"role": "system", "content": f"{system_prompt}_{current_time}"},
+                    {"role": "system", "content": system_prompt},
                     {"role": "user", "content": unique_content}
                 ],
                 temperature=temperature,
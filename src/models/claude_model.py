@@ -6,6 +6,7 @@ Built with love by Moon Dev 🚀
 from anthropic import Anthropic
 from termcolor import cprint
 from .base_model import BaseModel, ModelResponse
+from .response_cache import cacheable, anthropic_system
 
 class ClaudeModel(BaseModel):
     """Implementation for Anthropic's Claude models"""
@@ -29,6 +30,7 @@ class ClaudeModel(BaseModel):
             cprint(f"❌ Failed to initialize Claude model: {str(e)}", "red")
             self.client = None
     
+    @cacheable
     def generate_response(self, 
         system_prompt: str,
         user_content: str,
@@ -42,7 +44,7 @@ class ClaudeModel(BaseModel):
                 model=self.model_name,
                 max_tokens=max_tokens,
                 temperature=temperature,
-                system=system_prompt,
+                system=anthropic_system(system_prompt),  # Long static prompts get provider-side caching
                 messages=[
                     {"role": "user", "content": user_content}
                 ]
@@ -52,7 +54,10 @@ class ClaudeModel(BaseModel):
                 content=response.content[0].text.strip(),
                 raw_response=response,
                 model_name=self.model_name,
-                usage={"completion_tokens": response.usage.output_tokens}
+                usage={
+                    "completion_tokens": response.usage.output_tokens,
+                    "cache_read_input_tokens": getattr(response.usage, 'cache_read_input_tokens', None)
+                }
             )
             
         except Exception as e:
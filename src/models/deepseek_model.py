@@ -6,6 +6,7 @@ Built with love by Moon Dev 🚀
 from openai import OpenAI
 from termcolor import cprint
 from .base_model import BaseModel, ModelResponse
+from .response_cache import cacheable
 
 class DeepSeekModel(BaseModel):
     """Implementation for DeepSeek's models"""
@@ -33,6 +34,7 @@ class DeepSeekModel(BaseModel):
             cprint(f"❌ Failed to initialize DeepSeek model: {str(e)}", "red")
             self.client = None
     
+    @cacheable
     def generate_response(self, 
         system_prompt: str,
         user_content: str,
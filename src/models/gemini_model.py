@@ -6,6 +6,7 @@ Built with love by Moon Dev 🚀
 import google.generativeai as genai
 from termcolor import cprint
 from .base_model import BaseModel, ModelResponse
+from .response_cache import cacheable
 
 class GeminiModel(BaseModel):
     """Implementation for Google's Gemini models"""
@@ -29,6 +30,7 @@ class GeminiModel(BaseModel):
             cprint(f"❌ Failed to initialize Gemini model: {str(e)}", "red")
             self.client = None
     
+    @cacheable
     def generate_response(self, 
         system_prompt: str,
         user_content: str,
@@ -6,6 +6,7 @@ Built with love by Moon Dev 🚀
 from groq import Groq
 from termcolor import cprint
 from .base_model import BaseModel, ModelResponse
+from .response_cache import cacheable
 import time
 
 class GroqModel(BaseModel):
@@ -179,6 +180,7 @@ class GroqModel(BaseModel):
             self.client = None
             raise
     
+    @cacheable
     def generate_response(self, system_prompt, user_content, temperature=0.7, max_tokens=None):
         """Generate response with no caching"""
         try:
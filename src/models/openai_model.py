@@ -6,6 +6,7 @@ Built with love by Moon Dev 🚀
 from openai import OpenAI
 from termcolor import cprint
 from .base_model import BaseModel, ModelResponse
+from .response_cache import cacheable
 
 class OpenAIModel(BaseModel):
     """Implementation for OpenAI's models"""
@@ -39,6 +40,7 @@ class OpenAIModel(BaseModel):
             cprint(f"❌ Failed to initialize OpenAI model: {str(e)}", "red")
             self.client = None
     
+    @cacheable
     def generate_response(self, system_prompt, user_content, **kwargs):
         """Generate a response using the OpenAI model"""
         try:
@@ -0,0 +1,173 @@
+"""
+🌙 Moon Dev's LLM Response Cache
+Built with love by Moon Dev 🚀
+
+Opt-in, content-addressed cache for LLM responses. Identical requests
+(same model, system prompt, user content, temperature, max tokens) are
+answered from a small SQLite file instead of another API round trip.
+Entries expire after a TTL and the least recently used ones are evicted
+once the cache is full.
+
+Also has the helper for provider-side prompt caching of big static system
+prompts (Anthropic cache_control blocks).
+"""
+
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from termcolor import cprint
+
+from .base_model import ModelResponse
+
+# Cache settings 🗄️
+RESPONSE_CACHE_DB = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'llm_response_cache.db')
+DEFAULT_CACHE_TTL = 15 * 60   # seconds - one agent cycle
+MAX_CACHE_ENTRIES = 2000      # LRU eviction above this
+PROMPT_CACHE_MIN_CHARS = 1000  # Only mark system prompts this long for provider caching (Anthropic ignores blocks under its minimum anyway)
+
+def make_key(model_name, system_prompt, user_content, temperature=None, max_tokens=None):
+    """Content address for one request"""
+    payload = json.dumps(
+        [model_name, system_prompt, user_content, temperature, max_tokens],
+        sort_keys=True, default=str,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class ResponseCache:
+    """SQLite-backed response cache with TTL + LRU eviction"""
+
+    def __init__(self, db_path=RESPONSE_CACHE_DB, max_entries=MAX_CACHE_ENTRIES):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _db(self):
+        """Open the SQLite file on first use"""
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, content TEXT NOT NULL, model_name TEXT, usage TEXT, "
+                "expires_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key):
+        """Cached ModelResponse for key, or None if missing/expired"""
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            row = db.execute(
+                "SELECT content, model_name, usage, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[3] < now:
+                if row is not None:
+                    db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    db.commit()
+                self.misses += 1
+                return None
+            db.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            db.commit()
+            self.hits += 1
+        content, model_name, usage, _ = row
+        return ModelResponse(
+            content=content,
+            raw_response=None,
+            model_name=model_name,
+            usage=json.loads(usage) if usage else None,
+        )
+
+    def put(self, key, content, model_name=None, usage=None, ttl=DEFAULT_CACHE_TTL):
+        """Store a response, evicting expired and least recently used entries"""
+        if content is None:
+            return
+        now = time.time()
+        try:
+            usage_json = json.dumps(usage, default=str) if usage is not None else None
+        except (TypeError, ValueError):
+            usage_json = None
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO responses (key, content, model_name, usage, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, content, model_name, usage_json, now + ttl, now),
+            )
+            db.execute("DELETE FROM responses WHERE expires_at < ?", (now,))
+            db.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._db().execute("DELETE FROM responses")
+            self._db().commit()
+
+def _content_of(response):
+    """Text of whatever a model returned (ModelResponse, chat message, or str)"""
+    if response is None:
+        return None
+    if isinstance(response, str):
+        return response
+    return getattr(response, 'content', None)
+
+def cacheable(generate):
+    """
+    Decorator for generate_response: adds per-call `cache=False` and
+    `cache_ttl=DEFAULT_CACHE_TTL` keyword arguments. With cache=True an
+    identical earlier request is answered from response_cache, and both hits
+    and misses come back as a ModelResponse (raw_response is None on a hit).
+    """
+    @functools.wraps(generate)
+    def wrapper(self, system_prompt, user_content, *args, cache=False, cache_ttl=DEFAULT_CACHE_TTL, **kwargs):
+        if not cache:
+            return generate(self, system_prompt, user_content, *args, **kwargs)
+
+        model_name = getattr(self, 'model_name', type(self).__name__)
+        temperature = kwargs.get('temperature', args[0] if args else None)
+        max_tokens = kwargs.get('max_tokens', args[1] if len(args) > 1 else None)
+        key = make_key(model_name, system_prompt, user_content, temperature, max_tokens)
+        cached = response_cache.get(key)
+        if cached is not None:
+            cprint(f"⚡ LLM cache hit for {model_name}", "cyan")
+            return cached
+
+        response = generate(self, system_prompt, user_content, *args, **kwargs)
+        content = _content_of(response)
+        if content is None:
+            return response
+        if not isinstance(response, ModelResponse):
+            # e.g. a chat message from the OpenAI-style models - same shape as a cache hit
+            response = ModelResponse(content=content, raw_response=response, model_name=model_name,
+                                     usage=getattr(response, 'usage', None))
+        response_cache.put(key, content, model_name, response.usage, cache_ttl)
+        return response
+    return wrapper
+
+def anthropic_system(system_prompt):
+    """
+    System parameter for Anthropic messages.create - long static prompts are
+    sent as a cache_control block so the provider can reuse the prefix.
+    """
+    if not system_prompt or len(system_prompt) < PROMPT_CACHE_MIN_CHARS:
+        return system_prompt
+    return [{
+        "type": "text",
+        "text": system_prompt,
+        "cache_control": {"type": "ephemeral"},
+    }]
+
+# Shared cache used by the models and agents
+response_cache = ResponseCache()
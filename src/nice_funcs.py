@@ -4,6 +4,9 @@ Built with love by Moon Dev 🚀
 """
 
 from src.config import *
+from src import http_client as http
+from src.data.token_metadata import token_metadata
+from src.data.ohlcv_store import OHLCVStore
 import requests
 import pandas as pd
 import pprint
@@ -19,8 +22,7 @@ from datetime import datetime, timedelta
 from termcolor import colored, cprint
 import solders
 from dotenv import load_dotenv
-import shutil
-import atexit
+import threading
 
 # Load environment variables
 load_dotenv()
@@ -34,15 +36,16 @@ sample_address = "2yXTyarttn2pTZ6cwt4DqmrRuBw1G7pmFv9oT6MStdKP"
 
 BASE_URL = "https://public-api.birdeye.so/defi"
 
-# Create temp directory and register cleanup
-os.makedirs('temp_data', exist_ok=True)
+# Wallet holdings snapshot cache 💼
+WALLET_CACHE_TTL = 30  # Seconds a holdings snapshot is reused before re-downloading
+_wallet_cache = {}
+_wallet_cache_lock = threading.Lock()
 
-def cleanup_temp_data():
-    if os.path.exists('temp_data'):
-        print("🧹 Moon Dev cleaning up temporary data...")
-        shutil.rmtree('temp_data')
-
-atexit.register(cleanup_temp_data)
+# Token price cache 💲
+PRICE_CACHE_TTL = 5  # Seconds a fetched price is reused
+MULTI_PRICE_BATCH = 100  # Max mints per Birdeye multi_price request
+_price_cache = {}  # mint -> (fetched_at, price)
+_price_cache_lock = threading.Lock()
 
 # Custom function to print JSON in a human-readable format
 def print_pretty_json(data):
@@ -66,12 +69,15 @@ def token_overview(address):
     overview_url = f"{BASE_URL}/token_overview?address={address}"
     headers = {"X-API-KEY": BIRDEYE_API_KEY}
 
-    response = requests.get(overview_url, headers=headers)
+    response = http.get(overview_url, headers=headers)
     result = {}
 
     if response.status_code == 200:
         overview_data = response.json().get('data', {})
 
+        # Remember symbol/name in the metadata store
+        token_metadata.update(address, symbol=overview_data.get('symbol'), name=overview_data.get('name'))
+
         # Retrieve buy1h, sell1h, and calculate trade1h
         buy1h = overview_data.get('buy1h', 0)
         sell1h = overview_data.get('sell1h', 0)
@@ -187,7 +193,7 @@ def token_security_info(address):
     headers = {"X-API-KEY": BIRDEYE_API_KEY}
 
     # Sending a GET request to the API
-    response = requests.get(url, headers=headers)
+    response = http.get(url, headers=headers)
 
     if response.status_code == 200:
         # Parse the JSON response
@@ -213,14 +219,24 @@ def token_creation_info(address):
     headers = {"X-API-KEY": BIRDEYE_API_KEY}
 
     # Sending a GET request to the API
-    response = requests.get(url, headers=headers)
+    response = http.get(url, headers=headers)
 
     if response.status_code == 200:
         # Parse the JSON response
         creation_data = response.json()['data']
         print_pretty_json(creation_data)
+
+        # Keep it in the metadata store - creation info never changes
+        if creation_data:
+            token_metadata.update(
+                address,
+                decimals=creation_data.get('decimals'),
+                creation_info=creation_data
+            )
+        return creation_data
     else:
         print("Failed to retrieve token creation info:", response.status_code)
+        return None
 
 def market_buy(token, amount, slippage):
     import requests
@@ -262,6 +278,7 @@ def market_buy(token, amount, slippage):
     tx = VersionedTransaction(tx1.message, [KEY])
     txId = http_client.send_raw_transaction(bytes(tx), TxOpts(skip_preflight=True)).value
     print(f"https://solscan.io/tx/{str(txId)}")
+    invalidate_wallet_cache()  # Holdings changed - next read must hit Birdeye
 
 
 
@@ -307,6 +324,7 @@ def market_sell(QUOTE_TOKEN, amount, slippage):
     #print(tx)
     txId = http_client.send_raw_transaction(bytes(tx), TxOpts(skip_preflight=True)).value
     print(f"https://solscan.io/tx/{str(txId)}")
+    invalidate_wallet_cache()  # Holdings changed - next read must hit Birdeye
 
 
 
@@ -336,91 +354,90 @@ def get_time_range(days_back):
 
     return time_from, time_to
 
-def get_data(address, days_back_4_data, timeframe):
-    time_from, time_to = get_time_range(days_back_4_data)
-
-    # Check temp data first
-    temp_file = f"temp_data/{address}_latest.csv"
-    if os.path.exists(temp_file):
-        print(f"📂 Moon Dev found cached data for {address[:4]}")
-        return pd.read_csv(temp_file)
-
-    url = f"https://public-api.birdeye.so/defi/ohlcv?address={address}&type={timeframe}&time_from={time_from}&time_to={time_to}"
+def _fetch_birdeye_ohlcv(address, timeframe, time_from, time_to):
+    """Raw Birdeye OHLCV items for a time range, or None if the request failed"""
+    url = f"{BASE_URL}/ohlcv?address={address}&type={timeframe}&time_from={time_from}&time_to={time_to}"
 
     headers = {"X-API-KEY": BIRDEYE_API_KEY}
-    response = requests.get(url, headers=headers)
+    response = http.get(url, headers=headers)
     if response.status_code == 200:
         json_response = response.json()
-        items = json_response.get('data', {}).get('items', [])
-
-        processed_data = [{
-            'Datetime (UTC)': datetime.utcfromtimestamp(item['unixTime']).strftime('%Y-%m-%d %H:%M:%S'),
-            'Open': item['o'],
-            'High': item['h'],
-            'Low': item['l'],
-            'Close': item['c'],
-            'Volume': item['v']
-        } for item in items]
-
-        df = pd.DataFrame(processed_data)
-
-        # Remove any rows with dates far in the future
-        current_date = datetime.now()
-        df['datetime_obj'] = pd.to_datetime(df['Datetime (UTC)'])
-        df = df[df['datetime_obj'] <= current_date]
-        df = df.drop('datetime_obj', axis=1)
-
-        # Pad if needed
-        if len(df) < 40:
-            print(f"🌙 MoonDev Alert: Padding data to ensure minimum 40 rows for analysis! 🚀")
-            rows_to_add = 40 - len(df)
-            first_row_replicated = pd.concat([df.iloc[0:1]] * rows_to_add, ignore_index=True)
-            df = pd.concat([first_row_replicated, df], ignore_index=True)
-
-        print(f"📊 MoonDev's Data Analysis Ready! Processing {len(df)} candles... 🎯")
-
-        # Always save to temp for current run
-        df.to_csv(temp_file)
-        print(f"🔄 Moon Dev cached data for {address[:4]}")
-
-        # Calculate indicators
-        df['MA20'] = ta.sma(df['Close'], length=20)
-        df['RSI'] = ta.rsi(df['Close'], length=14)
-        df['MA40'] = ta.sma(df['Close'], length=40)
-
-        df['Price_above_MA20'] = df['Close'] > df['MA20']
-        df['Price_above_MA40'] = df['Close'] > df['MA40']
-        df['MA20_above_MA40'] = df['MA20'] > df['MA40']
-
-        return df
-    else:
-        print(f"❌ MoonDev Error: Failed to fetch data for address {address}. Status code: {response.status_code}")
-        if response.status_code == 401:
-            print("🔑 Check your BIRDEYE_API_KEY in .env file!")
+        return (json_response.get('data') or {}).get('items') or []
+
+    print(f"❌ MoonDev Error: Failed to fetch data for address {address}. Status code: {response.status_code}")
+    if response.status_code == 401:
+        print("🔑 Check your BIRDEYE_API_KEY in .env file!")
+    return None
+
+# Persistent candle store - only bars newer than the last stored one are downloaded
+ohlcv_store = OHLCVStore(_fetch_birdeye_ohlcv)
+
+def get_data(address, days_back_4_data, timeframe):
+    time_from, time_to = get_time_range(days_back_4_data)
+
+    # Served from the (mint, timeframe) candle store, which syncs new bars first
+    candles = ohlcv_store.get_window(address, timeframe, time_from, time_to)
+    if candles is None:
         return pd.DataFrame()
 
+    df = pd.DataFrame({
+        'Datetime (UTC)': pd.to_datetime(candles['unixTime'].astype('int64'), unit='s').dt.strftime('%Y-%m-%d %H:%M:%S'),
+        'Open': candles['o'],
+        'High': candles['h'],
+        'Low': candles['l'],
+        'Close': candles['c'],
+        'Volume': candles['v']
+    })
 
+    # Pad if needed
+    if len(df) < 40:
+        print(f"🌙 MoonDev Alert: Padding data to ensure minimum 40 rows for analysis! 🚀")
+        rows_to_add = 40 - len(df)
+        first_row_replicated = pd.concat([df.iloc[0:1]] * rows_to_add, ignore_index=True)
+        df = pd.concat([first_row_replicated, df], ignore_index=True)
 
-def fetch_wallet_holdings_og(address):
+    print(f"📊 MoonDev's Data Analysis Ready! Processing {len(df)} candles... 🎯")
+
+    # Calculate indicators
+    df['MA20'] = ta.sma(df['Close'], length=20)
+    df['RSI'] = ta.rsi(df['Close'], length=14)
+    df['MA40'] = ta.sma(df['Close'], length=40)
+
+    df['Price_above_MA20'] = df['Close'] > df['MA20']
+    df['Price_above_MA40'] = df['Close'] > df['MA40']
+    df['MA20_above_MA40'] = df['MA20'] > df['MA40']
+
+    return df
+
+
+
+def _fetch_wallet_holdings(address):
+    """Download the full wallet token list from Birdeye - returns (df, ok)"""
 
     API_KEY = BIRDEYE_API_KEY  # Assume this is your API key; replace it with the actual one
 
     # Initialize an empty DataFrame
     df = pd.DataFrame(columns=['Mint Address', 'Amount', 'USD Value'])
+    ok = False
 
     url = f"https://public-api.birdeye.so/v1/wallet/token_list?wallet={address}"
     headers = {"x-chain": "solana", "X-API-KEY": API_KEY}
-    response = requests.get(url, headers=headers)
+    response = http.get(url, headers=headers)
 
     if response.status_code == 200:
         json_response = response.json()
 
         if 'data' in json_response and 'items' in json_response['data']:
-            df = pd.DataFrame(json_response['data']['items'])
-            df = df[['address', 'uiAmount', 'valueUsd']]
-            df = df.rename(columns={'address': 'Mint Address', 'uiAmount': 'Amount', 'valueUsd': 'USD Value'})
-            df = df.dropna()
-            df = df[df['USD Value'] > 0.05]
+            ok = True
+            items = json_response['data']['items']
+            if items:
+                df = pd.DataFrame(items)
+                df = df[['address', 'uiAmount', 'valueUsd']]
+                df = df.rename(columns={'address': 'Mint Address', 'uiAmount': 'Amount', 'valueUsd': 'USD Value'})
+                df = df.dropna()
+                df = df[df['USD Value'] > 0.05]
+                df['Mint Address'] = df['Mint Address'].astype(str)
+                df = df.reset_index(drop=True)
         else:
             cprint("No data available in the response.", 'white', 'on_red')
 
@@ -439,30 +456,115 @@ def fetch_wallet_holdings_og(address):
         # If the DataFrame is empty, print a message or handle it as needed
         cprint("No wallet holdings to display.", 'white', 'on_red')
 
-    return df
+    return df, ok
+
+def get_wallet_snapshot(address, max_age=WALLET_CACHE_TTL):
+    """
+    Get a cached holdings snapshot for a wallet 💼
+
+    Returns a dict with 'time', 'df' (the holdings DataFrame) and 'index'
+    (mint address -> row position) so per-mint lookups are O(1). The wallet
+    is only re-downloaded once the snapshot is older than max_age seconds or
+    after invalidate_wallet_cache() (every market_buy/market_sell calls it).
+    Failed downloads are never cached.
+    """
+    with _wallet_cache_lock:
+        snapshot = _wallet_cache.get(address)
+    if snapshot and time.time() - snapshot['time'] < max_age:
+        return snapshot
+
+    df, ok = _fetch_wallet_holdings(address)
+    snapshot = {
+        'time': time.time(),
+        'df': df,
+        'index': {mint: i for i, mint in enumerate(df['Mint Address'])},
+    }
+    if ok:
+        with _wallet_cache_lock:
+            _wallet_cache[address] = snapshot
+    return snapshot
+
+def invalidate_wallet_cache(address=None):
+    """Drop the cached holdings for one wallet (or all wallets) so the next read hits Birdeye"""
+    with _wallet_cache_lock:
+        if address is None:
+            _wallet_cache.clear()
+        else:
+            _wallet_cache.pop(address, None)
+
+def get_wallet_token(address, token_mint_address):
+    """O(1) lookup of (amount, usd_value) for one mint from the holdings snapshot, or None if not held"""
+    snapshot = get_wallet_snapshot(address)
+    i = snapshot['index'].get(token_mint_address)
+    if i is None:
+        return None
+    row = snapshot['df'].iloc[i]
+    return float(row['Amount']), float(row['USD Value'])
+
+def fetch_wallet_holdings_og(address):
+    """Get all wallet holdings as a DataFrame (served from the snapshot cache)"""
+    return get_wallet_snapshot(address)['df'].copy()
 
 def fetch_wallet_token_single(address, token_mint_address):
 
-    df = fetch_wallet_holdings_og(address)
+    snapshot = get_wallet_snapshot(address)
+    df = snapshot['df']
 
-    # filter by token mint address
-    df = df[df['Mint Address'] == token_mint_address]
+    # look up the token mint address in the snapshot index
+    i = snapshot['index'].get(token_mint_address)
+    if i is None:
+        return df.iloc[0:0].copy()
 
-    return df
+    return df.iloc[[i]].copy()
 
 
-def token_price(address):
-    url = f"https://public-api.birdeye.so/defi/price?address={address}"
-    headers = {"X-API-KEY": BIRDEYE_API_KEY}
-    response = requests.get(url, headers=headers)
-    price_data = response.json()
+def token_prices(addresses, max_age=PRICE_CACHE_TTL):
+    """
+    Get USD prices for many mints at once 💲
 
-    print(price_data)
+    Cached prices younger than max_age seconds are served from memory, the rest
+    are fetched through Birdeye's multi_price endpoint (MULTI_PRICE_BATCH mints
+    per request) and stored in the price cache. Returns {address: price or None}.
+    """
+    now = time.time()
+    prices = {}
+    missing = []
+    with _price_cache_lock:
+        for token in dict.fromkeys(addresses):
+            cached = _price_cache.get(token)
+            if cached and now - cached[0] < max_age:
+                prices[token] = cached[1]
+            else:
+                missing.append(token)
 
-    if price_data['success']:
-        return price_data['data']['value']
-    else:
-        return None
+    headers = {"X-API-KEY": BIRDEYE_API_KEY}
+    for i in range(0, len(missing), MULTI_PRICE_BATCH):
+        batch = missing[i:i + MULTI_PRICE_BATCH]
+        url = f"{BASE_URL}/multi_price?list_address={','.join(batch)}"
+        response = http.get(url, headers=headers)
+        if response.status_code != 200:
+            print(f"❌ Failed to fetch prices for {len(batch)} tokens: HTTP {response.status_code}")
+            continue
+
+        price_data = response.json()
+        if not price_data.get('success'):
+            print(f"❌ Birdeye returned no prices for {len(batch)} tokens")
+            continue
+
+        fetched_at = time.time()
+        data = price_data.get('data') or {}
+        with _price_cache_lock:
+            for token in batch:
+                value = (data.get(token) or {}).get('value')
+                if value is not None:
+                    _price_cache[token] = (fetched_at, value)
+                    prices[token] = value
+
+    return {token: prices.get(token) for token in addresses}
+
+def token_price(address):
+    """Get the USD price for one mint (cache lookup, falls back to a multi_price fetch)"""
+    return token_prices([address])[address]
     
 # price = token_price('2zMMhcVQEXDtdE6vsFS7S7D5oUodfJHE8vd1gnBouauv')
 # print(price)
@@ -471,75 +573,39 @@ def token_price(address):
 
 def get_position(token_mint_address):
     """
-    Fetches the balance of a specific token given its mint address from a DataFrame.
+    Fetches the balance of a specific token given its mint address from the wallet snapshot.
 
     Parameters:
-    - dataframe: A pandas DataFrame containing token balances with columns ['Mint Address', 'Amount'].
     - token_mint_address: The mint address of the token to find the balance for.
 
     Returns:
-    - The balance of the specified token if found, otherwise a message indicating the token is not in the wallet.
+    - The balance of the specified token if found, otherwise 0.
     """
-    dataframe = fetch_wallet_token_single(address, token_mint_address)
-
-    #dataframe = pd.read_csv('data/token_per_addy.csv')
+    holding = get_wallet_token(address, token_mint_address)
 
     print('-----------------')
-    #print(dataframe)
-
-    #print(dataframe)
-
-    # Check if the DataFrame is empty
-    if dataframe.empty:
-        print("The DataFrame is empty. No positions to show.")
-        return 0  # Indicating no balance found
-
-    # Ensure 'Mint Address' column is treated as string for reliable comparison
-    dataframe['Mint Address'] = dataframe['Mint Address'].astype(str)
 
-    # Check if the token mint address exists in the DataFrame
-    if dataframe['Mint Address'].isin([token_mint_address]).any():
-        # Get the balance for the specified token
-        balance = dataframe.loc[dataframe['Mint Address'] == token_mint_address, 'Amount'].iloc[0]
-        #print(f"Balance for {token_mint_address[-4:]} token: {balance}")
-        return balance
-    else:
-        # If the token mint address is not found in the DataFrame, return a message indicating so
+    if holding is None:
+        # If the token mint address is not found in the wallet, return 0
         print("Token mint address not found in the wallet.")
         return 0  # Indicating no balance found
 
+    balance, _ = holding
+    #print(f"Balance for {token_mint_address[-4:]} token: {balance}")
+    return balance
 
-def get_decimals(token_mint_address):
-    import requests
-    import base64
-    import json
-    # Solana Mainnet RPC endpoint
-    url = "https://api.mainnet-beta.solana.com/"
-    headers = {"Content-Type": "application/json"}
-
-    # Request payload to fetch account information
-    payload = json.dumps({
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "getAccountInfo",
-        "params": [
-            token_mint_address,
-            {
-                "encoding": "jsonParsed"
-            }
-        ]
-    })
 
-    # Make the request to Solana RPC
-    response = requests.post(url, headers=headers, data=payload)
-    response_json = response.json()
-
-    # Parse the response to extract the number of decimals
-    decimals = response_json['result']['value']['data']['parsed']['info']['decimals']
+def get_decimals(token_mint_address):
+    """Get token decimals from the metadata store (only the first lookup per mint hits the RPC) - raises ValueError if unknown"""
+    decimals = token_metadata.get_decimals(token_mint_address)
     #print(f"Decimals for {token_mint_address[-4:]} token: {decimals}")
 
     return decimals
 
+def get_decimals_many(token_mint_addresses):
+    """Get decimals for many mints - unknown ones are fetched in one getMultipleAccounts batch"""
+    return token_metadata.get_decimals_many(token_mint_addresses)
+
 def pnl_close(token_mint_address):
 
     ''' this will check to see if price is > sell 1, sell 2, sell 3 and sell accordingly '''
@@ -670,8 +736,12 @@ def chunk_kill(token_mint_address, max_usd_order_size, slippage):
         token_amount = float(df['Amount'].iloc[0])
         current_usd_value = float(df['USD Value'].iloc[0])
         
-        # Get token decimals
-        decimals = get_decimals(token_mint_address)
+        # Get token decimals - without them every chunk would fail and the loop would never end
+        try:
+            decimals = get_decimals(token_mint_address)
+        except ValueError as e:
+            cprint(f"❌ {str(e)} - aborting position exit", "white", "on_red")
+            return
         
         cprint(f"📊 Initial position: {token_amount:.2f} tokens (${current_usd_value:.2f})", "white", "on_cyan")
         
@@ -1158,17 +1228,41 @@ def ai_entry(symbol, amount):
 def get_token_balance_usd(token_mint_address):
     """Get the USD value of a token position for Moon Dev's wallet 🌙"""
     try:
-        # Get the position data using existing function
-        df = fetch_wallet_token_single(address, token_mint_address)  # Using address from config
+        # Get the position from the wallet snapshot (one download shared by every token)
+        holding = get_wallet_token(address, token_mint_address)  # Using address from config
         
-        if df.empty:
+        if holding is None:
             print(f"🔍 No position found for {token_mint_address[:8]}")
             return 0.0
             
-        # Get the USD Value from the dataframe
-        usd_value = df['USD Value'].iloc[0]
-        return float(usd_value)
+        _, usd_value = holding
+        return usd_value
         
     except Exception as e:
         print(f"❌ Error getting token balance: {str(e)}")
-        return 0.0
\ No newline at end of file
+        return 0.0
+
+def get_token_balances_usd(token_mint_addresses):
+    """
+    USD value of many positions for Moon Dev's wallet 🌙 - one wallet snapshot
+    plus one batched multi_price lookup, instead of a request per token.
+    Returns {mint: usd_value} (0.0 for mints we don't hold).
+    """
+    snapshot = get_wallet_snapshot(address)
+    held = {}
+    for mint in token_mint_addresses:
+        i = snapshot['index'].get(mint)
+        if i is not None:
+            held[mint] = snapshot['df'].iloc[i]
+    
+    prices = token_prices(list(held)) if held else {}
+    values = {}
+    for mint in token_mint_addresses:
+        row = held.get(mint)
+        if row is None:
+            values[mint] = 0.0
+        elif prices.get(mint) is not None:
+            values[mint] = float(row['Amount']) * float(prices[mint])
+        else:
+            values[mint] = float(row['USD Value'])  # No live price - use the wallet's own valuation
+    return values
\ No newline at end of file
@@ -5,6 +5,7 @@ nice functions from hyper liquid i can use
 Built with love by Moon Dev 🚀
 '''
 
+import os
 import pandas as pd
 import requests
 from datetime import datetime, timedelta
@@ -12,6 +13,13 @@ import numpy as np
 import time
 import pandas_ta as ta  # For technical indicators
 import traceback
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src import http_client as http
+from src import rate_limiter
+from src.data.storage import TimeSeriesStore, STORE_ROOT
+from src.data.indicators import IndicatorEngine
 
 # Constants
 BATCH_SIZE = 5000  # MAX IS 5000 FOR HYPERLIQUID
@@ -19,9 +27,51 @@ MAX_RETRIES = 3
 MAX_ROWS = 5000
 BASE_URL = 'https://api.hyperliquid.xyz/info'
 
+# Candle cache settings 🗄️
+CANDLE_STORE_DIR = os.path.join(STORE_ROOT, 'hl_candles')
+CANDLE_FETCH_WORKERS = 4  # Parallel candleSnapshot pages per fetch
+INDICATOR_WARMUP_BARS = 300  # History used to seed the streaming indicators
+META_CACHE_TTL = 15  # Seconds a metaAndAssetCtxs snapshot is reused
+META_MAX_STALENESS = 5 * 60  # Seconds an old snapshot may stand in while refreshes fail
+UNAVAILABLE_BARS_TTL = 15 * 60  # Seconds before bars the API had no data for are asked for again
+CANDLE_SCHEMA = {
+    't': 'int64',  # Candle open time, ms since epoch (exchange time)
+    'o': 'float64',
+    'h': 'float64',
+    'l': 'float64',
+    'c': 'float64',
+    'v': 'float64',
+}
+
+# Hyperliquid interval -> candle length in ms
+INTERVAL_MS = {
+    '1m': 60_000,
+    '3m': 3 * 60_000,
+    '5m': 5 * 60_000,
+    '15m': 15 * 60_000,
+    '30m': 30 * 60_000,
+    '1h': 60 * 60_000,
+    '2h': 2 * 60 * 60_000,
+    '4h': 4 * 60 * 60_000,
+    '8h': 8 * 60 * 60_000,
+    '12h': 12 * 60 * 60_000,
+    '1d': 24 * 60 * 60_000,
+    '3d': 3 * 24 * 60 * 60_000,
+    '1w': 7 * 24 * 60 * 60_000,
+    '1M': 30 * 24 * 60 * 60_000,
+}
+
 # Global variable to store timestamp offset
 timestamp_offset = None
 
+_candle_stores = {}
+_candle_locks = {}
+_candle_lock = threading.Lock()
+_asset_snapshot = None
+_asset_snapshot_lock = threading.Lock()
+_indicator_engines = {}  # (symbol, interval) -> IndicatorEngine
+_unavailable_bars = {}  # (symbol, interval) -> [(first_ms, last_ms, expires_at)] closed bars the API had no data for
+
 def adjust_timestamp(dt):
     """Adjust API timestamps by subtracting the timestamp offset."""
     if timestamp_offset is not None:
@@ -29,20 +79,39 @@ def adjust_timestamp(dt):
         return corrected_dt
     return dt
 
-def _get_ohlcv(symbol, interval, start_time, end_time, batch_size=BATCH_SIZE):
-    """Internal function to fetch OHLCV data from Hyperliquid"""
+def _update_timestamp_offset(latest_ms):
+    """Work out the API vs system clock offset from the first data we see"""
     global timestamp_offset
-    print(f'\n🔍 Requesting data for {symbol}:')
-    print(f'📊 Batch Size: {batch_size}')
-    print(f'🚀 Start: {start_time.strftime("%Y-%m-%d %H:%M:%S")} UTC')
-    print(f'🎯 End: {end_time.strftime("%Y-%m-%d %H:%M:%S")} UTC')
+    if timestamp_offset is None and latest_ms is not None:
+        latest_api_timestamp = datetime.utcfromtimestamp(int(latest_ms) / 1000)
+        system_current_date = datetime.utcnow()
+        expected_latest_timestamp = system_current_date
+        timestamp_offset = latest_api_timestamp - expected_latest_timestamp
+        print(f"⏱️ Calculated timestamp offset: {timestamp_offset}")
+
+def _apply_timestamp_offset(df):
+    """Shift the whole timestamp column by the offset in one array op"""
+    if timestamp_offset is not None and not df.empty:
+        df['timestamp'] = df['timestamp'] - pd.Timedelta(timestamp_offset)
+    return df
+
+def _get_ohlcv(symbol, interval, start_time, end_time, batch_size=BATCH_SIZE, verbose=True):
+    """Internal function: one candleSnapshot request (up to batch_size candles, raw exchange timestamps)"""
+    if verbose:
+        print(f'\n🔍 Requesting data for {symbol}:')
+        print(f'📊 Batch Size: {batch_size}')
+        print(f'🚀 Start: {start_time.strftime("%Y-%m-%d %H:%M:%S")} UTC')
+        print(f'🎯 End: {end_time.strftime("%Y-%m-%d %H:%M:%S")} UTC')
 
     start_ts = int(start_time.timestamp() * 1000)
     end_ts = int(end_time.timestamp() * 1000)
+    return _fetch_candle_page(symbol, interval, start_ts, end_ts, batch_size, verbose)
 
-    for attempt in range(MAX_RETRIES):
-        try:
-            response = requests.post(
+def _fetch_candle_page(symbol, interval, start_ms, end_ms, batch_size=BATCH_SIZE, verbose=False):
+    """One candleSnapshot page between two ms timestamps -> list of candle dicts, [] if empty, None on failure"""
+    try:
+        with rate_limiter.limit('hyperliquid'):
+            response = http.post(
                 BASE_URL,
                 headers={'Content-Type': 'application/json'},
                 json={
@@ -50,72 +119,176 @@ def _get_ohlcv(symbol, interval, start_time, end_time, batch_size=BATCH_SIZE):
                     "req": {
                         "coin": symbol,
                         "interval": interval,
-                        "startTime": start_ts,
-                        "endTime": end_ts,
+                        "startTime": int(start_ms),
+                        "endTime": int(end_ms),
                         "limit": batch_size
                     }
                 },
-                timeout=10
+                max_retries=MAX_RETRIES
+            )
+    except requests.exceptions.RequestException as e:
+        print(f'⚠️ Request failed for {symbol} {interval}: {e}')
+        return None
+
+    if response.status_code != 200:
+        print(f'⚠️ HTTP Error {response.status_code}: {response.text}')
+        return None
+
+    snapshot_data = response.json() or []
+    if verbose:
+        if snapshot_data:
+            print(f'✨ Received {len(snapshot_data)} candles')
+            print(f'📈 First: {datetime.utcfromtimestamp(snapshot_data[0]["t"] / 1000)}')
+            print(f'📉 Last: {datetime.utcfromtimestamp(snapshot_data[-1]["t"] / 1000)}')
+        else:
+            print('❌ No data returned by API')
+    return snapshot_data
+
+def _candle_store(symbol, interval):
+    """Per-(coin, interval) candle store + its lock"""
+    key = (symbol, interval)
+    with _candle_lock:
+        if key not in _candle_stores:
+            _candle_stores[key] = TimeSeriesStore(
+                f"{symbol}_{interval}", CANDLE_SCHEMA, time_column='t',
+                time_unit='ms', partition='M', root=CANDLE_STORE_DIR,
             )
+            _candle_locks[key] = threading.RLock()
+        return _candle_stores[key], _candle_locks[key]
+
+def find_gaps(times_ms, start_ms, end_ms, interval, exclude=()):
+    """
+    Missing bars between start_ms and end_ms given the candle open times we have.
+    Bars inside the exclude runs aren't counted as missing.
+    Returns a list of (first_missing_ms, last_missing_ms) runs.
+    """
+    step = INTERVAL_MS[interval]
+    first = -(-int(start_ms) // step) * step  # First candle open at or after start
+    expected = np.arange(first, int(end_ms) + 1, step, dtype='int64')
+    if len(expected) == 0:
+        return []
+    have = np.asarray(times_ms, dtype='int64')
+    missing = expected[~np.isin(expected, have)]
+    for run_start, run_end in exclude:
+        missing = missing[(missing < run_start) | (missing > run_end)]
+    if len(missing) == 0:
+        return []
+    # Split into contiguous runs
+    breaks = np.where(np.diff(missing) != step)[0]
+    starts = np.concatenate(([missing[0]], missing[breaks + 1]))
+    ends = np.concatenate((missing[breaks], [missing[-1]]))
+    return list(zip(starts.tolist(), ends.tolist()))
+
+def _page_ranges(gaps, interval, batch_size=BATCH_SIZE):
+    """Split missing runs into candleSnapshot-sized pages"""
+    step = INTERVAL_MS[interval]
+    pages = []
+    for gap_start, gap_end in gaps:
+        page_start = gap_start
+        while page_start <= gap_end:
+            page_end = min(gap_end, page_start + (batch_size - 1) * step)
+            pages.append((page_start, page_end))
+            page_start = page_end + step
+    return pages
+
+def fetch_candles(symbol, interval, start_time, end_time=None, max_workers=CANDLE_FETCH_WORKERS):
+    """
+    🌙 Candles for symbol/interval between two UTC datetimes, backed by a local cache.
+
+    Bars already in the per-(coin, interval) store are served locally; only
+    the missing runs are downloaded, split into 5000-candle pages fetched in
+    parallel. Closed bars are de-duplicated and appended to the store, the
+    still-forming bar is returned but never stored. Hyperliquid only serves
+    the most recent 5000 candles per interval, so longer 1m/5m histories
+    build up as the cache keeps getting extended.
+
+    Returns a DataFrame with columns t (ms, exchange time), o, h, l, c, v.
+    """
+    if interval not in INTERVAL_MS:
+        raise ValueError(f"Unsupported Hyperliquid interval: {interval}")
+
+    step = INTERVAL_MS[interval]
+    end_time = end_time or datetime.utcnow()
+    start_ms = int(pd.Timestamp(start_time).timestamp() * 1000)
+    end_ms = int(pd.Timestamp(end_time).timestamp() * 1000)
+    now_ms = int(time.time() * 1000)
+    store, lock = _candle_store(symbol, interval)
 
-            if response.status_code == 200:
-                snapshot_data = response.json()
-                if snapshot_data:
-                    # Handle timestamp offset
-                    if timestamp_offset is None:
-                        latest_api_timestamp = datetime.utcfromtimestamp(snapshot_data[-1]['t'] / 1000)
-                        system_current_date = datetime.utcnow()
-                        expected_latest_timestamp = system_current_date
-                        timestamp_offset = latest_api_timestamp - expected_latest_timestamp
-                        print(f"⏱️ Calculated timestamp offset: {timestamp_offset}")
-
-                    # Adjust timestamps
-                    for candle in snapshot_data:
-                        dt = datetime.utcfromtimestamp(candle['t'] / 1000)
-                        adjusted_dt = adjust_timestamp(dt)
-                        candle['t'] = int(adjusted_dt.timestamp() * 1000)
-
-                    first_time = datetime.utcfromtimestamp(snapshot_data[0]['t'] / 1000)
-                    last_time = datetime.utcfromtimestamp(snapshot_data[-1]['t'] / 1000)
-                    print(f'✨ Received {len(snapshot_data)} candles')
-                    print(f'📈 First: {first_time}')
-                    print(f'📉 Last: {last_time}')
-                    return snapshot_data
-                print('❌ No data returned by API')
-                return None
-            print(f'⚠️ HTTP Error {response.status_code}: {response.text}')
-        except requests.exceptions.RequestException as e:
-            print(f'⚠️ Request failed (attempt {attempt + 1}): {e}')
-            time.sleep(1)
-    return None
+    with lock:
+        stored = store.read(start=pd.to_datetime(start_ms, unit='ms'), end=pd.to_datetime(end_ms, unit='ms'))
+        # Holes expire so a temporary API blip doesn't leave a permanent gap
+        unavailable = [hole for hole in _unavailable_bars.get((symbol, interval), []) if hole[2] > time.time()]
+        _unavailable_bars[(symbol, interval)] = unavailable
+        exclude = [(hole_start, hole_end) for hole_start, hole_end, _ in unavailable]
+        gaps = find_gaps(stored['t'], start_ms, min(end_ms, now_ms), interval, exclude=exclude)
+        pages = _page_ranges(gaps, interval)
+
+        fetched = []
+        if pages:
+            print(f"📥 Fetching {len(pages)} page(s) of {symbol} {interval} candles ({len(stored)} cached)")
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(
+                    lambda page: _fetch_candle_page(symbol, interval, page[0], page[1] + step - 1),
+                    pages,
+                ))
+            for page, result in zip(pages, results):
+                if result is None:
+                    continue  # Failed page - try again next call
+                fetched.extend(result)
+                # Closed bars the API has nothing for (before listing / beyond its history) - don't ask again for a while
+                last_closed = min(page[1], now_ms - step)
+                holes = find_gaps([candle['t'] for candle in result], page[0], last_closed, interval)
+                if holes:
+                    expires_at = time.time() + UNAVAILABLE_BARS_TTL
+                    unavailable.extend((hole_start, hole_end, expires_at) for hole_start, hole_end in holes)
+                    missing = sum((hole_end - hole_start) // step + 1 for hole_start, hole_end in holes)
+                    print(f"⚠️ {symbol} {interval}: API has no data for {missing} bar(s) in {len(holes)} gap(s)")
+
+        forming = pd.DataFrame(columns=list(CANDLE_SCHEMA))
+        if fetched:
+            new = pd.DataFrame(fetched)[list(CANDLE_SCHEMA)].astype(CANDLE_SCHEMA)
+            new = new.drop_duplicates('t', keep='last')
+            new = new[~new['t'].isin(stored['t'])]
+            closed_mask = new['t'] + step <= now_ms
+            store.append(new[closed_mask])
+            forming = new[~closed_mask]
+            stored = pd.concat([stored, new], ignore_index=True)
+
+    df = stored[(stored['t'] >= start_ms) & (stored['t'] <= end_ms)]
+    return df.drop_duplicates('t', keep='last').sort_values('t').reset_index(drop=True)
 
 def _process_data_to_df(snapshot_data):
-    """Convert raw API data to DataFrame"""
-    if snapshot_data:
-        columns = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
-        data = []
-        for snapshot in snapshot_data:
-            timestamp = datetime.utcfromtimestamp(snapshot['t'] / 1000)
-            # Convert all numeric values to float
-            data.append([
-                timestamp,
-                float(snapshot['o']),
-                float(snapshot['h']),
-                float(snapshot['l']),
-                float(snapshot['c']),
-                float(snapshot['v'])
-            ])
-        df = pd.DataFrame(data, columns=columns)
-        
-        # Ensure numeric columns are float64
-        numeric_cols = ['open', 'high', 'low', 'close', 'volume']
-        df[numeric_cols] = df[numeric_cols].astype('float64')
-        
-        print("\n📊 OHLCV Data Types:")
-        print(df.dtypes)
-        
-        return df
-    return pd.DataFrame()
+    """
+    Convert raw API candles (list of dicts) or cached candles (DataFrame with
+    t/o/h/l/c/v columns) to a DataFrame in one vectorized pass.
+    """
+    if snapshot_data is None or len(snapshot_data) == 0:
+        return pd.DataFrame()
+
+    if isinstance(snapshot_data, pd.DataFrame):
+        times = snapshot_data['t'].to_numpy(dtype='int64')
+        values = snapshot_data[['o', 'h', 'l', 'c', 'v']].to_numpy(dtype='float64')
+    else:
+        # One pass to pull the fields out, then numpy parses the numeric strings in C
+        times = np.fromiter((candle['t'] for candle in snapshot_data), dtype='int64', count=len(snapshot_data))
+        values = np.array(
+            [(candle['o'], candle['h'], candle['l'], candle['c'], candle['v']) for candle in snapshot_data],
+            dtype='float64',
+        )
+
+    df = pd.DataFrame({
+        'timestamp': pd.to_datetime(times, unit='ms'),
+        'open': values[:, 0],
+        'high': values[:, 1],
+        'low': values[:, 2],
+        'close': values[:, 3],
+        'volume': values[:, 4],
+    })
+
+    print("\n📊 OHLCV Data Types:")
+    print(df.dtypes)
+
+    return df
 
 def add_technical_indicators(df):
     """Add technical indicators to the dataframe"""
@@ -150,6 +323,37 @@ def add_technical_indicators(df):
         traceback.print_exc()
         return df
 
+def get_indicators(symbol, timeframe='15m', warmup_bars=INDICATOR_WARMUP_BARS):
+    """
+    🌙 Latest indicator values for symbol/timeframe without rebuilding a DataFrame.
+
+    The first call warms an IndicatorEngine up from the candle cache; later
+    calls only feed it the bars that closed since, plus the forming bar as a
+    preview. Returns {name: value} (see src/data/indicators.py).
+    """
+    step = INTERVAL_MS.get(timeframe, INTERVAL_MS['15m'])
+    key = (symbol, timeframe)
+    with _candle_lock:
+        engine = _indicator_engines.get(key)
+        if engine is None:
+            engine = _indicator_engines[key] = IndicatorEngine()
+
+    now = datetime.utcnow()
+    if engine.last_time is None:
+        start_time = now - timedelta(milliseconds=step * warmup_bars)
+    else:
+        start_time = pd.to_datetime(int(engine.last_time) + step, unit='ms').to_pydatetime()
+    candles = fetch_candles(symbol, timeframe, start_time, now)
+
+    if not candles.empty:
+        now_ms = int(time.time() * 1000)
+        closed = candles[candles['t'] + step <= now_ms]
+        engine.warm_up(closed)
+        forming = candles[candles['t'] + step > now_ms]
+        if not forming.empty:
+            engine.update(forming.iloc[-1], closed=False)
+    return engine.latest()
+
 def get_data(symbol, timeframe='15m', bars=100, add_indicators=True):
     """
     🌙 Moon Dev's Hyperliquid Data Fetcher
@@ -172,28 +376,20 @@ def get_data(symbol, timeframe='15m', bars=100, add_indicators=True):
     # Ensure we don't exceed max rows
     bars = min(bars, MAX_ROWS)
     
-    # Calculate time window
+    # Calculate time window - just enough bars, served from the candle cache
     end_time = datetime.utcnow()
-    # Add extra time to ensure we get enough bars
-    start_time = end_time - timedelta(days=60)
+    step = INTERVAL_MS.get(timeframe, INTERVAL_MS['15m'])
+    start_time = end_time - timedelta(milliseconds=step * bars)
 
-    data = _get_ohlcv(symbol, timeframe, start_time, end_time, batch_size=bars)
+    candles = fetch_candles(symbol, timeframe, start_time, end_time)
     
-    if not data:
+    if candles.empty:
         print("❌ No data available.")
         return pd.DataFrame()
 
-    df = _process_data_to_df(data)
+    df = _candles_to_frame(candles, bars, add_indicators)
 
     if not df.empty:
-        # Get the most recent bars
-        df = df.sort_values('timestamp', ascending=False).head(bars).sort_values('timestamp')
-        df = df.reset_index(drop=True)
-        
-        # Add technical indicators if requested
-        if add_indicators:
-            df = add_technical_indicators(df)
-
         print("\n📊 Data summary:")
         print(f"📈 Total candles: {len(df)}")
         print(f"📅 Range: {df['timestamp'].min()} to {df['timestamp'].max()}")
@@ -201,6 +397,79 @@ def get_data(symbol, timeframe='15m', bars=100, add_indicators=True):
 
     return df
 
+def resample_candles(candles, source_interval, target_interval):
+    """
+    Aggregate cached candles (t/o/h/l/c/v) from a finer interval into a coarser one.
+    Buckets are epoch-aligned like Hyperliquid's own candles; a leading bucket
+    that isn't fully covered is dropped, the last (forming) bucket is kept.
+    """
+    if candles.empty or source_interval == target_interval:
+        return candles
+    source_ms = INTERVAL_MS[source_interval]
+    target_ms = INTERVAL_MS[target_interval]
+    bucket = (candles['t'] // target_ms) * target_ms
+    grouped = candles.groupby(bucket, sort=True)
+    out = pd.DataFrame({
+        't': grouped['t'].first().index.astype('int64'),
+        'o': grouped['o'].first().to_numpy(),
+        'h': grouped['h'].max().to_numpy(),
+        'l': grouped['l'].min().to_numpy(),
+        'c': grouped['c'].last().to_numpy(),
+        'v': grouped['v'].sum().to_numpy(),
+    })
+    if len(out) and candles['t'].iloc[0] > out['t'].iloc[0]:
+        out = out.iloc[1:]
+    return out.reset_index(drop=True)
+
+def _plan_timeframes(timeframes, bars):
+    """
+    {base interval: [timeframes built from it]} - each base is fetched once and
+    the coarser timeframes are resampled from it when that stays within MAX_ROWS.
+    """
+    plan = {}
+    for timeframe in sorted(set(timeframes), key=lambda tf: INTERVAL_MS[tf]):
+        target_ms = INTERVAL_MS[timeframe]
+        for base in plan:
+            base_ms = INTERVAL_MS[base]
+            if target_ms % base_ms == 0 and target_ms <= INTERVAL_MS['1d'] and bars * target_ms // base_ms <= MAX_ROWS:
+                plan[base].append(timeframe)
+                break
+        else:
+            plan[timeframe] = [timeframe]
+    return plan
+
+def _candles_to_frame(candles, bars, add_indicators):
+    """Cached candles -> the same frame get_data returns"""
+    _update_timestamp_offset(candles['t'].iloc[-1])
+    df = _apply_timestamp_offset(_process_data_to_df(candles))
+    df = df.tail(bars).reset_index(drop=True)
+    if add_indicators:
+        df = add_technical_indicators(df)
+    return df
+
+def get_data_multi(symbol, timeframes, bars=100, add_indicators=True):
+    """
+    🌙 get_data for several timeframes of one symbol with as few fetches as possible.
+
+    The finest timeframe is fetched once (through the candle cache) and the
+    coarser ones are resampled from it locally. Returns {timeframe: DataFrame}
+    shaped like get_data's output.
+    """
+    bars = min(bars, MAX_ROWS)
+    end_time = datetime.utcnow()
+    frames = {}
+    for base, derived in _plan_timeframes(timeframes, bars).items():
+        base_ms = INTERVAL_MS[base]
+        coarsest_ms = max(INTERVAL_MS[tf] for tf in derived)
+        # Enough base bars for the coarsest derived timeframe (+1 bucket for alignment)
+        start_time = end_time - timedelta(milliseconds=coarsest_ms * (bars + 1))
+        candles = fetch_candles(symbol, base, start_time, end_time)
+        print(f"📦 {symbol}: {len(candles)} {base} candles -> {', '.join(derived)}")
+        for timeframe in derived:
+            resampled = resample_candles(candles, base, timeframe)
+            frames[timeframe] = _candles_to_frame(resampled, bars, add_indicators) if not resampled.empty else pd.DataFrame()
+    return frames
+
 def get_market_info():
     """Get current market info for all coins on Hyperliquid"""
     try:
@@ -261,6 +530,92 @@ def test_market_info():
         print(f"🔍 Full error traceback:")
         traceback.print_exc()
 
+class AssetContextSnapshot:
+    """
+    One metaAndAssetCtxs download with the universe index built once.
+
+    frame is indexed by coin name with float columns (funding, mark_price,
+    open_interest, oracle_price, premium, day_volume, prev_day_price) for
+    vectorized work across all coins; get(symbol) is a dict lookup.
+    """
+
+    def __init__(self, payload, fetched_at=None):
+        meta, contexts = payload[0], payload[1]
+        self.fetched_at = fetched_at or time.time()
+        self.symbols = [coin['name'] for coin in meta['universe']][:len(contexts)]
+        self.index = {name: i for i, name in enumerate(self.symbols)}
+
+        def column(field):
+            return pd.to_numeric(pd.Series([ctx.get(field) for ctx in contexts[:len(self.symbols)]]), errors='coerce').to_numpy(dtype='float64')
+
+        self.frame = pd.DataFrame({
+            'funding': column('funding'),
+            'mark_price': column('markPx'),
+            'open_interest': column('openInterest'),
+            'oracle_price': column('oraclePx'),
+            'premium': column('premium'),
+            'day_volume': column('dayNtlVlm'),
+            'prev_day_price': column('prevDayPx'),
+        }, index=pd.Index(self.symbols, name='symbol'))
+        self._rows = self.frame[['funding', 'mark_price', 'open_interest']].to_dict('index')
+
+    def age(self):
+        return time.time() - self.fetched_at
+
+    def get(self, symbol):
+        """{'funding_rate', 'mark_price', 'open_interest'} for one coin, or None if it isn't listed"""
+        row = self._rows.get(symbol)
+        if row is None:
+            return None
+        return {
+            'funding_rate': row['funding'],
+            'mark_price': row['mark_price'],
+            'open_interest': row['open_interest'],
+        }
+
+    def annual_funding_pct(self):
+        """Annualized funding (%) for every coin - hourly rate * 24 * 365"""
+        return self.frame['funding'] * 100 * 24 * 365
+
+def get_asset_contexts(max_age=META_CACHE_TTL, max_staleness=META_MAX_STALENESS):
+    """
+    Shared metaAndAssetCtxs snapshot, downloaded at most once per max_age seconds.
+    If a refresh fails the previous snapshot is reused while it's younger than
+    max_staleness seconds; returns None once it's older (or there's none yet).
+    """
+    global _asset_snapshot
+    with _asset_snapshot_lock:
+        if _asset_snapshot is not None and _asset_snapshot.age() < max_age:
+            return _asset_snapshot
+
+        try:
+            with rate_limiter.limit('hyperliquid'):
+                response = http.post(
+                    BASE_URL,
+                    headers={'Content-Type': 'application/json'},
+                    json={"type": "metaAndAssetCtxs"}
+                )
+            if response.status_code != 200:
+                print(f"❌ Bad status code: {response.status_code}")
+            else:
+                data = response.json()
+                if len(data) >= 2 and isinstance(data[0], dict) and isinstance(data[1], list):
+                    _asset_snapshot = AssetContextSnapshot(data)
+                    return _asset_snapshot
+                print("❌ Unexpected response format")
+        except Exception as e:
+            print(f"❌ Error getting asset contexts: {str(e)}")
+
+        # Refresh failed - fall back to the last snapshot only while it's reasonably fresh
+        if _asset_snapshot is None:
+            return None
+        age = _asset_snapshot.age()
+        if age > max_staleness:
+            print(f"❌ Last asset snapshot is {age:.0f}s old (max {max_staleness}s) - not using it")
+            return None
+        print(f"⚠️ Using {age:.0f}s old asset snapshot")
+        return _asset_snapshot
+
 def get_funding_rates(symbol):
     """
     Get current funding rate for a specific coin on Hyperliquid
@@ -272,41 +627,15 @@ def get_funding_rates(symbol):
         dict: Funding data including rate, mark price, and open interest
     """
     try:
-        print(f"\n🔄 Fetching funding rate for {symbol}...")
-        response = requests.post(
-            BASE_URL,
-            headers={'Content-Type': 'application/json'},
-            json={"type": "metaAndAssetCtxs"}
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            if len(data) >= 2 and isinstance(data[0], dict) and isinstance(data[1], list):
-                # Get universe (symbols) from first element
-                universe = {coin['name']: i for i, coin in enumerate(data[0]['universe'])}
-                
-                # Check if symbol exists
-                if symbol not in universe:
-                    print(f"❌ Symbol {symbol} not found in Hyperliquid universe")
-                    print(f"📝 Available symbols: {', '.join(universe.keys())}")
-                    return None
-                
-                # Get funding data from second element
-                funding_data = data[1]
-                idx = universe[symbol]
-                
-                if idx < len(funding_data):
-                    asset_data = funding_data[idx]
-                    return {
-                        'funding_rate': float(asset_data['funding']),
-                        'mark_price': float(asset_data['markPx']),
-                        'open_interest': float(asset_data['openInterest'])
-                    }
-                    
-            print("❌ Unexpected response format")
+        snapshot = get_asset_contexts()
+        if snapshot is None:
             return None
-        print(f"❌ Bad status code: {response.status_code}")
-        return None
+
+        data = snapshot.get(symbol)
+        if data is None:
+            print(f"❌ Symbol {symbol} not found in Hyperliquid universe")
+            print(f"📝 Available symbols: {', '.join(snapshot.symbols)}")
+        return data
     except Exception as e:
         print(f"❌ Error getting funding rate for {symbol}: {str(e)}")
         traceback.print_exc()
@@ -0,0 +1,68 @@
+"""
+🌙 Moon Dev's Provider Rate Limiter
+Built with love by Moon Dev 🚀
+
+Shared per-provider limits for code that fans API calls out across threads.
+Each provider gets a cap on calls in flight plus a requests-per-minute
+budget, so parallel agents can't burst past an API's limits.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Per-provider limits 🚦 (max in flight, max starts per minute)
+PROVIDER_LIMITS = {
+    'anthropic': {'concurrency': 4, 'per_minute': 50},
+    'openai': {'concurrency': 4, 'per_minute': 60},
+    'deepseek': {'concurrency': 2, 'per_minute': 30},
+    'groq': {'concurrency': 4, 'per_minute': 30},
+    'gemini': {'concurrency': 4, 'per_minute': 60},
+    'birdeye': {'concurrency': 8, 'per_minute': 300},
+    'hyperliquid': {'concurrency': 8, 'per_minute': 600},
+}
+DEFAULT_LIMITS = {'concurrency': 4, 'per_minute': 60}
+
+class RateLimiter:
+    """Concurrency cap + sliding one-minute window of call starts"""
+
+    def __init__(self, concurrency, per_minute):
+        self.per_minute = per_minute
+        self._slots = threading.BoundedSemaphore(concurrency)
+        self._starts = deque()
+        self._lock = threading.Lock()
+
+    def _wait_for_budget(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._starts and now - self._starts[0] >= 60:
+                    self._starts.popleft()
+                if len(self._starts) < self.per_minute:
+                    self._starts.append(now)
+                    return
+                wait = 60 - (now - self._starts[0])
+            time.sleep(max(wait, 0.01))
+
+    @contextmanager
+    def limit(self):
+        """Block until a slot and per-minute budget are free, hold the slot for the block"""
+        with self._slots:
+            self._wait_for_budget()
+            yield
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+def get_limiter(provider):
+    """Shared limiter for a provider name (created on first use)"""
+    with _limiters_lock:
+        if provider not in _limiters:
+            settings = PROVIDER_LIMITS.get(provider, DEFAULT_LIMITS)
+            _limiters[provider] = RateLimiter(settings['concurrency'], settings['per_minute'])
+        return _limiters[provider]
+
+def limit(provider):
+    """Context manager shortcut: `with rate_limiter.limit('anthropic'): ...`"""
+    return get_limiter(provider).limit()
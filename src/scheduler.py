@@ -0,0 +1,193 @@
+"""
+🌙 Moon Dev's Agent Scheduler
+Built with love by Moon Dev 🚀
+
+Runs every agent on its own cadence instead of one serial loop. Independent
+agents share a small thread pool, preempting jobs (risk) get a dedicated
+thread so they always start on time, and every run is timed so we can see
+which agent is eating the cycle.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+from termcolor import cprint
+
+# Scheduler settings ⏱️
+MAX_WORKERS = 4       # Pool threads shared by the non-preempting agents
+TICK_SECONDS = 1.0    # How often the scheduler checks for due jobs
+METRICS_EVERY_MINUTES = 30  # How often the latency table is printed
+
+@dataclass
+class ScheduledJob:
+    """One agent entry point with its own cadence"""
+    name: str
+    func: Callable
+    interval: float                   # Seconds between scheduled starts
+    priority: int = 10                # Lower starts first when several jobs are due
+    deadline: Optional[float] = None  # Seconds a run may take before it counts as late
+    preempts: bool = False            # Hold back lower-priority starts while this runs
+    next_run: float = 0.0
+    running: bool = False
+    started_at: float = 0.0
+    late_warned: bool = False
+    metrics: dict = field(default_factory=lambda: {
+        'runs': 0,
+        'errors': 0,
+        'deadline_misses': 0,
+        'skipped_overlaps': 0,
+        'deferred': 0,
+        'total_latency': 0.0,
+        'max_latency': 0.0,
+        'last_latency': 0.0,
+        'max_start_lag': 0.0,
+    })
+
+class AgentScheduler:
+    """
+    Priority scheduler for the agent loop.
+
+    A job never overlaps itself: if it's still running when it comes due the
+    tick is skipped and counted. While a preempting job is running, jobs with
+    a lower priority aren't started until it finishes - already running jobs
+    keep going, Python threads can't be interrupted.
+    """
+
+    def __init__(self, max_workers=MAX_WORKERS):
+        self.jobs = []
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="agent")
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def add(self, name, func, interval_minutes, priority=10, deadline_minutes=None, preempts=False):
+        """Register a job; it first runs on the next tick"""
+        job = ScheduledJob(
+            name=name,
+            func=func,
+            interval=interval_minutes * 60,
+            priority=priority,
+            deadline=deadline_minutes * 60 if deadline_minutes else None,
+            preempts=preempts,
+            next_run=time.monotonic(),
+        )
+        self.jobs.append(job)
+        return job
+
+    def _preempting_priority(self):
+        """Priority of the most important preempting job running right now (None if none)"""
+        running = [job.priority for job in self.jobs if job.running and job.preempts]
+        return min(running) if running else None
+
+    def _run_job(self, job, scheduled_for):
+        start = time.monotonic()
+        lag = max(0.0, start - scheduled_for)
+        ok = True
+        try:
+            job.func()
+        except Exception as e:
+            ok = False
+            cprint(f"\n❌ {job.name} agent failed: {str(e)}", "red")
+        finally:
+            elapsed = time.monotonic() - start
+            with self._lock:
+                m = job.metrics
+                m['runs'] += 1
+                m['total_latency'] += elapsed
+                m['last_latency'] = elapsed
+                m['max_latency'] = max(m['max_latency'], elapsed)
+                m['max_start_lag'] = max(m['max_start_lag'], lag)
+                if not ok:
+                    m['errors'] += 1
+                if job.deadline and elapsed > job.deadline:
+                    m['deadline_misses'] += 1
+                job.running = False
+            cprint(f"⏱️ {job.name} finished in {elapsed:.1f}s", "cyan")
+
+    def _start(self, job, now):
+        scheduled_for = job.next_run
+        job.running = True
+        job.started_at = now
+        job.late_warned = False
+        # Fixed-rate cadence, but never try to "catch up" a backlog of missed runs
+        job.next_run = max(job.next_run + job.interval, now)
+        if job.preempts:
+            # Dedicated thread so a saturated pool can never delay it
+            threading.Thread(
+                target=self._run_job, args=(job, scheduled_for),
+                name=f"agent-{job.name}", daemon=True,
+            ).start()
+        else:
+            self._pool.submit(self._run_job, job, scheduled_for)
+
+    def tick(self):
+        """Start every due job that's allowed to run"""
+        now = time.monotonic()
+        with self._lock:
+            for job in self.jobs:
+                if job.running and job.deadline and not job.late_warned and now - job.started_at > job.deadline:
+                    job.late_warned = True
+                    cprint(f"⚠️ {job.name} is past its {job.deadline:.0f}s deadline", "yellow")
+
+            for job in sorted(self.jobs, key=lambda j: j.priority):
+                if now < job.next_run:
+                    continue
+                if job.running:
+                    job.metrics['skipped_overlaps'] += 1
+                    job.next_run = now + job.interval
+                    continue
+                gate = self._preempting_priority()
+                if gate is not None and job.priority > gate:
+                    # Wait for the risk check to finish; stays due for the next tick
+                    job.metrics['deferred'] += 1
+                    continue
+                self._start(job, now)
+
+    def next_wakeup(self):
+        """Wall-clock time of the next scheduled start"""
+        if not self.jobs:
+            return None
+        seconds = min(job.next_run for job in self.jobs) - time.monotonic()
+        return datetime.now() + timedelta(seconds=max(0.0, seconds))
+
+    def run_forever(self):
+        """Tick until stop() is called (or Ctrl+C)"""
+        last_metrics = time.monotonic()
+        try:
+            while not self._stop.is_set():
+                self.tick()
+                if time.monotonic() - last_metrics >= METRICS_EVERY_MINUTES * 60:
+                    self.print_metrics()
+                    last_metrics = time.monotonic()
+                self._stop.wait(TICK_SECONDS)
+        finally:
+            self.shutdown()
+
+    def stop(self):
+        self._stop.set()
+
+    def shutdown(self):
+        """Stop scheduling and let running jobs finish"""
+        self._stop.set()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def get_metrics(self):
+        """Per-agent cycle latency snapshot with average latency filled in"""
+        with self._lock:
+            snapshot = {}
+            for job in self.jobs:
+                entry = dict(job.metrics)
+                entry['avg_latency'] = entry['total_latency'] / entry['runs'] if entry['runs'] else 0.0
+                snapshot[job.name] = entry
+            return snapshot
+
+    def print_metrics(self):
+        """Print runs and latency per agent"""
+        cprint("\n⏱️ Moon Dev's Agent Cycle Stats", "white", "on_blue")
+        for name, m in self.get_metrics().items():
+            print(f"  • {name}: {m['runs']} runs | {m['errors']} errors | "
+                  f"avg {m['avg_latency']:.1f}s | max {m['max_latency']:.1f}s | "
+                  f"max start lag {m['max_start_lag']:.1f}s | {m['deadline_misses']} late | "
+                  f"{m['skipped_overlaps']} overlaps skipped")
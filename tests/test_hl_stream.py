@@ -0,0 +1,148 @@
+"""
+🌙 Moon Dev's Hyperliquid Stream Tests
+Built with love by Moon Dev 🚀
+
+Runs HyperliquidStream against a local websockets server that plays canned
+candle / allMids / activeAssetCtx frames, drops the socket and checks the
+stream reconnects, resubscribes and backfills the candles it missed.
+
+Run from the repo root: python -m pytest tests
+"""
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+import websockets
+
+from src.data import hl_stream
+from src.data.hl_stream import HyperliquidStream
+
+STEP = 60_000  # 1m candles
+T0 = (int(time.time() * 1000) // STEP + 60) * STEP  # An hour ahead, so reconnects have nothing to backfill up to "now"
+
+def _candle(t, close):
+    return {'channel': 'candle', 'data': {
+        't': t, 'T': t + STEP - 1, 's': 'BTC', 'i': '1m',
+        'o': str(close), 'h': str(close + 1), 'l': str(close - 1), 'c': str(close), 'v': '10', 'n': 5,
+    }}
+
+def _wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+class FakeHyperliquid:
+    """Local websocket server: the first connection plays a few frames then drops, later ones send a candle after a gap"""
+
+    def __init__(self):
+        self.connections = 0
+        self.subscriptions = []  # One list of subscribe payloads per connection
+        self.url = None
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._stop = None
+        self._thread = threading.Thread(target=self._loop.run_until_complete, args=(self._serve(),), daemon=True)
+
+    async def _handler(self, ws):
+        self.connections += 1
+        received = []
+        self.subscriptions.append(received)
+        for _ in range(3):
+            received.append(json.loads(await ws.recv())['subscription'])
+
+        if self.connections == 1:
+            await ws.send(json.dumps(_candle(T0, 100)))
+            await ws.send(json.dumps(_candle(T0 + STEP, 101)))
+            await ws.send(json.dumps({'channel': 'allMids', 'data': {'mids': {'BTC': '101.5', 'ETH': '3000'}}}))
+            await ws.send(json.dumps({'channel': 'activeAssetCtx', 'data': {'coin': 'BTC', 'ctx': {
+                'funding': '0.0001', 'markPx': '101.4', 'openInterest': '12.5', 'oraclePx': '101.3'}}}))
+            return  # Drop the socket
+
+        await ws.send(json.dumps(_candle(T0 + 4 * STEP, 104)))  # T0+2 and T0+3 were missed
+        async for raw in ws:
+            received.append(json.loads(raw).get('subscription'))
+
+    async def _serve(self):
+        self._stop = asyncio.Event()
+        async with websockets.serve(self._handler, '127.0.0.1', 0) as server:
+            port = next(iter(server.sockets)).getsockname()[1]
+            self.url = f'ws://127.0.0.1:{port}'
+            self._ready.set()
+            await self._stop.wait()
+
+    def start(self):
+        self._thread.start()
+        self._ready.wait(5)
+        return self
+
+    def stop(self):
+        self._loop.call_soon_threadsafe(self._stop.set)
+        self._thread.join(5)
+        self._loop.close()
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(hl_stream, 'RECONNECT_BASE', 0)  # Reconnect right away
+    fake = FakeHyperliquid().start()
+    yield fake
+    fake.stop()
+
+def test_reconnects_resubscribes_and_backfills_the_gap(server):
+    backfill_calls = []
+
+    def backfill(coin, interval, start_ms, end_ms):
+        if end_ms < T0:
+            return []  # Initial fill on first connect - nothing before T0
+        backfill_calls.append((coin, interval, start_ms, end_ms))
+        return [{'t': t, 'o': 1, 'h': 1, 'l': 1, 'c': 1, 'v': 1} for t in range(start_ms, end_ms + 1, STEP)]
+
+    stream = HyperliquidStream(url=server.url, backfill_fn=backfill, interval_ms_fn=lambda interval: STEP)
+    stream.subscribe_candles('BTC', '1m')
+    stream.subscribe_mids()
+    stream.subscribe_asset_ctx('BTC')
+    stream.start()
+    try:
+        assert _wait_for(lambda: backfill_calls)
+        assert backfill_calls == [('BTC', '1m', T0 + 2 * STEP, T0 + 3 * STEP)]
+        assert _wait_for(lambda: len(stream.get_candles('BTC', '1m')) == 5)
+        assert stream.reconnects == 1
+        assert server.connections == 2
+        assert server.subscriptions[0] == server.subscriptions[1][:3]
+
+        candles = stream.get_candles('BTC', '1m')
+        assert list(candles['t']) == [T0 + i * STEP for i in range(5)]
+        assert candles['c'].iloc[-1] == 104.0
+        assert stream.get_mid('BTC') == 101.5
+        assert stream.get_asset_ctx('BTC') == {
+            'funding_rate': 0.0001, 'mark_price': 101.4, 'open_interest': 12.5, 'oracle_price': 101.3,
+        }
+
+        # Added while connected -> sent on the live socket
+        stream.subscribe_asset_ctx('ETH')
+        assert _wait_for(lambda: {'type': 'activeAssetCtx', 'coin': 'ETH'} in server.subscriptions[-1])
+    finally:
+        loop = stream._loop
+        stream.stop()
+
+    assert loop.is_closed()
+    assert stream._loop is None
+    assert not stream.connected.is_set()
+
+def test_stop_during_reconnect_backoff(monkeypatch):
+    monkeypatch.setattr(hl_stream, 'RECONNECT_BASE', 30)  # Would sleep for a while
+    stream = HyperliquidStream(url='ws://127.0.0.1:9', backfill_fn=lambda *args: [])  # Nothing listening
+    stream.subscribe_mids()
+    stream.start()
+    assert _wait_for(lambda: stream.reconnects >= 1)
+
+    started = time.time()
+    loop = stream._loop
+    stream.stop()
+    assert time.time() - started < 2
+    assert loop.is_closed()